@@ -0,0 +1,389 @@
+"""
+Cross-Meeting Action-Item Index.
+
+Every processed meeting writes its own ``action_items.md``; this SQLite index
+under ``recordings/`` collects the items of all meetings so open work can be
+listed by owner, deadline and status without opening each folder. It is
+updated incrementally - processing a meeting replaces only that meeting's rows,
+keeping the status of items that were already tracked - and status changes are
+single-row updates, so marking an item done never rewrites a markdown file.
+
+Usage:
+    python src/action_index.py list --owner alex --status pending
+    python src/action_index.py list --overdue
+    python src/action_index.py done 42
+    python src/action_index.py reindex          # rebuild from action_items.md files
+"""
+
+import argparse
+import re
+import sqlite3
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Iterable
+
+INDEX_FILE = "action_index.sqlite"
+ACTION_FILE = "action_items.md"
+
+PENDING = "pending"
+DONE = "done"
+CANCELLED = "cancelled"
+STATUSES = (PENDING, DONE, CANCELLED)
+
+# Status marks used in action_items.md
+STATUS_MARKS = {PENDING: "⬜", DONE: "✅", CANCELLED: "❌"}
+
+_UNASSIGNED = {"", "tbd", "n/a", "none", "-", "[person]", "[date]", "[owner]"}
+_WEEKDAYS = ("monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday")
+_DATE_FORMATS = ("%Y-%m-%d", "%B %d, %Y", "%b %d, %Y", "%B %d %Y", "%d %B %Y", "%d %b %Y", "%m/%d/%Y")
+_DATE_NO_YEAR_FORMATS = ("%B %d", "%b %d", "%d %B", "%d %b")
+_ORDINAL_RE = re.compile(r"(\d+)(st|nd|rd|th)\b")
+_BY_RE = re.compile(r"^(by|before|due)\s+")
+_TIME_SUFFIX_RE = re.compile(r"\s*\*\(at \d+:\d\d\)\*$")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meetings (
+    id INTEGER PRIMARY KEY,
+    folder TEXT NOT NULL UNIQUE,
+    title TEXT,
+    date TEXT
+);
+CREATE TABLE IF NOT EXISTS items (
+    id INTEGER PRIMARY KEY,
+    meeting_id INTEGER NOT NULL REFERENCES meetings(id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    action TEXT NOT NULL,
+    owner TEXT,
+    deadline TEXT,
+    due TEXT,
+    status TEXT NOT NULL DEFAULT 'pending',
+    spoken_at REAL,
+    updated TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS items_status_due ON items(status, due);
+CREATE INDEX IF NOT EXISTS items_meeting ON items(meeting_id);
+"""
+
+
+class ActionIndex:
+    """SQLite index of action items across meetings."""
+
+    def __init__(self, path: str | Path) -> None:
+        """Open (creating if needed) the index.
+
+        Args:
+            path: The index file, or the recordings folder to keep it in.
+        """
+        path = Path(path)
+        if path.suffix != ".sqlite":
+            path.mkdir(parents=True, exist_ok=True)
+            path = path / INDEX_FILE
+        self.path = path
+        # Meetings are processed by several workers; each gets its own connection
+        self.conn = sqlite3.connect(path, timeout=30)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("PRAGMA foreign_keys=ON")
+        self.conn.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def __enter__(self) -> "ActionIndex":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    # ------------------------------------------------------------------
+    # Updates
+    # ------------------------------------------------------------------
+    def record_meeting(self, folder: str | Path, items: Iterable[list[str]], title: str | None = None,
+                       meeting_date: date | None = None, spoken_at: dict[str, float] | None = None,
+                       statuses: dict[str, str] | None = None) -> int:
+        """Replace one meeting's items.
+
+        Items already in the index keep their id and status (matched by action
+        text), so reprocessing a meeting does not reopen finished work.
+
+        Args:
+            folder: The meeting folder (its name identifies the meeting).
+            items: ``[action, owner, deadline, ...]`` lists, as in ``action_items.md``.
+            title: Meeting title (default: the folder name).
+            meeting_date: Date relative deadlines ("Friday") are resolved from.
+            spoken_at: Transcript time of items spotted in the transcript.
+            statuses: Status per action text (as read from ``action_items.md``),
+                for items not in the index yet. An indexed item keeps its
+                stored status: status changes never rewrite the markdown, so
+                its marks are stale once an item is tracked.
+
+        Returns:
+            The number of items indexed.
+        """
+        folder = Path(folder)
+        meeting_date = meeting_date or date.today()
+        spoken_at = spoken_at or {}
+        now = datetime.now().isoformat(timespec="seconds")
+        with self.conn:
+            row = self.conn.execute("SELECT id FROM meetings WHERE folder = ?", (folder.name,)).fetchone()
+            if row:
+                meeting_id = row["id"]
+                self.conn.execute(
+                    "UPDATE meetings SET title = ?, date = ? WHERE id = ?",
+                    (title or folder.name, meeting_date.isoformat(), meeting_id),
+                )
+            else:
+                meeting_id = self.conn.execute(
+                    "INSERT INTO meetings (folder, title, date) VALUES (?, ?, ?)",
+                    (folder.name, title or folder.name, meeting_date.isoformat()),
+                ).lastrowid
+            # Items still listed keep their id and status; the rest are removed
+            known = {
+                action: (item_id, status) for item_id, action, status in self.conn.execute(
+                    "SELECT id, action, status FROM items WHERE meeting_id = ?", (meeting_id,)
+                )
+            }
+            statuses = statuses or {}
+
+            inserts, updates = [], []
+            for position, item in enumerate(items, 1):
+                action = item[0]
+                owner = _assigned(item[1]) if len(item) > 1 else None
+                deadline = _assigned(item[2]) if len(item) > 2 else None
+                due = parse_deadline(deadline, meeting_date) if deadline else None
+                values = (position, owner, deadline, due and due.isoformat(), spoken_at.get(action), now)
+                if action in known:
+                    item_id, status = known.pop(action)
+                    updates.append((*values, status, item_id))
+                else:
+                    inserts.append((meeting_id, action, *values, statuses.get(action, PENDING)))
+            self.conn.executemany(
+                "UPDATE items SET position = ?, owner = ?, deadline = ?, due = ?, spoken_at = ?, updated = ?,"
+                " status = ? WHERE id = ?",
+                updates,
+            )
+            self.conn.executemany(
+                "INSERT INTO items (meeting_id, action, position, owner, deadline, due, spoken_at, updated, status)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                inserts,
+            )
+            self.conn.executemany("DELETE FROM items WHERE id = ?", [(item_id,) for item_id, _ in known.values()])
+        return len(inserts) + len(updates)
+
+    def set_status(self, item_id: int, status: str) -> bool:
+        """Change one item's status; returns False if there is no such item."""
+        if status not in STATUSES:
+            raise ValueError(f"Unknown status: {status} (expected one of {', '.join(STATUSES)})")
+        with self.conn:
+            cursor = self.conn.execute(
+                "UPDATE items SET status = ?, updated = ? WHERE id = ?",
+                (status, datetime.now().isoformat(timespec="seconds"), item_id),
+            )
+        return cursor.rowcount > 0
+
+    def remove_meeting(self, folder: str | Path) -> None:
+        with self.conn:
+            self.conn.execute("DELETE FROM meetings WHERE folder = ?", (Path(folder).name,))
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+    def query(
+        self,
+        owner: str | None = None,
+        status: str | None = None,
+        due_before: date | None = None,
+        due_after: date | None = None,
+        meeting: str | None = None,
+        limit: int | None = None,
+    ) -> list[dict]:
+        """Items matching every given filter, soonest deadline first.
+
+        Args:
+            owner: Owner name (case-insensitive substring).
+            status: ``"pending"``, ``"done"`` or ``"cancelled"``.
+            due_before: Only items with a parsed deadline before this date.
+            due_after: Only items with a parsed deadline on or after this date.
+            meeting: Meeting folder or title (case-insensitive substring).
+            limit: Return at most this many items.
+        """
+        where, params = [], []
+        if owner:
+            where.append("i.owner LIKE ?")
+            params.append(f"%{owner}%")
+        if status:
+            where.append("i.status = ?")
+            params.append(status)
+        if due_before:
+            where.append("i.due < ?")
+            params.append(due_before.isoformat())
+        if due_after:
+            where.append("i.due >= ?")
+            params.append(due_after.isoformat())
+        if meeting:
+            where.append("(m.folder LIKE ? OR m.title LIKE ?)")
+            params += [f"%{meeting}%"] * 2
+        sql = (
+            "SELECT i.id, i.action, i.owner, i.deadline, i.due, i.status, i.spoken_at,"
+            " m.folder, m.title, m.date FROM items i JOIN meetings m ON m.id = i.meeting_id"
+        )
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " ORDER BY i.due IS NULL, i.due, m.date, i.position"
+        if limit:
+            sql += f" LIMIT {int(limit)}"
+        return [dict(row) for row in self.conn.execute(sql, params)]
+
+    def counts(self) -> dict[str, int]:
+        """Number of items per status."""
+        counts = dict.fromkeys(STATUSES, 0)
+        counts.update(self.conn.execute("SELECT status, COUNT(*) FROM items GROUP BY status").fetchall())
+        return counts
+
+    # ------------------------------------------------------------------
+    # Backfill
+    # ------------------------------------------------------------------
+    def reindex(self, recordings_dir: str | Path) -> int:
+        """Index every meeting folder's ``action_items.md``; returns the number of meetings.
+
+        Items already indexed keep their status; the markdown's marks only set
+        the status of items added here.
+        """
+        meetings = 0
+        for action_file in sorted(Path(recordings_dir).glob(f"*/{ACTION_FILE}")):
+            title, items, statuses, spoken_at = parse_action_file(action_file)
+            meeting_date = date.fromtimestamp(action_file.stat().st_mtime)
+            self.record_meeting(action_file.parent, items, title, meeting_date, spoken_at, statuses)
+            meetings += 1
+        return meetings
+
+
+def _assigned(value: str) -> str | None:
+    value = value.strip()
+    return None if value.lower() in _UNASSIGNED else value
+
+
+def parse_deadline(text: str, meeting_date: date) -> date | None:
+    """Best-effort date for a free-text deadline ("2024-03-15", "March 15", "Friday", "next week").
+
+    Returns None when the text names no recognisable date ("ASAP", "Q3").
+    """
+    text = _ORDINAL_RE.sub(r"\1", _BY_RE.sub("", text.strip().lower()))
+    if text in ("today", "eod", "end of day"):
+        return meeting_date
+    if text == "tomorrow":
+        return meeting_date + timedelta(days=1)
+    if text == "next week":
+        return meeting_date + timedelta(days=7)
+    if text in ("end of week", "eow", "this week"):
+        return meeting_date + timedelta(days=(4 - meeting_date.weekday()) % 7)
+    # "Friday", "next Friday", "fri": the next such day after the meeting
+    weekday = text.removeprefix("next ").removeprefix("this ")
+    for i, name in enumerate(_WEEKDAYS):
+        if weekday in (name, name[:3]):
+            return meeting_date + timedelta(days=(i - meeting_date.weekday()) % 7 or 7)
+    for fmt in _DATE_FORMATS:
+        try:
+            return datetime.strptime(text, fmt).date()
+        except ValueError:
+            pass
+    for fmt in _DATE_NO_YEAR_FORMATS:
+        try:
+            parsed = datetime.strptime(f"{text} {meeting_date.year}", f"{fmt} %Y").date()
+        except ValueError:
+            continue
+        # A month earlier in the year than the meeting means next year
+        return parsed if parsed >= meeting_date - timedelta(days=31) else parsed.replace(year=parsed.year + 1)
+    return None
+
+
+def parse_action_file(path: str | Path) -> tuple[str, list[list[str]], dict[str, str], dict[str, float]]:
+    """Read back an ``action_items.md`` written by the tracker.
+
+    Returns:
+        Tuple of (meeting title, item lists, status per action, transcript time
+        per action for items spotted in the transcript).
+    """
+    marks = {mark: status for status, mark in STATUS_MARKS.items()}
+    title, items, statuses, spoken_at = Path(path).parent.name, [], {}, {}
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if line.startswith("# Action Items:"):
+                title = line.split(":", 1)[1].strip()
+                continue
+            if line.startswith("|") and "---" not in line:
+                cells = [c.strip() for c in line.strip("|").split("|")]
+                if len(cells) < 5 or not cells[0].isdigit():
+                    continue
+                action, owner, deadline, status = cells[1], cells[2], cells[3], cells[4]
+            else:
+                match = re.match(r"\d+\.\s+(\S+)\s+(.*)", line)
+                if not match or match.group(1) not in marks:
+                    continue
+                action, owner, deadline, status = match.group(2), "", "", match.group(1)
+            spoken = re.search(r"\*\(at (\d+):(\d\d)\)\*$", action)
+            action = _TIME_SUFFIX_RE.sub("", action)
+            if spoken:
+                spoken_at[action] = int(spoken.group(1)) * 60 + int(spoken.group(2))
+            statuses[action] = next((s for m, s in marks.items() if status.startswith(m)), PENDING)
+            items.append([action, owner, deadline])
+    return title, items, statuses, spoken_at
+
+
+def main() -> None:
+    """CLI entry point for the cross-meeting action-item index."""
+    parser = argparse.ArgumentParser(description="Query and update action items across meetings")
+    parser.add_argument(
+        "-r", "--recordings",
+        default="recordings",
+        help="Recordings folder holding the index (default: recordings)",
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    list_cmd = commands.add_parser("list", help="List action items")
+    list_cmd.add_argument("--owner", help="Owner name (substring, case-insensitive)")
+    list_cmd.add_argument("--status", choices=STATUSES, help="Only items with this status")
+    list_cmd.add_argument("--due-before", type=date.fromisoformat, metavar="YYYY-MM-DD",
+                          help="Only items due before this date")
+    list_cmd.add_argument("--due-after", type=date.fromisoformat, metavar="YYYY-MM-DD",
+                          help="Only items due on or after this date")
+    list_cmd.add_argument("--overdue", action="store_true", help="Pending items whose deadline has passed")
+    list_cmd.add_argument("--meeting", help="Meeting folder or title (substring)")
+    list_cmd.add_argument("-n", "--limit", type=int, help="Show at most this many items")
+
+    for name, status in ((DONE, DONE), ("cancel", CANCELLED), ("reopen", PENDING)):
+        cmd = commands.add_parser(name, help=f"Mark items {status}")
+        cmd.add_argument("ids", type=int, nargs="+", help="Item ids (from 'list')")
+        cmd.set_defaults(status=status)
+
+    commands.add_parser("reindex", help="Rebuild the index from every meeting's action_items.md")
+    commands.add_parser("stats", help="Item counts per status")
+
+    args = parser.parse_args()
+    with ActionIndex(Path(args.recordings)) as index:
+        if args.command == "list":
+            status, due_before = args.status, args.due_before
+            if args.overdue:
+                status, due_before = PENDING, min(due_before or date.today(), date.today())
+            items = index.query(args.owner, status, due_before, args.due_after, args.meeting, args.limit)
+            for item in items:
+                owner = item["owner"] or "TBD"
+                deadline = item["due"] or item["deadline"] or "no deadline"
+                print(f"{item['id']:>6} {STATUS_MARKS[item['status']]} {item['action']}"
+                      f"  [{owner}, {deadline}]  ({item['title']})")
+            print(f"{len(items)} item(s)")
+        elif args.command == "reindex":
+            print(f"Indexed {index.reindex(args.recordings)} meeting(s)")
+        elif args.command == "stats":
+            for status, count in index.counts().items():
+                print(f"{STATUS_MARKS[status]} {status}: {count}")
+        else:
+            for item_id in args.ids:
+                if not index.set_status(item_id, args.status):
+                    print(f"No action item with id {item_id}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,368 @@
+"""
+Action-Item Extraction.
+
+Finds action items in generated minutes (and any other text) in two passes:
+
+1. Formal sections - bullets, numbered lines and table rows under headers such
+   as "Action Items", "Next Steps" or "Practice Exercises".
+2. Conversational phrases - "make sure to ...", "don't forget to ...", etc.
+
+The trigger phrases are compiled once, at import, into a single alternation, so
+pass 2 is one linear scan of the text however many triggers there are (instead
+of one ``re.finditer`` scan per pattern). :func:`merge_action_items` then drops
+near-duplicates through a word-set index rather than comparing every pair, so
+both steps scale to full transcripts.
+
+:class:`TranscriptActionSpotter` runs pass 2 over transcript segments as they
+are decoded, so candidates carry the time they were spoken and are on disk
+seconds later - including items the generated minutes leave out.
+"""
+
+import json
+import re
+from bisect import bisect_right
+from collections import Counter
+from itertools import chain
+from pathlib import Path
+from typing import Callable
+
+# Header keywords that open an actionable section (partial matches)
+ACTION_KEYWORDS = (
+    'action item', 'next step', 'follow-up', 'follow up',
+    'practice exercise', 'practice exercises',
+    'key takeaway', 'key takeaways',
+    'further learning', 'recommendation',
+    'to-do', 'todo', 'tasks', 'call to action',
+    'resources mentioned', 'tools mentioned',
+)
+
+# Table header cells (not items)
+_HEADER_WORDS = ('action', 'item', 'task', 'owner', 'deadline', 'status', 'priority')
+
+# Conversational triggers; the item is the rest of the sentence after the trigger
+CONVERSATIONAL_TRIGGERS = (
+    r'i want you to ',
+    r'my suggestion is ',
+    r'you should ',
+    r'please try ',
+    r'make sure to ',
+    r'don\'t forget to ',
+    r'remember to ',
+    r'note this down[:\s]+',
+    r'note down ',
+    r'as a challenge[,\s]+',
+    r'challenge for you[:\s]+',
+    r'homework[:\s]+',
+    r'assignment[:\s]+',
+    r'practice ',
+    r'try this out[:\s]+',
+    r'check out ',
+    r'take a look at ',
+    r'read about ',
+    r'learn more about ',
+    r'explore ',
+    r'download ',
+    r'search for ',
+    r'look into ',
+)
+
+_SENTENCE_END_RE = re.compile(r"[.!?]")
+_SECTION_RE = re.compile("|".join(re.escape(kw) for kw in ACTION_KEYWORDS))
+_HEADER_RE = re.compile("|".join(_HEADER_WORDS))
+# One alternation finds the triggers (capture groups in it would make the scan ~10x slower), the
+# per-trigger patterns tell which one matched; the item is matched from the end of the trigger
+_TRIGGER_RE = re.compile("|".join(CONVERSATIONAL_TRIGGERS))
+_TRIGGER_PATTERNS = [re.compile(trigger) for trigger in CONVERSATIONAL_TRIGGERS]
+_ITEM_RE = re.compile(r"[^.!?]+")
+
+MIN_ITEM_LENGTH = 10   # Conversational items must be longer than this...
+MAX_ITEM_LENGTH = 200  # ...and shorter than this
+
+ACTIONS_LOG = "action_candidates.jsonl"
+
+_EXTRA_PROBES = 1  # Words probed past the prefix filter (see TokenSetIndex.covers)
+
+
+def _clean(item: str) -> str:
+    return item.replace('**', '').replace('`', '').strip()
+
+
+def extract_section_items(mom_content: str) -> list[list[str]]:
+    """Pass 1: items listed under action-oriented section headers.
+
+    Returns:
+        One list per item: ``[action]`` for bullets/numbered lines, or the table
+        cells (``[action, owner, deadline, ...]``) for table rows.
+    """
+    items = []
+    in_action_section = False
+    for line in mom_content.split('\n'):
+        # A header line opens (or, if it is not actionable, closes) a section
+        if line.startswith('#'):
+            in_action_section = _SECTION_RE.search(line.lower()) is not None
+            continue
+        if not in_action_section:
+            continue
+
+        stripped = line.strip()
+        if not stripped:
+            continue
+
+        # Table row (skip header and separator rows)
+        if stripped.startswith('|') and '---' not in stripped:
+            cells = [c for c in (c.strip() for c in stripped.split('|')) if c]
+            if not cells or cells[0] == '#' or _HEADER_RE.search(cells[0].lower()):
+                continue
+            # Tables with a row number column (e.g. | 1 | Action | Owner |)
+            if cells[0].isdigit() and len(cells) > 1:
+                if len(cells[1]) > 3:
+                    items.append(cells[1:])
+            elif len(cells[0]) > 3:
+                items.append(cells)
+
+        # Bullet points (- item or * item)
+        elif stripped.startswith('- ') or stripped.startswith('* '):
+            item = _clean(stripped[2:])
+            if len(item) > 3:
+                items.append([item])
+
+        # Numbered list (1. Item or 1) Item)
+        elif stripped[0].isdigit():
+            item = None
+            if '. ' in stripped[:5]:
+                item = stripped.split('. ', 1)[1]
+            elif ') ' in stripped[:5]:
+                item = stripped.split(') ', 1)[1]
+            if item:
+                item = _clean(item)
+                if len(item) > 3:
+                    items.append([item])
+    return items
+
+
+def iter_conversational(text: str):
+    """Pass 2 as a generator: yield ``(item, start, end)`` for every trigger phrase, in text order.
+
+    ``start``/``end`` are character offsets of the item in ``text``. Matching is
+    case-insensitive (the text is lower-cased once), as before.
+    """
+    for _, item, start, end in _iter_matches(text):
+        yield item, start, end
+
+
+def extract_conversational(text: str) -> list[str]:
+    """Pass 2: conversational action phrases anywhere in ``text``, ordered by trigger, then by position."""
+    return [item for _, item, _, _ in sorted(_iter_matches(text), key=lambda match: match[0])]
+
+
+def _iter_matches(text: str):
+    """Yield ``(trigger index, item, start, end)`` - the matches of one ``finditer`` per trigger, in one scan.
+
+    The search resumes one character after each trigger, so triggers inside
+    another trigger's item are found too. As with a separate scan per trigger,
+    a trigger's own matches do not overlap: an item swallows a later use of its
+    trigger, even when the item is rejected for its length.
+    """
+    text = text.lower()
+    scanned_to = [0] * len(CONVERSATIONAL_TRIGGERS)  # Where each trigger's previous match ended
+    match = _TRIGGER_RE.search(text)
+    while match:
+        trigger = next(i for i, pattern in enumerate(_TRIGGER_PATTERNS) if pattern.match(text, match.start()))
+        item_match = _ITEM_RE.match(text, match.end()) if match.start() >= scanned_to[trigger] else None
+        if item_match:
+            scanned_to[trigger] = item_match.end()
+            item = _clean(item_match.group()).replace('\n', ' ').strip()
+            if MIN_ITEM_LENGTH < len(item) < MAX_ITEM_LENGTH:
+                yield trigger, item[0].upper() + item[1:], item_match.start(), item_match.end()
+        match = _TRIGGER_RE.search(text, match.start() + 1)
+
+
+class TokenSetIndex:
+    """Inverted index over word sets for "is this item mostly covered by one we have?".
+
+    An item ``A`` duplicates a stored item ``B`` when more than ``threshold`` of
+    ``A``'s words are in ``B`` - the overlap rule the action-item tracker always
+    used. Each item's word set is built once, and a lookup only probes the
+    ``|A| - k + 1`` rarest words of ``A`` (``k`` being the overlap required):
+    if ``B`` shares ``k`` words with ``A`` it must contain one of them. Candidate
+    lists stay short, so a stream of ``n`` items is deduplicated in near-linear
+    time with exactly the same result as comparing every pair.
+    """
+
+    def __init__(self, threshold: float) -> None:
+        self.threshold = threshold
+        self._sets: list[frozenset[str]] = []
+        self._postings: dict[str, list[int]] = {}
+
+    def __len__(self) -> int:
+        return len(self._sets)
+
+    def add(self, words: frozenset[str]) -> None:
+        index = len(self._sets)
+        self._sets.append(words)
+        for word in words:
+            self._postings.setdefault(word, []).append(index)
+
+    def covers(self, words: frozenset[str]) -> bool:
+        """True if more than ``threshold`` of ``words`` appear in a single stored item."""
+        size = max(len(words), 1)
+        # Smallest overlap that counts (computed as the ratio test would, so results match exactly)
+        need = int(self.threshold * size)
+        while need / size <= self.threshold:
+            need += 1
+        probe = len(words) - need + 1
+        if probe <= 0:
+            return False
+        postings = self._postings
+        ranked = sorted(words, key=lambda w: len(postings.get(w, ())))
+        # Probing ``extra`` words past the prefix means a real match shares at
+        # least ``extra + 1`` probed words, which filters most candidates by count
+        extra = min(_EXTRA_PROBES, len(words) - probe)
+        hits = Counter(chain.from_iterable(postings.get(w, ()) for w in ranked[:probe + extra]))
+        sets = self._sets
+        return any(
+            count > extra and len(words & sets[i]) >= need
+            for i, count in hits.items()
+        )
+
+
+def word_set(text: str) -> frozenset[str]:
+    return frozenset(text.lower().split())
+
+
+def merge_action_items(formal: list[list[str]], conversational: list[str],
+                       self_threshold: float = 0.7, formal_threshold: float = 0.5) -> list[list[str]]:
+    """Deduplicate conversational items and append the new ones to the formal items.
+
+    A conversational item is dropped if more than ``self_threshold`` of its words
+    appear in an earlier kept conversational item, or more than
+    ``formal_threshold`` in an item already in the list (formal items, and the
+    conversational items appended before it).
+
+    Returns:
+        ``formal`` extended in place with ``[item]`` for each surviving
+        conversational item.
+    """
+    kept = TokenSetIndex(self_threshold)
+    listed = TokenSetIndex(formal_threshold)
+    for item in formal:
+        if item and isinstance(item[0], str):
+            listed.add(word_set(item[0]))
+
+    for item in conversational:
+        words = word_set(item)
+        if kept.covers(words):
+            continue
+        kept.add(words)
+        if listed.covers(words):
+            continue
+        listed.add(words)
+        formal.append([item])
+    return formal
+
+
+class TranscriptActionSpotter:
+    """Streaming pass 2 over transcript segments, logging timed action candidates.
+
+    Segment text is buffered until a sentence ends (a trigger and its item may
+    span several segments), then scanned; each candidate is appended to
+    ``action_candidates.jsonl`` as ``{"action", "start", "end"}`` with the start
+    of the segment the item begins in and the end of the one it ends in.
+    """
+
+    def __init__(
+        self,
+        output_dir: str | Path,
+        resume_until: float | None = None,
+        on_item: Callable[[dict], None] | None = None,
+    ) -> None:
+        """Open the candidate log.
+
+        Args:
+            output_dir: Meeting folder.
+            resume_until: Keep logged candidates ending at or before this time
+                (the resumed transcript's last segment end) and append after
+                them; None starts a new log.
+            on_item: Called with each candidate as it is found.
+        """
+        self.path = Path(output_dir) / ACTIONS_LOG
+        self.on_item = on_item
+        self.count = 0
+        self._text = ""
+        self._spans: list[tuple[int, float, float]] = []  # (offset in _text, start, end) per segment
+
+        kept = []
+        if resume_until is not None:
+            kept = [item for item in load_action_candidates(output_dir) if item["end"] <= resume_until]
+        self._f = open(self.path, "w", encoding="utf-8")
+        for item in kept:
+            self._f.write(json.dumps(item) + "\n")
+        self._f.flush()
+        self.count = len(kept)
+
+    def feed(self, segment: dict) -> list[dict]:
+        """Add one segment dict (``start``/``end``/``text``); return the candidates it completed."""
+        text = segment.get("text", "").strip()
+        if not text:
+            return []
+        if self._text:
+            self._text += " "
+        self._spans.append((len(self._text), segment["start"], segment["end"]))
+        self._text += text
+
+        # Scan up to the last sentence end; the rest waits for the next segment
+        last = None
+        for last in _SENTENCE_END_RE.finditer(text):
+            pass
+        if last is not None:
+            return self._scan(len(self._text) - len(text) + last.end())
+        if len(self._text) > 4 * MAX_ITEM_LENGTH:
+            # No punctuation for a long stretch: scan it rather than grow without bound
+            return self._scan(len(self._text))
+        return []
+
+    def _scan(self, upto: int) -> list[dict]:
+        found = []
+        starts = [offset for offset, _, _ in self._spans]
+        for action, first, last in iter_conversational(self._text[:upto]):
+            i = max(0, bisect_right(starts, first) - 1)
+            j = max(0, bisect_right(starts, last - 1) - 1)
+            item = {"action": action, "start": round(self._spans[i][1], 2), "end": round(self._spans[j][2], 2)}
+            self._f.write(json.dumps(item) + "\n")
+            found.append(item)
+            if self.on_item:
+                self.on_item(item)
+        if found:
+            self._f.flush()
+            self.count += len(found)
+
+        # Keep the unscanned tail and the segments it falls in
+        rest = self._text[upto:].lstrip()
+        cut = len(self._text) - len(rest)
+        keep = max(0, bisect_right(starts, cut) - 1) if rest else len(self._spans)
+        self._spans = [(max(0, offset - cut), start, end) for offset, start, end in self._spans[keep:]]
+        self._text = rest
+        return found
+
+    def close(self) -> None:
+        """Scan whatever is still buffered and close the log."""
+        if self._f.closed:
+            return
+        if self._text:
+            self._scan(len(self._text))
+        self._f.close()
+
+
+def load_action_candidates(output_dir: str | Path) -> list[dict]:
+    """Candidates logged by :class:`TranscriptActionSpotter` (skipping a torn last line)."""
+    items = []
+    try:
+        with open(Path(output_dir) / ACTIONS_LOG, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    items.append(json.loads(line))
+                except json.JSONDecodeError:
+                    pass
+    except FileNotFoundError:
+        pass
+    return items
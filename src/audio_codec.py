@@ -0,0 +1,140 @@
+"""
+Compressed Recording Formats.
+
+Streaming encoder for meeting recordings: the recorder hands it each mixed block
+while recording, so a FLAC (lossless, typically 40-60% smaller than WAV for
+speech) or Ogg/Opus (lossy, ~11 MB per hour at 24 kbps) file is complete the
+moment recording stops. Uncompressed 16-bit WAV is ~115 MB per hour and is what the
+meeting folder gets archived or emailed with.
+
+Also the block reader every decoder path shares, so the transcriber, the channel
+energy pass and the PCM cache read FLAC/Opus the same way they read WAV.
+
+FLAC and Opus need ``soundfile`` (libsndfile >= 1.0.31 for Opus); plain WAV
+does not.
+"""
+
+import wave
+from pathlib import Path
+from typing import Iterator
+
+import numpy as np
+from loguru import logger
+
+# Recording format -> libsndfile container/subtype and file suffix
+FORMATS = {
+    "wav": {"format": "WAV", "subtype": "PCM_16", "suffix": ".wav"},
+    "flac": {"format": "FLAC", "subtype": "PCM_16", "suffix": ".flac"},
+    "opus": {"format": "OGG", "subtype": "OPUS", "suffix": ".ogg"},
+}
+AUDIO_SUFFIXES = tuple(spec["suffix"] for spec in FORMATS.values())
+
+_READ_FRAMES = 1 << 20
+
+
+class StreamingEncoder:
+    """Writes audio blocks to a WAV/FLAC/Opus file as they are recorded."""
+
+    def __init__(self, path: str | Path, sample_rate: int, channels: int = 1,
+                 fmt: str = "flac", opus_bitrate_kbps: int = 24) -> None:
+        """Open ``path`` (its suffix is replaced to match ``fmt``) for writing.
+
+        Args:
+            path: Output path; e.g. ``audio.wav`` becomes ``audio.flac``.
+            sample_rate: Sample rate of the blocks (Opus supports 8/12/16/24/48 kHz).
+            channels: Channel count of the blocks.
+            fmt: ``"wav"``, ``"flac"`` or ``"opus"``.
+            opus_bitrate_kbps: Target bitrate per channel for Opus.
+
+        Raises:
+            ValueError: Unknown format.
+            ImportError: ``soundfile`` is not installed.
+        """
+        import soundfile as sf
+
+        if fmt not in FORMATS:
+            raise ValueError(f"Unknown recording format: {fmt} (expected one of {', '.join(FORMATS)})")
+        spec = FORMATS[fmt]
+        self.path = Path(path).with_suffix(spec["suffix"])
+        self.sample_rate = sample_rate
+        self.channels = channels
+        self.frames = 0
+
+        options = {}
+        if fmt == "opus":
+            # libsndfile maps compression level linearly from ~256 kbps (0.0) to ~6 kbps (1.0)
+            options["compression_level"] = min(max(1.0 - (opus_bitrate_kbps - 6) / 250, 0.0), 1.0)
+        self._file = sf.SoundFile(self.path, "w", samplerate=sample_rate, channels=channels,
+                                  format=spec["format"], subtype=spec["subtype"], **options)
+
+    def write(self, block: np.ndarray) -> None:
+        """Encode one block: float32 in [-1, 1] or int16, shape ``(n,)`` or ``(n, channels)``."""
+        if len(block):
+            self._file.write(block)
+            self.frames += len(block)
+
+    def close(self) -> float:
+        """Finish the file and return its duration in seconds."""
+        if not self._file.closed:
+            self._file.close()
+        return self.frames / self.sample_rate
+
+
+def open_encoder(path: str | Path, sample_rate: int, channels: int = 1, fmt: str = "flac",
+                 opus_bitrate_kbps: int = 24) -> StreamingEncoder | None:
+    """Create a :class:`StreamingEncoder`, or return None (caller writes WAV) if unavailable."""
+    try:
+        return StreamingEncoder(path, sample_rate, channels, fmt, opus_bitrate_kbps)
+    except ImportError:
+        logger.warning(f"soundfile is not installed - recording {fmt.upper()} is unavailable, writing WAV")
+    except Exception as e:
+        logger.warning(f"Could not start {fmt.upper()} encoder ({e}) - writing WAV")
+    return None
+
+
+def open_blocks(path: str | Path, block_frames: int = _READ_FRAMES) -> tuple[int, int, Iterator[np.ndarray]] | None:
+    """Open a recording for block-wise reading.
+
+    16-bit WAV is read with the standard library; FLAC/Opus (and other WAV
+    encodings) through ``soundfile`` when it is installed.
+
+    Returns:
+        ``(sample_rate, channels, blocks)`` where ``blocks`` yields float32
+        ``(n, channels)`` arrays in [-1, 1], or None if the file cannot be read
+        here (the caller falls back to the full ffmpeg decoder).
+    """
+    path = Path(path)
+    try:
+        wf = wave.open(str(path), "rb")
+    except (wave.Error, EOFError):
+        wf = None
+    if wf is not None:
+        if wf.getsampwidth() == 2:
+            return wf.getframerate(), wf.getnchannels(), _wave_blocks(wf, block_frames)
+        wf.close()
+
+    try:
+        import soundfile as sf
+
+        f = sf.SoundFile(path)
+    except (ImportError, RuntimeError):
+        return None
+    return f.samplerate, f.channels, _soundfile_blocks(f, block_frames)
+
+
+def _wave_blocks(wf: wave.Wave_read, block_frames: int) -> Iterator[np.ndarray]:
+    with wf:
+        channels = wf.getnchannels()
+        while True:
+            data = wf.readframes(block_frames)
+            if not data:
+                break
+            block = np.frombuffer(data, dtype=np.int16).reshape(-1, channels).astype(np.float32)
+            block *= 1.0 / 32768.0
+            yield block
+
+
+def _soundfile_blocks(f, block_frames: int) -> Iterator[np.ndarray]:
+    with f:
+        for block in f.blocks(blocksize=block_frames, dtype="float32", always_2d=True):
+            yield block
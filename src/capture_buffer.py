@@ -0,0 +1,187 @@
+"""
+Capture Buffers.
+
+Bounded hand-off between the capture threads (microphone callback, WASAPI
+loopback reader) and the mixer. A stalled mixer - GC pause, busy UI thread -
+can no longer grow memory without limit: once a buffer holds ``max_seconds`` of
+audio it either drops the oldest blocks or makes the producer wait, and every
+lost block, device overflow and mixer underrun is counted and time-stamped so
+block sizes and buffer depths can be sized from real recordings.
+"""
+
+import threading
+import time
+from collections import deque
+
+import numpy as np
+from loguru import logger
+
+DROP_OLDEST = "drop_oldest"
+BLOCK = "block"
+POLICIES = (DROP_OLDEST, BLOCK)
+
+_MAX_EVENTS = 500  # Dropout timestamps kept per source
+
+
+class CaptureBuffer:
+    """Bounded FIFO of audio blocks with overflow/underrun accounting."""
+
+    def __init__(
+        self,
+        name: str,
+        sample_rate: int,
+        max_seconds: float = 2.0,
+        policy: str = DROP_OLDEST,
+        block_timeout: float = 1.0,
+        ready: threading.Event | None = None,
+    ) -> None:
+        """Create an empty buffer.
+
+        Args:
+            name: Source name used in logs and metrics, e.g. ``"mic"``.
+            sample_rate: Sample rate of the blocks (for durations and capacity).
+            max_seconds: Audio the buffer holds before the policy applies.
+            policy: ``"drop_oldest"`` discards queued audio to make room;
+                ``"block"`` makes the producer wait up to ``block_timeout`` and
+                only then drops the oldest block. Producers that must not wait
+                (real-time audio callbacks) put with ``wait=False`` and get
+                ``"drop_oldest"`` either way.
+            block_timeout: Longest a producer waits under the ``"block"`` policy.
+            ready: Event set on every :meth:`put`, so a consumer waiting on
+                several buffers wakes as soon as any of them has data.
+        """
+        if policy not in POLICIES:
+            raise ValueError(f"Unknown overflow policy: {policy} (expected one of {', '.join(POLICIES)})")
+        self.name = name
+        self.sample_rate = sample_rate
+        self.capacity = max(1, int(max_seconds * sample_rate))
+        self.policy = policy
+        self.block_timeout = block_timeout
+        self.ready = ready
+
+        self._blocks: deque[np.ndarray] = deque()
+        self._frames = 0
+        self._cond = threading.Condition()
+        self.started = time.monotonic()
+
+        # Accounting
+        self.frames_in = 0
+        self.overflows = 0          # Blocks dropped because the buffer was full
+        self.overflow_frames = 0
+        self.device_overflows = 0   # Overruns reported by the audio driver
+        self.underruns = 0          # Mixer ticks this source delivered nothing while the other did
+        self.underrun_frames = 0    # Silence the mixer padded in for this source
+        self.blocked_seconds = 0.0  # Producer time spent waiting under the "block" policy
+        self.max_frames = 0         # High-water mark
+        self.dropouts: list[dict] = []
+        self._in_underrun = False
+
+    def __len__(self) -> int:
+        return self._frames
+
+    def _now(self) -> float:
+        return round(time.monotonic() - self.started, 3)
+
+    def _event(self, kind: str, frames: int) -> None:
+        if len(self.dropouts) < _MAX_EVENTS:
+            self.dropouts.append({"t": self._now(), "kind": kind, "frames": frames})
+
+    def put(self, block: np.ndarray, wait: bool = True) -> None:
+        """Add one captured block (producer side).
+
+        Args:
+            block: The captured audio.
+            wait: Whether the ``"block"`` policy may make the caller wait. Pass
+                False from a PortAudio callback: blocking it makes the driver
+                drop input, so a full buffer drops its oldest block instead.
+        """
+        n = len(block)
+        with self._cond:
+            if wait and self.policy == BLOCK and self._frames + n > self.capacity:
+                waited = time.monotonic()
+                self._cond.wait_for(lambda: self._frames + n <= self.capacity, timeout=self.block_timeout)
+                self.blocked_seconds += time.monotonic() - waited
+
+            dropped = 0
+            while self._blocks and self._frames + n > self.capacity:
+                old = self._blocks.popleft()
+                self._frames -= len(old)
+                dropped += len(old)
+            if dropped:
+                self.overflows += 1
+                self.overflow_frames += dropped
+                self._event("overflow", dropped)
+                if self.overflows == 1:
+                    logger.warning(f"Capture buffer '{self.name}' overflowed - mixer is falling behind")
+
+            self._blocks.append(block)
+            self._frames += n
+            self.frames_in += n
+            self.max_frames = max(self.max_frames, self._frames)
+            self._cond.notify_all()
+        if self.ready is not None:
+            self.ready.set()
+
+    def drain(self) -> list[np.ndarray]:
+        """Take every queued block (consumer side, never blocks)."""
+        with self._cond:
+            blocks = list(self._blocks)
+            self._blocks.clear()
+            self._frames = 0
+            self._cond.notify_all()
+        return blocks
+
+    def take(self, frames: int) -> list[np.ndarray]:
+        """Take exactly ``frames`` (or everything, if fewer are queued), splitting a block if needed."""
+        with self._cond:
+            blocks, taken = [], 0
+            while self._blocks and taken < frames:
+                block = self._blocks.popleft()
+                if taken + len(block) > frames:
+                    keep = frames - taken
+                    self._blocks.appendleft(block[keep:])
+                    block = block[:keep]
+                blocks.append(block)
+                taken += len(block)
+            self._frames -= taken
+            self._cond.notify_all()
+        return blocks
+
+    def device_overflow(self, frames: int = 0) -> None:
+        """Record an overrun the driver reported (audio lost before it reached us)."""
+        with self._cond:
+            self.device_overflows += 1
+            self._event("device_overflow", frames)
+
+    def underrun(self, frames: int) -> None:
+        """Record that the mixer padded ``frames`` of silence for this source.
+
+        Only the start of a run of consecutive underruns is time-stamped.
+        """
+        with self._cond:
+            self.underruns += 1
+            self.underrun_frames += frames
+            if not self._in_underrun:
+                self._event("underrun", frames)
+            self._in_underrun = True
+
+    def delivered(self) -> None:
+        """Mark that the source delivered data on this mixer tick (ends an underrun run)."""
+        self._in_underrun = False
+
+    def stats(self) -> dict:
+        """Counters and dropout timestamps for the meeting's metrics."""
+        with self._cond:
+            return {
+                "policy": self.policy,
+                "capacity_seconds": round(self.capacity / self.sample_rate, 3),
+                "max_fill_seconds": round(self.max_frames / self.sample_rate, 3),
+                "captured_seconds": round(self.frames_in / self.sample_rate, 2),
+                "overflows": self.overflows,
+                "overflow_seconds": round(self.overflow_frames / self.sample_rate, 3),
+                "device_overflows": self.device_overflows,
+                "underruns": self.underruns,
+                "underrun_seconds": round(self.underrun_frames / self.sample_rate, 3),
+                "blocked_seconds": round(self.blocked_seconds, 3),
+                "dropouts": list(self.dropouts),
+            }
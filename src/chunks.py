@@ -0,0 +1,204 @@
+"""
+Chunked Recordings.
+
+Long meetings can be recorded as numbered chunk files (``chunk_000.wav``,
+``chunk_001.wav``, ... or ``.flac``/``.ogg``) instead of one ``audio.wav``: the
+recorder rotates to a new file every ``chunk_minutes`` at the next silent block,
+so no single file approaches the 4 GB WAV limit and every finished chunk can be
+transcribed while the meeting is still being recorded.
+
+``chunks.json`` lists each chunk with its offset in the meeting; it stands in for
+the recording everywhere a path is expected (the PCM cache decodes the chunks in
+order) and :func:`concat_chunks` joins them into one file for export.
+"""
+
+import json
+import os
+import wave
+from pathlib import Path
+from typing import Callable, Iterator
+
+import numpy as np
+from loguru import logger
+
+from audio_codec import FORMATS, StreamingEncoder, open_blocks
+
+MANIFEST_FILE = "chunks.json"
+CHUNK_STEM = "chunk_{index:03d}"
+
+_HARD_LIMIT = 1.5  # Rotate without a silent block after this many chunk lengths
+
+
+class ChunkWriter:
+    """Writes mixed recording blocks to rotating chunk files with a manifest."""
+
+    def __init__(
+        self,
+        folder: str | Path,
+        sample_rate: int,
+        chunk_seconds: float,
+        fmt: str = "wav",
+        opus_bitrate_kbps: int = 24,
+        threshold: float = 0.001,
+        on_chunk: Callable[[Path, dict], None] | None = None,
+    ) -> None:
+        """Start the first chunk.
+
+        Args:
+            folder: Meeting folder the chunks and ``chunks.json`` are written to.
+            sample_rate: Sample rate of the blocks.
+            chunk_seconds: Target chunk length; rotation waits for a silent block.
+            fmt: ``"wav"``, ``"flac"`` or ``"opus"``.
+            opus_bitrate_kbps: Opus bitrate when ``fmt`` is ``"opus"``.
+            threshold: Block peak below which a block counts as silence.
+            on_chunk: Called as ``on_chunk(manifest_path, entry)`` (from the mixer
+                thread) each time a chunk is finished.
+        """
+        self.folder = Path(folder)
+        self.sample_rate = sample_rate
+        self.chunk_frames = int(chunk_seconds * sample_rate)
+        self.fmt = fmt
+        self.opus_bitrate_kbps = opus_bitrate_kbps
+        self.threshold = threshold
+        self.on_chunk = on_chunk
+        self.path = self.folder / MANIFEST_FILE
+        self.manifest = {"sample_rate": sample_rate, "format": fmt, "complete": False, "chunks": []}
+        self.frames = 0  # Frames in finished chunks
+        self._file = None
+        self._open(0)
+
+    def _open(self, index: int) -> None:
+        stem = CHUNK_STEM.format(index=index)
+        self._chunk_frames = 0
+        if self.fmt == "wav":
+            self._file_path = self.folder / f"{stem}.wav"
+            self._file = wave.open(str(self._file_path), "wb")
+            self._file.setnchannels(1)
+            self._file.setsampwidth(2)
+            self._file.setframerate(self.sample_rate)
+        else:
+            self._file = StreamingEncoder(self.folder / stem, self.sample_rate, 1, self.fmt, self.opus_bitrate_kbps)
+            self._file_path = self._file.path
+
+    def write(self, block: np.ndarray, peak: float) -> None:
+        """Append one mixed float32 block; rotate after it if the chunk is long enough."""
+        if not len(block):
+            return
+        if self.fmt == "wav":
+            self._file.writeframes((np.clip(block, -1.0, 1.0) * 32767).astype(np.int16).tobytes())
+        else:
+            self._file.write(block)
+        self._chunk_frames += len(block)
+
+        # Cut on a silent block so no word is split between two chunks
+        if self._chunk_frames >= self.chunk_frames and (
+            peak < self.threshold or self._chunk_frames >= _HARD_LIMIT * self.chunk_frames
+        ):
+            self._finish()
+            self._open(len(self.manifest["chunks"]))
+
+    def _finish(self) -> dict | None:
+        self._file.close()
+        self._file = None
+        if not self._chunk_frames:
+            self._file_path.unlink(missing_ok=True)
+            return None
+        entry = {
+            "file": self._file_path.name,
+            "offset": round(self.frames / self.sample_rate, 3),
+            "duration": round(self._chunk_frames / self.sample_rate, 3),
+            "frames": self._chunk_frames,
+        }
+        self.manifest["chunks"].append(entry)
+        self.frames += self._chunk_frames
+        self._save()
+        logger.info(f"Chunk finished: {entry['file']} ({entry['duration']:.0f}s at {entry['offset']:.0f}s)")
+        if self.on_chunk:
+            try:
+                self.on_chunk(self.path, entry)
+            except Exception as e:
+                logger.error(f"Chunk callback failed for {entry['file']}: {e}")
+        return entry
+
+    def _save(self) -> None:
+        tmp = self.path.with_suffix(".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self.manifest, f, indent=2)
+        os.replace(tmp, self.path)
+
+    def close(self) -> float:
+        """Finish the last chunk, mark the manifest complete and return the total duration."""
+        if self._file is not None:
+            self._finish()
+        self.manifest["complete"] = True
+        self._save()
+        return self.frames / self.sample_rate
+
+
+def is_manifest(path: str | Path) -> bool:
+    return Path(path).name == MANIFEST_FILE
+
+
+def load_manifest(path: str | Path) -> dict:
+    """Read ``chunks.json`` (a meeting folder or the manifest path itself)."""
+    path = Path(path)
+    if path.is_dir():
+        path = path / MANIFEST_FILE
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def chunk_blocks(path: str | Path, block_frames: int = 1 << 20) -> tuple[int, int, Iterator[np.ndarray]] | None:
+    """Block reader over every chunk in order - :func:`audio_codec.open_blocks` for a manifest."""
+    path = Path(path)
+    manifest = load_manifest(path)
+    files = [path.parent / entry["file"] for entry in manifest["chunks"]]
+    opened = [open_blocks(f, block_frames) for f in files]
+    if not opened or any(o is None for o in opened):
+        return None
+    rate, channels = opened[0][0], opened[0][1]
+
+    def blocks() -> Iterator[np.ndarray]:
+        for _, _, chunk in opened:
+            yield from chunk
+
+    return rate, channels, blocks()
+
+
+def concat_chunks(manifest_path: str | Path, out_path: str | Path, fmt: str | None = None,
+                  opus_bitrate_kbps: int = 24) -> Path:
+    """Join a chunked recording into one file for export.
+
+    Args:
+        manifest_path: The meeting's ``chunks.json``.
+        out_path: Output file; its suffix is replaced to match ``fmt``.
+        fmt: ``"wav"``, ``"flac"`` or ``"opus"``; defaults to the suffix of
+            ``out_path``, else the chunks' own format.
+
+    Returns:
+        The written file.
+    """
+    out_path = Path(out_path)
+    if fmt is None:
+        by_suffix = {spec["suffix"]: name for name, spec in FORMATS.items()}
+        fmt = by_suffix.get(out_path.suffix.lower(), load_manifest(manifest_path)["format"])
+    opened = chunk_blocks(manifest_path)
+    if opened is None:
+        raise ValueError(f"Cannot read the chunks listed in {manifest_path}")
+    rate, channels, blocks = opened
+
+    if fmt == "wav":
+        out_path = out_path.with_suffix(".wav")
+        with wave.open(str(out_path), "wb") as wf:
+            wf.setnchannels(channels)
+            wf.setsampwidth(2)
+            wf.setframerate(rate)
+            for block in blocks:
+                wf.writeframes((np.clip(block, -1.0, 1.0) * 32767).astype(np.int16).tobytes())
+        return out_path
+
+    encoder = StreamingEncoder(out_path, rate, channels, fmt, opus_bitrate_kbps)
+    for block in blocks:
+        encoder.write(block)
+    encoder.close()
+    return encoder.path
@@ -0,0 +1,165 @@
+"""
+Shared Decoded Audio.
+
+Decodes a meeting recording once into a raw float32 PCM file (16 kHz mono, the
+format Whisper consumes) next to the recording, and hands out memory-mapped,
+zero-copy views of it. Whisper, resume seeking and any later stage (VAD,
+diarization, chunking) read the same mapping instead of each running its own
+ffmpeg/PyAV decode.
+"""
+
+import json
+import os
+from pathlib import Path
+
+import numpy as np
+from loguru import logger
+
+from audio_codec import open_blocks
+from chunks import chunk_blocks, is_manifest
+
+SAMPLE_RATE = 16000
+PCM_SUFFIX = ".pcm"
+META_SUFFIX = ".pcm.json"
+
+_READ_FRAMES = 1 << 20  # Frames converted per block when building the cache
+
+
+class DecodedAudio:
+    """Memory-mapped float32 PCM for one recording."""
+
+    def __init__(self, pcm_path: Path, sample_rate: int = SAMPLE_RATE) -> None:
+        self.pcm_path = Path(pcm_path)
+        self.sample_rate = sample_rate
+        if self.pcm_path.stat().st_size:
+            self.samples = np.memmap(self.pcm_path, dtype=np.float32, mode="r")
+        else:
+            self.samples = np.zeros(0, dtype=np.float32)
+
+    # ------------------------------------------------------------------
+    # Construction
+    # ------------------------------------------------------------------
+    @classmethod
+    def open(cls, audio_path: str | Path, cache_dir: str | Path | None = None,
+             channel: int | None = None) -> "DecodedAudio":
+        """Return the decoded PCM for ``audio_path``, decoding only if not cached.
+
+        Args:
+            audio_path: Recording to decode (WAV, MP3, ...), or the ``chunks.json``
+                of a chunked recording (its chunks are decoded in order).
+            cache_dir: Folder for the PCM cache (default: next to the recording).
+            channel: Decode only this channel of a multi-channel recording
+                (cached as ``<stem>.ch<channel>.pcm``); None downmixes to mono.
+
+        Returns:
+            A :class:`DecodedAudio` backed by ``<stem>.pcm`` in the cache folder.
+        """
+        audio_path = Path(audio_path)
+        pcm_path, meta_path = cls._cache_paths(audio_path, cache_dir, channel)
+        source = _source_signature(audio_path)
+
+        try:
+            with open(meta_path, "r", encoding="utf-8") as f:
+                meta = json.load(f)
+            if meta.get("source") == source and pcm_path.exists():
+                return cls(pcm_path, meta.get("sample_rate", SAMPLE_RATE))
+        except (FileNotFoundError, json.JSONDecodeError):
+            pass
+
+        logger.info(f"Decoding {audio_path.name} to shared PCM cache...")
+        tmp_path = pcm_path.with_suffix(".pcm.tmp")
+        if not _to_pcm(audio_path, tmp_path, channel):
+            from faster_whisper import decode_audio
+
+            if channel is None:
+                samples = decode_audio(str(audio_path), sampling_rate=SAMPLE_RATE)
+            else:
+                samples = decode_audio(str(audio_path), sampling_rate=SAMPLE_RATE, split_stereo=True)[channel]
+            samples.astype(np.float32, copy=False).tofile(tmp_path)
+        tmp_path.replace(pcm_path)
+        _write_meta(meta_path, source)
+        return cls(pcm_path)
+
+    @classmethod
+    def from_array(cls, samples: np.ndarray, audio_path: str | Path,
+                   cache_dir: str | Path | None = None) -> "DecodedAudio":
+        """Write already-decoded 16 kHz mono float32 samples as the cache for ``audio_path``.
+
+        Used by the recorder, which has the PCM in memory when it writes the WAV,
+        so the recording never needs decoding at all. ``audio_path`` must exist.
+        """
+        audio_path = Path(audio_path)
+        pcm_path, meta_path = cls._cache_paths(audio_path, cache_dir)
+        np.asarray(samples, dtype=np.float32).tofile(pcm_path)
+        _write_meta(meta_path, _source_signature(audio_path))
+        return cls(pcm_path)
+
+    @staticmethod
+    def _cache_paths(audio_path: Path, cache_dir: str | Path | None,
+                     channel: int | None = None) -> tuple[Path, Path]:
+        folder = Path(cache_dir) if cache_dir else audio_path.parent
+        stem = audio_path.stem if channel is None else f"{audio_path.stem}.ch{channel}"
+        return folder / f"{stem}{PCM_SUFFIX}", folder / f"{stem}{META_SUFFIX}"
+
+    # ------------------------------------------------------------------
+    # Access
+    # ------------------------------------------------------------------
+    @property
+    def duration(self) -> float:
+        return len(self.samples) / self.sample_rate
+
+    def view(self, start: float = 0.0, end: float | None = None) -> np.ndarray:
+        """Zero-copy slice of the samples between ``start`` and ``end`` seconds."""
+        i0 = max(0, int(start * self.sample_rate))
+        i1 = len(self.samples) if end is None else int(end * self.sample_rate)
+        return self.samples[i0:i1]
+
+    def remove(self) -> None:
+        """Delete the cache files (once every stage is done with them)."""
+        meta_path = self.pcm_path.with_name(self.pcm_path.name[: -len(PCM_SUFFIX)] + META_SUFFIX)
+        self.samples = np.zeros(0, dtype=np.float32)  # Drop the mapping before unlinking (Windows)
+        try:
+            self.pcm_path.unlink(missing_ok=True)
+            meta_path.unlink(missing_ok=True)
+        except OSError as e:
+            # Another view may still hold the mapping open; the cache is only disk space
+            logger.warning(f"Could not remove PCM cache {self.pcm_path}: {e}")
+
+
+def _source_signature(audio_path: Path) -> dict:
+    """Identify the source file version the cache was built from."""
+    stat = os.stat(audio_path)
+    return {"name": audio_path.name, "size": stat.st_size, "mtime": stat.st_mtime}
+
+
+def _write_meta(meta_path: Path, source: dict) -> None:
+    with open(meta_path, "w", encoding="utf-8") as f:
+        json.dump({"sample_rate": SAMPLE_RATE, "dtype": "float32", "source": source}, f)
+
+
+def _to_pcm(audio_path: Path, pcm_path: Path, channel: int | None = None) -> bool:
+    """Convert a 16 kHz WAV/FLAC/Opus recording (or chunk manifest) block by block, without ffmpeg.
+
+    Multi-channel files are downmixed, or reduced to ``channel``. Returns False
+    for anything else, so the caller falls back to the full decoder.
+    """
+    if is_manifest(audio_path):
+        opened = chunk_blocks(audio_path, _READ_FRAMES)
+    else:
+        opened = open_blocks(audio_path, _READ_FRAMES)
+    if opened is None:
+        return False
+    rate, channels, blocks = opened
+    if rate != SAMPLE_RATE or (channel is not None and channel >= channels):
+        return False
+
+    with open(pcm_path, "wb") as out:
+        for block in blocks:
+            if channel is not None:
+                mono = block[:, channel]
+            elif channels > 1:
+                mono = block.mean(axis=1, dtype=np.float32)
+            else:
+                mono = block[:, 0]
+            out.write(np.ascontiguousarray(mono).tobytes())
+    return True
@@ -0,0 +1,317 @@
+"""
+Speaker Diarization.
+
+CPU-only speaker labelling that needs no model download: each VAD speech
+interval is cut into short overlapping windows, every window is described by an
+MFCC-statistics embedding (NumPy only), and the embeddings are clustered into
+speakers. Embeddings are cached per meeting, so re-running (a resumed
+transcription, different clustering settings) skips feature extraction.
+
+The stage only reads the shared decoded PCM and the speech map, so it can run on
+its own worker while Whisper decodes; labels are attached to the transcript
+segments afterwards by time overlap.
+"""
+
+import json
+from pathlib import Path
+
+import numpy as np
+from loguru import logger
+
+from decoded_audio import SAMPLE_RATE
+from speech_map import SpeechMap
+
+EMBEDDINGS_FILE = "speaker_embeddings.npz"
+
+DEFAULT_DIARIZATION_PARAMS = {
+    "window_seconds": 1.5,      # Embedding window
+    "hop_seconds": 0.75,        # Window step inside a speech interval
+    "min_interval_seconds": 0.5,  # Shorter speech intervals are not embedded
+    "threshold": 0.55,          # Cosine distance at which clusters stop merging
+    "num_speakers": None,       # Force a speaker count (None = use the threshold)
+    "max_speakers": 8,
+}
+
+# Parameters that change the embeddings (the rest only change clustering)
+_EMBEDDING_KEYS = ("window_seconds", "hop_seconds", "min_interval_seconds")
+
+_FRAME = 400      # 25 ms analysis frames
+_STEP = 160       # 10 ms frame step
+_N_FFT = 512
+_N_MELS = 40
+_N_MFCC = 20
+_BLOCK_FRAMES = 4096  # Frames per FFT block (~41 s of audio, ~10 MB of spectra)
+
+
+class Diarization:
+    """Speaker label per embedding window, with segment lookup by time."""
+
+    def __init__(self, windows: np.ndarray, labels: np.ndarray) -> None:
+        """Create a diarization result.
+
+        Args:
+            windows: ``(n, 2)`` window [start, end) times in seconds, sorted by start.
+            labels: Speaker index per window, numbered by first appearance.
+        """
+        self.windows = windows
+        self.labels = labels
+        self.num_speakers = int(labels.max()) + 1 if len(labels) else 0
+        self._max_window = float((windows[:, 1] - windows[:, 0]).max()) if len(windows) else 0.0
+
+    def speaker_at(self, start: float, end: float) -> int | None:
+        """Return the speaker overlapping ``[start, end)`` the most (None if no windows)."""
+        if not len(self.windows):
+            return None
+        starts, ends = self.windows[:, 0], self.windows[:, 1]
+        lo = int(np.searchsorted(starts, start - self._max_window, side="left"))
+        hi = int(np.searchsorted(starts, end, side="right"))
+        overlap = np.minimum(ends[lo:hi], end) - np.maximum(starts[lo:hi], start)
+        if len(overlap) and overlap.max() > 0:
+            votes = np.bincount(self.labels[lo:hi], weights=np.clip(overlap, 0, None), minlength=self.num_speakers)
+            return int(votes.argmax())
+        # No overlap (segment in a VAD gap): take the nearest window
+        centers = (starts + ends) / 2
+        return int(self.labels[np.abs(centers - (start + end) / 2).argmin()])
+
+    def annotate(self, segment: dict) -> dict:
+        """Set ``segment["speaker"]`` from its time range (in place) and return it."""
+        speaker = self.speaker_at(segment["start"], segment["end"])
+        if speaker is not None:
+            segment["speaker"] = speaker
+        return segment
+
+
+def diarize(
+    samples: np.ndarray,
+    speech_map: SpeechMap | None = None,
+    output_dir: str | Path | None = None,
+    params: dict | None = None,
+    filename: str = EMBEDDINGS_FILE,
+) -> Diarization:
+    """Label speakers in a recording.
+
+    Args:
+        samples: 16 kHz mono float32 audio (usually a :class:`DecodedAudio` memmap).
+        speech_map: VAD speech intervals; without one the whole file is used.
+        output_dir: Meeting folder for the embedding cache (None = no cache).
+        params: Overrides for :data:`DEFAULT_DIARIZATION_PARAMS`.
+        filename: Name of the embedding cache file.
+
+    Returns:
+        The :class:`Diarization` for the recording.
+    """
+    params = {**DEFAULT_DIARIZATION_PARAMS, **(params or {})}
+    if speech_map is None:
+        speech_map = SpeechMap(np.array([[0.0, len(samples) / SAMPLE_RATE]]), len(samples) / SAMPLE_RATE)
+
+    cache = Path(output_dir) / filename if output_dir else None
+    embed_params = {k: params[k] for k in _EMBEDDING_KEYS}
+    windows, embeddings = _load_embeddings(cache, embed_params, speech_map) if cache else (None, None)
+    if windows is None:
+        logger.info("Extracting speaker embeddings...")
+        windows, embeddings = extract_embeddings(samples, speech_map, embed_params)
+        if cache:
+            _save_embeddings(cache, embed_params, speech_map, windows, embeddings)
+
+    labels = cluster(embeddings, params["threshold"], params["num_speakers"], params["max_speakers"])
+    result = Diarization(windows, labels)
+    logger.info(f"Diarization: {result.num_speakers} speakers over {len(windows)} windows")
+    return result
+
+
+# ----------------------------------------------------------------------
+# Embeddings
+# ----------------------------------------------------------------------
+def extract_embeddings(samples: np.ndarray, speech_map: SpeechMap,
+                       params: dict | None = None) -> tuple[np.ndarray, np.ndarray]:
+    """Embed every window of every speech interval.
+
+    Returns:
+        ``(windows, embeddings)``: ``(n, 2)`` window times in seconds and ``(n, d)``
+        L2-normalized embeddings (MFCC means and standard deviations,
+        standardized across the recording).
+    """
+    params = {**DEFAULT_DIARIZATION_PARAMS, **(params or {})}
+    win = max(1, int(params["window_seconds"] * SAMPLE_RATE / _STEP))   # In frames
+    hop = max(1, int(params["hop_seconds"] * SAMPLE_RATE / _STEP))
+    min_len = params["min_interval_seconds"]
+
+    window_times, stats = [], []
+    for start, end in speech_map.intervals:
+        if end - start < min_len:
+            continue
+        i0, i1 = int(start * SAMPLE_RATE), min(int(end * SAMPLE_RATE), len(samples))
+        mfcc = _mfcc(np.asarray(samples[i0:i1], dtype=np.float32))
+        n = len(mfcc)
+        if not n:
+            continue
+
+        # Window means/stds from cumulative sums: O(frames), not O(frames * window)
+        csum = np.vstack([np.zeros(mfcc.shape[1]), np.cumsum(mfcc, axis=0)])
+        csq = np.vstack([np.zeros(mfcc.shape[1]), np.cumsum(mfcc * mfcc, axis=0)])
+        lo = np.arange(0, max(n - win, 0) + 1, hop)
+        hi = np.minimum(lo + win, n)
+        count = (hi - lo)[:, None]
+        mean = (csum[hi] - csum[lo]) / count
+        std = np.sqrt(np.maximum((csq[hi] - csq[lo]) / count - mean * mean, 0.0))
+        stats.append(np.hstack([mean, std]))
+        window_times.append(np.column_stack([start + lo * _STEP / SAMPLE_RATE,
+                                             start + hi * _STEP / SAMPLE_RATE]))
+
+    if not stats:
+        return np.zeros((0, 2)), np.zeros((0, 2 * (_N_MFCC - 1)), dtype=np.float32)
+
+    embeddings = np.vstack(stats)
+    embeddings = (embeddings - embeddings.mean(axis=0)) / (embeddings.std(axis=0) + 1e-8)
+    embeddings /= np.linalg.norm(embeddings, axis=1, keepdims=True) + 1e-8
+    return np.vstack(window_times), embeddings.astype(np.float32)
+
+
+def _mfcc(x: np.ndarray) -> np.ndarray:
+    """MFCCs (without c0) for each 25 ms frame of ``x``.
+
+    Frames are transformed ``_BLOCK_FRAMES`` at a time, so the spectra of a long
+    speech interval are never held at once: memory stays flat whatever its length.
+    """
+    if len(x) < _FRAME:
+        return np.zeros((0, _N_MFCC - 1), dtype=np.float32)
+    n = (len(x) - _FRAME) // _STEP + 1
+    mfcc = np.empty((n, _N_MFCC - 1), dtype=np.float32)
+    for f0 in range(0, n, _BLOCK_FRAMES):
+        f1 = min(f0 + _BLOCK_FRAMES, n)
+        # The block's samples run one frame length past its last frame start
+        block = x[f0 * _STEP:(f1 - 1) * _STEP + _FRAME]
+        frames = np.lib.stride_tricks.sliding_window_view(block, _FRAME)[::_STEP] * _window()
+        power = np.abs(np.fft.rfft(frames, n=_N_FFT)) ** 2
+        log_mel = np.log(power @ _mel_filters().T + 1e-10)
+        mfcc[f0:f1] = (log_mel @ _dct_matrix())[:, 1:]
+    return mfcc
+
+
+_cache: dict[str, np.ndarray] = {}
+
+
+def _window() -> np.ndarray:
+    if "window" not in _cache:
+        _cache["window"] = np.hanning(_FRAME).astype(np.float32)
+    return _cache["window"]
+
+
+def _mel_filters() -> np.ndarray:
+    """Triangular mel filterbank, ``(n_mels, n_fft // 2 + 1)``."""
+    if "mel" not in _cache:
+        def hz_to_mel(f):
+            return 2595.0 * np.log10(1.0 + f / 700.0)
+
+        def mel_to_hz(m):
+            return 700.0 * (10 ** (m / 2595.0) - 1.0)
+
+        edges = mel_to_hz(np.linspace(hz_to_mel(60.0), hz_to_mel(SAMPLE_RATE / 2), _N_MELS + 2))
+        bins = np.fft.rfftfreq(_N_FFT, 1.0 / SAMPLE_RATE)
+        lower, center, upper = edges[:-2, None], edges[1:-1, None], edges[2:, None]
+        rising = (bins - lower) / (center - lower)
+        falling = (upper - bins) / (upper - center)
+        _cache["mel"] = np.maximum(0.0, np.minimum(rising, falling)).astype(np.float32)
+    return _cache["mel"]
+
+
+def _dct_matrix() -> np.ndarray:
+    """Orthonormal DCT-II basis, ``(n_mels, n_mfcc)``."""
+    if "dct" not in _cache:
+        n = np.arange(_N_MELS)[:, None]
+        k = np.arange(_N_MFCC)[None, :]
+        basis = np.cos(np.pi / _N_MELS * (n + 0.5) * k) * np.sqrt(2.0 / _N_MELS)
+        basis[:, 0] /= np.sqrt(2.0)
+        _cache["dct"] = basis
+    return _cache["dct"]
+
+
+# ----------------------------------------------------------------------
+# Clustering
+# ----------------------------------------------------------------------
+def cluster(embeddings: np.ndarray, threshold: float = 0.55, num_speakers: int | None = None,
+            max_speakers: int = 8) -> np.ndarray:
+    """Cluster L2-normalized embeddings into speakers.
+
+    A leader pass first groups windows into many tight clusters in O(n * k),
+    then average-linkage agglomeration merges the cluster centroids until the
+    closest pair is further apart than ``threshold`` (cosine distance), or
+    until ``num_speakers`` remain. Labels are numbered by first appearance.
+    """
+    n = len(embeddings)
+    if not n:
+        return np.zeros(0, dtype=np.int64)
+
+    # Leader pass: a window joins the closest centroid within half the merge threshold
+    leader_threshold = threshold / 2
+    sums = np.zeros((0, embeddings.shape[1]), dtype=np.float64)
+    counts = []
+    assign = np.empty(n, dtype=np.int64)
+    for i, e in enumerate(embeddings):
+        if counts:
+            centroids = sums / np.linalg.norm(sums, axis=1, keepdims=True)
+            sims = centroids @ e
+            best = int(sims.argmax())
+            if 1.0 - sims[best] <= leader_threshold:
+                sums[best] += e
+                counts[best] += 1
+                assign[i] = best
+                continue
+        sums = np.vstack([sums, e])
+        counts.append(1)
+        assign[i] = len(counts) - 1
+
+    # Agglomerate the centroids (average linkage, weighted by cluster size)
+    counts = np.array(counts, dtype=np.float64)
+    members = [[k] for k in range(len(counts))]
+    means = sums / counts[:, None]
+    target = num_speakers or 1
+    while len(members) > target:
+        unit = means / (np.linalg.norm(means, axis=1, keepdims=True) + 1e-8)
+        dist = 1.0 - unit @ unit.T
+        np.fill_diagonal(dist, np.inf)
+        a, b = np.unravel_index(int(dist.argmin()), dist.shape)
+        if num_speakers is None and dist[a, b] > threshold and len(members) <= max_speakers:
+            break
+        a, b = min(a, b), max(a, b)
+        means[a] = (means[a] * counts[a] + means[b] * counts[b]) / (counts[a] + counts[b])
+        counts[a] += counts[b]
+        members[a] += members.pop(b)
+        means = np.delete(means, b, axis=0)
+        counts = np.delete(counts, b)
+
+    leader_to_speaker = np.empty(len(sums), dtype=np.int64)
+    for speaker, leaders in enumerate(members):
+        leader_to_speaker[leaders] = speaker
+    labels = leader_to_speaker[assign]
+
+    # Renumber by first appearance so "Speaker 1" is whoever talks first
+    _, first = np.unique(labels, return_index=True)
+    order = np.argsort(np.argsort(first))
+    return order[np.searchsorted(np.unique(labels), labels)]
+
+
+# ----------------------------------------------------------------------
+# Cache
+# ----------------------------------------------------------------------
+def _load_embeddings(path: Path, params: dict, speech_map: SpeechMap) -> tuple[np.ndarray | None, np.ndarray | None]:
+    try:
+        with np.load(path) as data:
+            meta = json.loads(str(data["meta"]))
+            intervals = data["intervals"]
+            # speech.json keeps intervals to the millisecond
+            if (meta.get("params") != params or intervals.shape != speech_map.intervals.shape
+                    or not np.allclose(intervals, speech_map.intervals, rtol=0, atol=1e-3)):
+                return None, None
+            logger.info(f"Using cached speaker embeddings: {path.name}")
+            return data["windows"], data["embeddings"]
+    except (FileNotFoundError, KeyError, ValueError, OSError):
+        return None, None
+
+
+def _save_embeddings(path: Path, params: dict, speech_map: SpeechMap,
+                     windows: np.ndarray, embeddings: np.ndarray) -> None:
+    tmp_path = path.with_name(path.name + ".tmp.npz")
+    np.savez(tmp_path, meta=json.dumps({"params": params}), intervals=speech_map.intervals,
+             windows=windows, embeddings=embeddings)
+    tmp_path.replace(path)
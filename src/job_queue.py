@@ -0,0 +1,212 @@
+"""
+Meeting Processing Queue.
+
+Recordings are processed (Whisper, LLM, email) by a fixed number of worker
+threads pulling from one queue, instead of a new thread per recording: back to
+back meetings wait their turn instead of competing for the GPU, and each job
+carries its own options so nothing is read from shared UI state mid-run.
+
+Job state is kept in ``jobs.json`` in the recordings folder and rewritten on
+every change, so queued work (and work interrupted while running) is picked up
+again after a restart. Each job counts its attempts: a recording that keeps
+failing, or keeps taking the app down with it, is marked failed instead of
+being retried on every start.
+"""
+
+import json
+import os
+import queue
+import threading
+import uuid
+from datetime import datetime
+from pathlib import Path
+from typing import Callable
+
+from loguru import logger
+
+JOBS_FILE = "jobs.json"
+
+# Job states
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+
+_KEEP_FINISHED = 50  # Finished jobs kept in the file as history
+MAX_ATTEMPTS = 3  # Runs of one recording before it is no longer resumed
+
+
+class JobQueue:
+    """Persistent FIFO of processing jobs served by a fixed pool of workers."""
+
+    def __init__(
+        self,
+        path: str | Path,
+        run: Callable[[dict], None],
+        workers: int = 1,
+        on_change: Callable[[], None] | None = None,
+    ) -> None:
+        """Load the queue file; call :meth:`start` to begin processing.
+
+        Args:
+            path: The ``jobs.json`` file.
+            run: Processes one job (called on a worker thread); raising marks the
+                job failed.
+            workers: Number of jobs processed at the same time.
+            on_change: Called (from any thread) whenever a job is added or
+                changes state.
+        """
+        self.path = Path(path)
+        self.run = run
+        self.workers = max(1, workers)
+        self.on_change = on_change
+        self._lock = threading.Lock()
+        self._pending = queue.Queue()
+        self._threads: list[threading.Thread] = []
+        self._started = False
+        self.jobs: list[dict] = self._load()
+
+    def _load(self) -> list[dict]:
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                jobs = json.load(f)
+        except FileNotFoundError:
+            return []
+        except (json.JSONDecodeError, OSError) as e:
+            logger.warning(f"Ignoring unreadable job queue {self.path}: {e}")
+            return []
+        for job in jobs:
+            if job["state"] != RUNNING:
+                continue
+            # Interrupted by a crash or quit; a job that keeps crashing the app is given up on
+            if job.get("attempts", 0) >= MAX_ATTEMPTS:
+                job["state"] = FAILED
+                job["error"] = f"Interrupted {job['attempts']} times"
+                logger.warning(f"Not resuming {job['audio_file']}: interrupted {job['attempts']} times")
+            else:
+                job["state"] = QUEUED
+        return jobs
+
+    def _save(self) -> None:
+        """Atomically rewrite the queue file (call with the lock held)."""
+        finished = [job for job in self.jobs if job["state"] in (DONE, FAILED)]
+        if len(finished) > _KEEP_FINISHED:
+            drop = {id(job) for job in finished[:-_KEEP_FINISHED]}
+            self.jobs = [job for job in self.jobs if id(job) not in drop]
+        tmp = self.path.with_suffix(".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self.jobs, f, indent=2)
+        os.replace(tmp, self.path)
+
+    def _changed(self) -> None:
+        if self.on_change:
+            self.on_change()
+
+    def start(self) -> int:
+        """Start the workers on every queued job (including ones left pending by a previous run).
+
+        Returns:
+            How many queued jobs there were.
+        """
+        with self._lock:
+            resumed = [job for job in self.jobs if job["state"] == QUEUED]
+            for job in resumed:
+                self._pending.put(job)
+            if resumed:
+                self._save()
+            self._started = True
+        if resumed:
+            logger.info(f"Processing {len(resumed)} queued meeting(s)")
+        for i in range(self.workers):
+            thread = threading.Thread(target=self._work, daemon=True, name=f"meeting-worker-{i}")
+            thread.start()
+            self._threads.append(thread)
+        self._changed()
+        return len(resumed)
+
+    def submit(self, audio_file: str, **options) -> dict:
+        """Queue a recording for processing (no-op if it is already pending).
+
+        Args:
+            audio_file: The recording to process.
+            **options: Stored with the job, e.g. ``meeting_type``, ``summary_length``, ``title``.
+
+        Returns:
+            The job dict.
+        """
+        with self._lock:
+            for job in self.jobs:
+                if job["audio_file"] == audio_file and job["state"] in (QUEUED, RUNNING):
+                    return job
+            job = {
+                "id": uuid.uuid4().hex[:12],
+                "audio_file": audio_file,
+                **options,
+                "state": QUEUED,
+                "stage": None,
+                "queued_at": datetime.now().isoformat(timespec="seconds"),
+                "started_at": None,
+                "finished_at": None,
+                "error": None,
+                # Carried over from earlier jobs for the same recording
+                "attempts": self._attempts(audio_file),
+            }
+            self.jobs.append(job)
+            self._save()
+            if self._started:  # Otherwise start() picks it up with the resumed jobs
+                self._pending.put(job)
+        logger.info(f"Queued for processing: {audio_file}")
+        self._changed()
+        return job
+
+    def _attempts(self, audio_file: str) -> int:
+        return max((job.get("attempts", 0) for job in self.jobs if job["audio_file"] == audio_file), default=0)
+
+    def attempts(self, audio_file: str) -> int:
+        """How many times the recording has been run, across all its jobs still on file."""
+        with self._lock:
+            return self._attempts(audio_file)
+
+    def set_stage(self, job: dict, stage: str) -> None:
+        """Record the running job's current step (e.g. "Transcribing...") for the UI."""
+        with self._lock:
+            job["stage"] = stage
+        self._changed()
+
+    def counts(self) -> dict[str, int]:
+        """Number of jobs per state."""
+        with self._lock:
+            counts = {QUEUED: 0, RUNNING: 0, DONE: 0, FAILED: 0}
+            for job in self.jobs:
+                counts[job["state"]] += 1
+            return counts
+
+    def running(self) -> list[dict]:
+        """Snapshot of the jobs being processed right now."""
+        with self._lock:
+            return [dict(job) for job in self.jobs if job["state"] == RUNNING]
+
+    def _work(self) -> None:
+        while True:
+            job = self._pending.get()
+            with self._lock:
+                job["state"] = RUNNING
+                job["attempts"] = job.get("attempts", 0) + 1
+                job["started_at"] = datetime.now().isoformat(timespec="seconds")
+                self._save()
+            self._changed()
+
+            try:
+                self.run(job)
+                state, error = DONE, None
+            except Exception as e:
+                logger.error(f"Processing error ({job['audio_file']}): {e}")
+                state, error = FAILED, str(e)
+
+            with self._lock:
+                job["state"] = state
+                job["stage"] = None
+                job["error"] = error
+                job["finished_at"] = datetime.now().isoformat(timespec="seconds")
+                self._save()
+            self._changed()
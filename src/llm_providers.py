@@ -3,9 +3,18 @@ LLM Provider Abstraction Layer.
 
 Supports Ollama (local) and OpenAI GPT models as interchangeable backends
 for meeting summarization.
+
+Both reuse the work done on a prompt prefix they have seen before: Ollama keeps
+the evaluated prompt in the loaded model's cache and re-evaluates only from the
+first token that differs, and OpenAI caches prompt prefixes of 1024+ tokens.
+Prompts therefore start with the static template, and everything that changes
+per meeting comes after it (see ``prompt_builder``). The time the provider
+spent evaluating the prompt, or the tokens it served from its cache, are
+reported in the stats.
 """
 
 import os
+import time
 from abc import ABC, abstractmethod
 
 import requests
@@ -16,13 +25,19 @@ class LLMProvider(ABC):
     """Abstract base for LLM providers."""
 
     @abstractmethod
-    def generate(self, prompt: str, temperature: float = 0.3, max_tokens: int = 4096) -> str:
+    def generate(self, prompt: str, temperature: float = 0.3, max_tokens: int = 4096,
+                 stats: dict | None = None) -> str:
         """Generate text from a prompt.
 
         Args:
             prompt: The input prompt.
             temperature: Sampling temperature (0.0-1.0).
             max_tokens: Maximum tokens in response.
+            stats: If given, filled with the token counts reported by the
+                provider (``provider_prompt_tokens``, ``response_tokens``), the
+                request time (``request_ms``) and what the provider reports
+                on the prompt evaluation (``prompt_eval_ms``, ``load_ms`` for Ollama;
+                ``cached_prompt_tokens`` for OpenAI).
 
         Returns:
             Generated text response.
@@ -40,39 +55,69 @@ class LLMProvider(ABC):
         """Human-readable provider name."""
         ...
 
+    @property
+    def context_window(self) -> int:
+        """Tokens the model holds for the prompt and the response together."""
+        return 8192
+
 
 class OllamaProvider(LLMProvider):
     """Wraps Ollama HTTP API for local LLM inference."""
 
-    def __init__(self, model: str, url: str, context_window: int = 8192) -> None:
+    def __init__(self, model: str, url: str, context_window: int = 16384, keep_alive: str = "10m") -> None:
         self._model = model
         self._url = url
         self._context_window = context_window
+        self._keep_alive = keep_alive
 
     @property
     def name(self) -> str:
         return f"Ollama ({self._model})"
 
-    def generate(self, prompt: str, temperature: float = 0.3, max_tokens: int = 4096) -> str:
-        """Generate text via Ollama HTTP API."""
+    @property
+    def context_window(self) -> int:
+        return self._context_window
+
+    def generate(self, prompt: str, temperature: float = 0.3, max_tokens: int = 4096,
+                 stats: dict | None = None) -> str:
+        """Generate text via Ollama HTTP API.
+
+        The options (``num_ctx`` in particular) are the same on every call:
+        Ollama reloads the model when they change, which also drops the
+        cached prompt prefix. ``keep_alive`` keeps the model loaded between
+        meetings.
+        """
         logger.info(f"Generating with {self.name}...")
         try:
+            started = time.perf_counter()
             response = requests.post(
                 self._url,
                 json={
                     "model": self._model,
                     "prompt": prompt,
                     "stream": False,
+                    "keep_alive": self._keep_alive,
                     "options": {
                         "temperature": temperature,
                         "num_ctx": self._context_window,
+                        "num_predict": max_tokens,
                         "top_p": 0.9,
                     },
                 },
                 timeout=900,
             )
             response.raise_for_status()
-            return response.json().get("response", "Error: No response from Ollama")
+            result = response.json()
+            # Durations are in nanoseconds; with a cached prefix only the tokens after it are evaluated
+            prompt_eval_ms = result.get("prompt_eval_duration", 0) / 1e6
+            logger.info(f"Ollama evaluated {result.get('prompt_eval_count', 0)} prompt tokens in {prompt_eval_ms:.0f} ms")
+            if stats is not None:
+                stats["provider_prompt_tokens"] = result.get("prompt_eval_count")
+                stats["response_tokens"] = result.get("eval_count")
+                stats["prompt_eval_ms"] = round(prompt_eval_ms, 1)
+                stats["load_ms"] = round(result.get("load_duration", 0) / 1e6, 1)
+                stats["request_ms"] = round((time.perf_counter() - started) * 1000, 1)
+            return result.get("response", "Error: No response from Ollama")
         except requests.exceptions.ConnectionError:
             logger.error("Cannot connect to Ollama server")
             return "Error: Cannot connect to Ollama. Make sure it's running (ollama serve)"
@@ -96,15 +141,21 @@ class OllamaProvider(LLMProvider):
 class OpenAIProvider(LLMProvider):
     """OpenAI GPT integration via openai package."""
 
-    def __init__(self, model: str = "gpt-4o-mini", api_key: str = "") -> None:
+    def __init__(self, model: str = "gpt-4o-mini", api_key: str = "", context_window: int = 128000) -> None:
         self._model = model
         self._api_key = api_key or os.environ.get("OPENAI_API_KEY", "")
+        self._context_window = context_window
 
     @property
     def name(self) -> str:
         return f"OpenAI ({self._model})"
 
-    def generate(self, prompt: str, temperature: float = 0.3, max_tokens: int = 4096) -> str:
+    @property
+    def context_window(self) -> int:
+        return self._context_window
+
+    def generate(self, prompt: str, temperature: float = 0.3, max_tokens: int = 4096,
+                 stats: dict | None = None) -> str:
         """Generate text via OpenAI Chat Completions API."""
         if not self._api_key:
             logger.error("OpenAI API key not set")
@@ -115,6 +166,9 @@ class OpenAIProvider(LLMProvider):
             from openai import OpenAI
 
             client = OpenAI(api_key=self._api_key)
+            started = time.perf_counter()
+            # Static system message first and the prompt (static template, then the transcript)
+            # last, so the shared prefix is served from OpenAI's prompt cache
             response = client.chat.completions.create(
                 model=self._model,
                 messages=[
@@ -124,6 +178,14 @@ class OpenAIProvider(LLMProvider):
                 temperature=temperature,
                 max_tokens=max_tokens,
             )
+            if stats is not None and response.usage:
+                details = getattr(response.usage, "prompt_tokens_details", None)
+                stats["provider_prompt_tokens"] = response.usage.prompt_tokens
+                stats["response_tokens"] = response.usage.completion_tokens
+                stats["cached_prompt_tokens"] = getattr(details, "cached_tokens", None) or 0
+                stats["request_ms"] = round((time.perf_counter() - started) * 1000, 1)
+                logger.info(f"OpenAI served {stats['cached_prompt_tokens']} of {response.usage.prompt_tokens} "
+                            f"prompt tokens from its cache")
             return response.choices[0].message.content or "Error: Empty response from OpenAI"
         except ImportError:
             logger.error("openai package not installed")
@@ -154,6 +216,7 @@ def get_provider(config: dict) -> LLMProvider:
         return OpenAIProvider(
             model=openai_cfg.get("model", "gpt-4o-mini"),
             api_key=api_key,
+            context_window=openai_cfg.get("context_window", 128000),
         )
 
     # Default to Ollama
@@ -161,5 +224,6 @@ def get_provider(config: dict) -> LLMProvider:
     return OllamaProvider(
         model=ollama_cfg.get("model", "llama3.1:8b"),
         url=ollama_cfg.get("url", "http://localhost:11434/api/generate"),
-        context_window=ollama_cfg.get("context_window", 8192),
+        context_window=ollama_cfg.get("context_window", 16384),
+        keep_alive=ollama_cfg.get("keep_alive", "10m"),
     )
@@ -0,0 +1,152 @@
+"""
+Previous Meetings Context.
+
+Gives the MoM prompt a short memory of earlier meetings, so recurring meetings
+(1:1s, stand-ups, weekly syncs) can follow up on what was left open without
+pasting past transcripts into the prompt. Each transcript passage of this
+meeting queries the semantic index for the nearest action items and "Decisions"
+/ "Follow-ups" MoM sections of earlier meetings; action items still pending in
+``action_index.sqlite`` and the decision lines become candidates. Each is
+scored by its best cosine similarity to this meeting's passages (plus a bonus
+when it comes from a meeting with the same title), and the best are kept up to
+``top_k`` items and a token budget, so the prompt stays bounded however many
+meetings have been recorded.
+"""
+
+import re
+from pathlib import Path
+
+import numpy as np
+
+from action_index import INDEX_FILE as ACTION_INDEX_FILE
+from action_index import ActionIndex
+from prompt_builder import estimate_tokens
+from semantic_index import INDEX_DIR as SEMANTIC_INDEX_DIR
+from semantic_index import SemanticIndex
+
+MAX_QUERIES = 64              # Transcript passages used as queries (evenly spaced)
+HITS_PER_QUERY = 4            # Action items and MoM sections retrieved per query
+SAME_TITLE_BONUS = 0.15       # Recurring meetings share a title; their items matter more
+
+_PRIOR_SECTION_RE = re.compile(r"decision|agreement|follow-ups? for next", re.IGNORECASE)
+_LIST_MARK_RE = re.compile(r"^\s*(?:\d+[.)]|[-*•])\s*")
+
+HEADER = (
+    "## Previous Meetings Context:\n"
+    "[Open items and decisions from earlier meetings that relate to this one. Note progress on them "
+    "only if the transcript discusses them; do not copy them into this meeting's sections otherwise.]\n"
+)
+
+
+def previous_meetings_context(
+    recordings_dir: str | Path,
+    meeting: str,
+    title: str | None,
+    passage_vectors: np.ndarray,
+    embedder,
+    max_tokens: int = 600,
+    top_k: int = 12,
+) -> str:
+    """Relevant open items and prior decisions from earlier meetings, as a prompt section.
+
+    Args:
+        recordings_dir: Folder holding the action and semantic indexes.
+        meeting: Key of the current meeting (its folder name), excluded from the results.
+        title: Current meeting title; items from meetings with the same title get a bonus.
+        passage_vectors: Embeddings of the current transcript passages (``embedder``'s model).
+        embedder: Embedder used for the candidates and the semantic index.
+        max_tokens: Budget for the whole section, header included.
+        top_k: Maximum number of items.
+
+    Returns:
+        The section (ending in a newline), or ``""`` when nothing relevant was found.
+    """
+    recordings_dir = Path(recordings_dir)
+    if not len(passage_vectors) or not (recordings_dir / SEMANTIC_INDEX_DIR).exists():
+        return ""
+    queries = passage_vectors[np.unique(np.linspace(0, len(passage_vectors) - 1, MAX_QUERIES).astype(int))]
+    hits = {}
+    with SemanticIndex(recordings_dir, embedder) as index:
+        for query in queries:
+            for kind in ("action", "mom"):
+                for hit in index.search_vector(query, HITS_PER_QUERY, kind=kind, exclude=meeting):
+                    hits[hit["id"]] = hit
+    candidates = _open_items(recordings_dir, [h for h in hits.values() if h["kind"] == "action"])
+    candidates += _prior_decisions([h for h in hits.values() if h["kind"] == "mom"])
+    if not candidates:
+        return ""
+
+    vectors = embedder.encode([c["text"] for c in candidates])
+    scores = (vectors @ passage_vectors.T).max(axis=1)
+    for candidate, score in zip(candidates, scores):
+        candidate["score"] = float(score) + (SAME_TITLE_BONUS if title and candidate["title"] == title else 0.0)
+    # Below the model's "related" similarity an item is unrelated to the meeting
+    ranked = sorted((c for c in candidates if c["score"] >= embedder.related), key=lambda c: -c["score"])
+
+    used = estimate_tokens(HEADER + "Open action items:\nPrior decisions:\n")
+    chosen, seen = {"action": [], "decision": []}, set()
+    for candidate in ranked:
+        # Decisions get at most a third of the items: open action items are what follow-ups need
+        share = top_k if candidate["type"] == "action" else top_k // 3
+        if sum(map(len, chosen.values())) >= top_k or len(chosen[candidate["type"]]) >= share:
+            continue
+        line = f"- {candidate['line']}\n"
+        key = candidate["text"].lower()
+        if key in seen or used + estimate_tokens(line) > max_tokens:
+            continue
+        seen.add(key)
+        chosen[candidate["type"]].append(line)
+        used += estimate_tokens(line)
+
+    if not chosen["action"] and not chosen["decision"]:
+        return ""
+    section = HEADER
+    if chosen["action"]:
+        section += "Open action items:\n" + "".join(chosen["action"])
+    if chosen["decision"]:
+        section += "Prior decisions:\n" + "".join(chosen["decision"])
+    return section
+
+
+def _open_items(recordings_dir: Path, hits: list[dict]) -> list[dict]:
+    """The retrieved action items that are still pending."""
+    if not hits or not (recordings_dir / ACTION_INDEX_FILE).exists():
+        return []
+    with ActionIndex(recordings_dir) as index:
+        pending = {(item["folder"], item["action"]): item for item in index.query(status="pending")}
+    candidates = []
+    for hit in hits:
+        item = pending.get((hit["meeting"], hit["text"]))
+        if item is None:
+            continue
+        details = [f"owner: {item['owner']}"] if item["owner"] else []
+        if item["deadline"]:
+            details.append(f"due: {item['deadline']}")
+        details = f" ({', '.join(details)})" if details else ""
+        candidates.append({
+            "type": "action",
+            "text": item["action"],
+            "title": item["title"],
+            "line": f"{item['action']}{details} - from {item['title']}, {item['date']}",
+        })
+    return candidates
+
+
+def _prior_decisions(sections: list[dict]) -> list[dict]:
+    """Items of the retrieved Decisions / Follow-ups sections."""
+    candidates = []
+    for section in sections:
+        heading, _, body = section["text"].partition(": ")
+        if not _PRIOR_SECTION_RE.search(heading):
+            continue
+        for line in body.split("\n"):
+            text = _LIST_MARK_RE.sub("", line).strip()
+            if len(text) < 10 or text.lower().startswith("none"):
+                continue
+            candidates.append({
+                "type": "decision",
+                "text": text,
+                "title": section["title"],
+                "line": f"{text} - from {section['title']}",
+            })
+    return candidates
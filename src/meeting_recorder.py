@@ -9,16 +9,17 @@ import os
 import sys
 import wave
 import threading
-import queue
 import time
 import smtplib
 import json
+from concurrent.futures import Future, ThreadPoolExecutor
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from email.mime.base import MIMEBase
 from email import encoders
 from datetime import datetime
 from pathlib import Path
+from typing import Iterator
 
 import numpy as np
 import sounddevice as sd
@@ -32,6 +33,31 @@ from loguru import logger
 load_dotenv(Path(__file__).parent.parent / ".env")
 
 from llm_providers import LLMProvider, OllamaProvider, OpenAIProvider, get_provider
+from action_index import ActionIndex
+from action_items import (
+    TranscriptActionSpotter, extract_conversational, extract_section_items, load_action_candidates,
+    merge_action_items,
+)
+from audio_codec import StreamingEncoder, open_encoder
+from capture_buffer import CaptureBuffer
+from capture_tuning import DEFAULT_BLOCK_SIZE, DEFAULT_MIX_LATENCY, tune_capture
+from chunks import ChunkWriter
+from decoded_audio import SAMPLE_RATE as DECODED_SAMPLE_RATE, DecodedAudio
+from diarization import DEFAULT_DIARIZATION_PARAMS, diarize
+from job_queue import JOBS_FILE, MAX_ATTEMPTS, JobQueue
+from meeting_context import previous_meetings_context
+from mixer import MixKernel, SampleArena
+from prompt_builder import PROMPT_STATS_FILE, PromptBuilder, estimate_tokens
+from segment_store import SegmentStore, SegmentStoreBuilder
+from signal_monitor import SignalMonitor, load_levels
+from tracks import MIC, SYSTEM, TRACKS_FILE, ChannelActivity, find_tracks, merge_channel_segments, write_tracks
+from speech_map import DEFAULT_VAD_PARAMS, SPEECH_MAP_FILE, SpeechMap, no_speech_info
+from semantic_index import (
+    SemanticIndex, get_embedder, meeting_key, passages_from_actions, passages_from_mom, passages_from_segments,
+)
+from transcript_compression import compress_segments, settings_for
+from transcript_index import TranscriptIndex
+from transcript_writer import CHECKPOINT as TRANSCRIBE_CHECKPOINT, StreamingTranscriptWriter, transcript_text
 
 
 # ============================================================
@@ -41,13 +67,71 @@ DEFAULT_CONFIG = {
     "recording": {
         "output_dir": "recordings",
         "sample_rate": 16000,
-        "hotkey": "ctrl+alt+r"
+        "hotkey": "ctrl+alt+r",
+        "signal_threshold": 0.001,     # Peak level a source must exceed to count as signal
+        "silence_detect_seconds": 5.0, # Flag a silent/dead source after this long
+        "tracks": "off",               # "off", "alongside" (tracks.wav + audio.wav) or "only" (tracks.wav)
+        "format": "wav",               # "wav", "flac" (lossless) or "opus" (speech bitrate), encoded while recording
+        "opus_bitrate_kbps": 24,
+        "buffer_seconds": 2.0,         # Audio queued per source before the overflow policy applies
+        "overflow_policy": "drop_oldest", # "drop_oldest" or "block" (loopback reader waits; the mic callback never does)
+        "block_size": 1024,            # Capture frames per callback/read, or "auto" to measure at startup
+        "mix_latency": 0.05,           # Longest the mixer waits for every source (s), or "auto"
+        "chunk_minutes": 0             # >0: rotate to chunk_NNN files at silence, transcribe each while recording
     },
     "whisper": {
         "model": "large-v2",
         "device": "cuda",
         "compute_type": "float16",
-        "language": None
+        "language": None,
+        "word_timestamps": False,  # Extra alignment pass; enable for word-level segments
+        "segments_json": True,     # Also export segments.json next to segments.segs
+        "keep_decoded_audio": False, # Keep the shared audio.pcm cache after processing
+        "per_channel": False         # With tracks.wav: transcribe mic and system in parallel
+    },
+    "vad": {
+        "enabled": True,            # Standalone VAD pre-pass; Whisper only decodes speech
+        "threshold": 0.5,
+        "min_silence_duration_ms": 500,
+        "speech_pad_ms": 200,
+        "min_speech_seconds": 3.0   # Less speech than this skips transcription entirely
+    },
+    "diarization": {
+        "enabled": False,           # Label speakers (CPU, runs beside Whisper)
+        "threshold": 0.55,          # Cosine distance at which speaker clusters stop merging
+        "num_speakers": None,       # Fixed speaker count, or None to detect
+        "max_speakers": 8
+    },
+    "processing": {
+        "workers": 1                # Meetings processed at once (chunks transcribed while recording share
+                                    # the Whisper slots); more only helps with spare GPU memory
+    },
+    "actions": {
+        "from_transcript": True,    # Spot action phrases in transcript segments as they are decoded
+        "index": True               # Add each meeting's items to recordings/action_index.sqlite
+    },
+    "search": {
+        "index": True,              # Add each transcript to recordings/transcript_index.sqlite
+        "semantic": False,          # Embed transcript passages and MoM sections into recordings/semantic_index/
+        "embedding_model": "all-MiniLM-L6-v2"  # sentence-transformers model; hashing fallback if not installed
+    },
+    "context": {
+        # Meeting types whose prompt gets related open items / decisions from earlier meetings
+        # (opt-in, e.g. ["Business Meeting", "1:1 / Check-in"]; needs search.semantic)
+        "previous_meetings": [],
+        "max_tokens": 600,          # Budget for that prompt section
+        "top_k": 12                 # Items at most
+    },
+    "compression": {
+        # Clean the transcript given to the LLM (transcript.txt is kept as decoded)
+        "enabled": True,
+        "fillers": True,            # um, uh, er, hmm
+        "repetitions": True,        # Stutters, restarts, Whisper repeating a segment
+        "merge_short": True,        # Drop "Yeah." / "Right." segments so the turns around them merge
+        "min_avg_logprob": None,    # Drop segments Whisper decoded below this confidence (e.g. -1.0)
+        "by_type": {
+            "Interview": {"fillers": False}  # Hesitations can matter for the assessment
+        }
     },
     "llm": {
         "provider": "ollama"  # "ollama" or "openai"
@@ -56,13 +140,16 @@ DEFAULT_CONFIG = {
         "model": "llama3.1:8b",
         "url": "http://localhost:11434/api/generate",
         "temperature": 0.3,
-        "context_window": 8192
+        "context_window": 16384,    # num_ctx: prompt + response; ~1 hour of transcript, longer is cut to fit
+        "max_tokens": 2048,         # Response length; the prompt gets the rest of the window
+        "keep_alive": "10m"         # Keep the model (and its prompt cache) loaded between meetings
     },
     "openai": {
         "model": "gpt-4o-mini",
         "api_key": "",          # Prefer OPENAI_API_KEY env var
         "temperature": 0.3,
-        "max_tokens": 4096
+        "max_tokens": 4096,
+        "context_window": 128000
     },
     "email": {
         "enabled": True,
@@ -119,8 +206,8 @@ MOM_TEMPLATES = {
 ## Output Format (use exactly this structure):
 
 # Minutes of Meeting
-**Date:** {date}
-**Duration:** {duration}
+**Date:** [Date from the meeting details]
+**Duration:** [Duration from the meeting details]
 **Type:** Business Meeting
 
 ---
@@ -175,6 +262,11 @@ MOM_TEMPLATES = {
 ## Next Meeting
 [Date/time if mentioned, or topics for follow-up]
 
+---
+## Meeting Details:
+- Date: {date}
+- Duration: {duration}
+
 ---
 ## Transcript:
 {transcript}
@@ -192,8 +284,8 @@ Generate the meeting minutes now:""",
 ## Output Format (use exactly this structure):
 
 # Tutorial/Training Notes
-**Date:** {date}
-**Duration:** {duration}
+**Date:** [Date from the meeting details]
+**Duration:** [Duration from the meeting details]
 **Type:** Tutorial/Training
 
 ---
@@ -259,6 +351,11 @@ Generate the meeting minutes now:""",
 [Topics suggested for deeper study]
 - Topic for further exploration
 
+---
+## Meeting Details:
+- Date: {date}
+- Duration: {duration}
+
 ---
 ## Transcript:
 {transcript}
@@ -276,8 +373,8 @@ Generate the tutorial notes now:""",
 ## Output Format (use exactly this structure):
 
 # Interview Summary
-**Date:** {date}
-**Duration:** {duration}
+**Date:** [Date from the meeting details]
+**Duration:** [Duration from the meeting details]
 **Type:** Interview
 
 ---
@@ -342,6 +439,11 @@ Generate the tutorial notes now:""",
 ## Follow-up Items
 [Next steps, additional interviews needed, references to check]
 
+---
+## Meeting Details:
+- Date: {date}
+- Duration: {duration}
+
 ---
 ## Transcript:
 {transcript}
@@ -359,8 +461,8 @@ Generate the interview summary now:""",
 ## Output Format (use exactly this structure):
 
 # Brainstorm Summary
-**Date:** {date}
-**Duration:** {duration}
+**Date:** [Date from the meeting details]
+**Duration:** [Duration from the meeting details]
 **Type:** Brainstorming Session
 
 ---
@@ -425,6 +527,11 @@ Generate the interview summary now:""",
 [Unusual or out-of-the-box ideas worth remembering]
 - Creative idea
 
+---
+## Meeting Details:
+- Date: {date}
+- Duration: {duration}
+
 ---
 ## Transcript:
 {transcript}
@@ -442,8 +549,8 @@ Generate the brainstorm summary now:""",
 ## Output Format (use exactly this structure):
 
 # 1:1 Check-in Summary
-**Date:** {date}
-**Duration:** {duration}
+**Date:** [Date from the meeting details]
+**Duration:** [Duration from the meeting details]
 **Type:** 1:1 / Check-in
 
 ---
@@ -510,6 +617,11 @@ Generate the brainstorm summary now:""",
 [Topics to revisit]
 - Topic 1
 
+---
+## Meeting Details:
+- Date: {date}
+- Duration: {duration}
+
 ---
 ## Transcript:
 {transcript}
@@ -527,8 +639,8 @@ Generate the 1:1 summary now:""",
 ## Output Format (use exactly this structure):
 
 # Presentation/Demo Summary
-**Date:** {date}
-**Duration:** {duration}
+**Date:** [Date from the meeting details]
+**Duration:** [Duration from the meeting details]
 **Type:** Presentation/Demo
 
 ---
@@ -607,6 +719,11 @@ Generate the 1:1 summary now:""",
 |------|-------|----------|
 | Follow-up 1 | Person | Date |
 
+---
+## Meeting Details:
+- Date: {date}
+- Duration: {duration}
+
 ---
 ## Transcript:
 {transcript}
@@ -614,6 +731,11 @@ Generate the 1:1 summary now:""",
 Generate the presentation summary now:"""
 }
 
+# Added before the closing line of the template for "Brief" summaries
+BRIEF_INSTRUCTION = """IMPORTANT: Generate a BRIEF, CONCISE summary. Keep each section to 2-3 bullet points maximum.
+Focus only on the most critical information. Skip sections with no significant content.
+Total output should be approximately 1 page."""
+
 
 # ============================================================
 # AUDIO RECORDER
@@ -629,7 +751,7 @@ class AudioRecorder:
         "EPSON", "iProjection",  # Projector audio
     ]
     
-    def __init__(self, output_dir: str = None):
+    def __init__(self, output_dir: str = None, on_source_state=None, on_chunk=None):
         self.output_dir = Path(output_dir or CONFIG["recording"]["output_dir"])
         self.output_dir.mkdir(exist_ok=True)
         
@@ -637,14 +759,36 @@ class AudioRecorder:
         self.sample_rate = CONFIG["recording"]["sample_rate"]
         self.channels = 1
         
-        self.mic_queue = queue.Queue()
-        self.system_queue = queue.Queue()
-        self.mixed_audio = []
+        self.data_ready = threading.Event()  # Set by the capture buffers; wakes the mixer
+        self.mic_buffer = self._new_buffer("mic")
+        self.system_buffer = self._new_buffer("system")
+        self.mixed_audio = SampleArena(self.sample_rate)
+        self.track_audio = SampleArena(self.sample_rate, 2, np.int16)  # Unmixed mic/system when keeping tracks
+        self.tracks_mode = CONFIG["recording"].get("tracks", "off")
+        self.encoder: StreamingEncoder | None = None  # Compressed mix, written while recording
+        self.chunks: ChunkWriter | None = None  # Rotating chunk files instead of one audio file
+        self.on_chunk = on_chunk  # on_chunk(manifest_path, entry) when a chunk file is finished
         
         self.mic_thread = None
         self.system_thread = None
         self.mixer_thread = None
         self.stop_event = threading.Event()
+
+        # Per-source levels; on_source_state(source, state) fires on silent/dead sources
+        self.on_source_state = on_source_state
+        self.levels: SignalMonitor | None = None
+        
+        # Capture block size and mixer latency: configured, or measured once in the background
+        block_size = CONFIG["recording"].get("block_size", DEFAULT_BLOCK_SIZE)
+        mix_latency = CONFIG["recording"].get("mix_latency", DEFAULT_MIX_LATENCY)
+        self.block_size = DEFAULT_BLOCK_SIZE if block_size == "auto" else int(block_size)
+        self.mix_latency = DEFAULT_MIX_LATENCY if mix_latency == "auto" else float(mix_latency)
+        self.tuning = None
+        self.tuning_thread = None
+        if "auto" in (block_size, mix_latency):
+            # The probes open the microphone; start_recording waits for them before opening its streams
+            self.tuning_thread = threading.Thread(target=self._tune_capture, daemon=True, name="capture-tuning")
+            self.tuning_thread.start()
         
         self.pa = pyaudio.PyAudio()
         self.available_devices = self._get_filtered_loopback_devices()
@@ -654,6 +798,32 @@ class AudioRecorder:
         self.current_meeting_folder = None
         self.recording_start_time = None
     
+    def _new_buffer(self, name: str) -> CaptureBuffer:
+        """Bounded capture -> mixer buffer for one source."""
+        return CaptureBuffer(
+            name,
+            self.sample_rate,
+            max_seconds=CONFIG["recording"].get("buffer_seconds", 2.0),
+            policy=CONFIG["recording"].get("overflow_policy", "drop_oldest"),
+            ready=self.data_ready,
+        )
+
+    def _tune_capture(self) -> None:
+        """Measure callback jitter/CPU per block size and apply the "auto" settings.
+
+        Runs before any recording stream is opened (``start_recording`` joins
+        this thread), so the probe streams never overlap the recording's own.
+        """
+        try:
+            self.tuning = tune_capture(self.sample_rate)
+        except Exception as e:
+            logger.warning(f"Capture tuning failed, keeping defaults: {e}")
+            return
+        if CONFIG["recording"].get("block_size") == "auto":
+            self.block_size = self.tuning["block_size"]
+        if CONFIG["recording"].get("mix_latency") == "auto":
+            self.mix_latency = self.tuning["mix_latency"]
+
     def _get_filtered_loopback_devices(self) -> list:
         """Get list of real loopback devices (filtered)."""
         try:
@@ -732,7 +902,10 @@ class AudioRecorder:
         def callback(indata, frames, time_info, status):
             if status:
                 logger.debug(f"Mic status: {status}")
-            self.mic_queue.put(indata.copy())
+                if status.input_overflow:
+                    self.mic_buffer.device_overflow()
+            # Never wait in the real-time callback, whatever the overflow policy
+            self.mic_buffer.put(indata.copy(), wait=False)
         
         try:
             with sd.InputStream(
@@ -740,10 +913,9 @@ class AudioRecorder:
                 channels=self.channels,
                 dtype=np.float32,
                 callback=callback,
-                blocksize=1024
+                blocksize=self.block_size
             ):
-                while not self.stop_event.is_set():
-                    time.sleep(0.1)
+                self.stop_event.wait()
         except Exception as e:
             logger.error(f"Microphone error: {e}")
     
@@ -755,6 +927,8 @@ class AudioRecorder:
         
         device_sample_rate = int(self.loopback_device["defaultSampleRate"])
         device_channels = self.loopback_device["maxInputChannels"]
+        # Same block duration as the mic, in device frames
+        device_block = max(64, round(self.block_size * device_sample_rate / self.sample_rate))
         
         try:
             stream = self.pa.open(
@@ -763,11 +937,18 @@ class AudioRecorder:
                 rate=device_sample_rate,
                 input=True,
                 input_device_index=self.loopback_device["index"],
-                frames_per_buffer=1024
+                frames_per_buffer=device_block
             )
             
             while not self.stop_event.is_set():
-                data = stream.read(1024, exception_on_overflow=False)
+                try:
+                    data = stream.read(device_block, exception_on_overflow=True)
+                except OSError as e:
+                    if e.errno != pyaudio.paInputOverflowed:
+                        raise
+                    # Driver dropped input: count it instead of discarding it silently
+                    self.system_buffer.device_overflow()
+                    continue
                 audio_np = np.frombuffer(data, dtype=np.float32)
                 
                 if device_channels > 1:
@@ -779,7 +960,7 @@ class AudioRecorder:
                     indices = np.linspace(0, len(audio_np) - 1, new_length)
                     audio_np = np.interp(indices, np.arange(len(audio_np)), audio_np)
                 
-                self.system_queue.put(audio_np.astype(np.float32))
+                self.system_buffer.put(audio_np.astype(np.float32))
             
             stream.stop_stream()
             stream.close()
@@ -788,77 +969,97 @@ class AudioRecorder:
             logger.error(f"System audio error: {e}")
     
     def _mix_audio(self):
-        """Mix microphone and system audio streams."""
+        """Mix microphone and system audio streams.
+
+        Event-driven: the mixer sleeps until the capture buffers have data and
+        mixes as soon as every source has delivered, taking the same number of
+        frames from each so the sources stay aligned. A source that delivers
+        nothing within ``mix_latency`` is padded with silence (an underrun).
+        """
+        kernel = MixKernel(self.sample_rate, threshold=self.levels.threshold)
+        buffers = [self.mic_buffer, self.system_buffer] if self.loopback_device else [self.mic_buffer]
         while not self.stop_event.is_set():
-            mic_data = []
-            system_data = []
-            
-            while not self.mic_queue.empty():
-                try:
-                    mic_data.append(self.mic_queue.get_nowait().flatten())
-                except queue.Empty:
+            deadline = time.monotonic() + self.mix_latency
+            while not all(len(b) for b in buffers) and not self.stop_event.is_set():
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
                     break
-            
-            while not self.system_queue.empty():
-                try:
-                    system_data.append(self.system_queue.get_nowait())
-                except queue.Empty:
-                    break
-            
-            if mic_data or system_data:
-                mic_chunk = np.concatenate(mic_data) if mic_data else np.array([])
-                sys_chunk = np.concatenate(system_data) if system_data else np.array([])
-                
-                max_len = max(len(mic_chunk), len(sys_chunk))
-                if max_len > 0:
-                    if len(mic_chunk) < max_len:
-                        mic_chunk = np.pad(mic_chunk, (0, max_len - len(mic_chunk)))
-                    if len(sys_chunk) < max_len:
-                        sys_chunk = np.pad(sys_chunk, (0, max_len - len(sys_chunk)))
-                    
-                    # Adaptive mixing: only attenuate when both sources are active
-                    mic_has_signal = len(mic_chunk) > 0 and np.max(np.abs(mic_chunk)) > 0.001
-                    sys_has_signal = len(sys_chunk) > 0 and np.max(np.abs(sys_chunk)) > 0.001
-
-                    if mic_has_signal and sys_has_signal:
-                        mixed = mic_chunk * 0.5 + sys_chunk * 0.5
-                    elif mic_has_signal:
-                        mixed = mic_chunk
-                    elif sys_has_signal:
-                        mixed = sys_chunk
-                    else:
-                        mixed = mic_chunk  # Both silent, just pass through
+                self.data_ready.wait(remaining)
+                self.data_ready.clear()
 
-                    max_val = np.max(np.abs(mixed))
-                    if max_val > 1.0:
-                        mixed = mixed / max_val
-                    
-                    self.mixed_audio.append(mixed)
-            
-            time.sleep(0.05)
+            if all(len(b) for b in buffers):
+                frames = min(len(b) for b in buffers)
+                self._mix_tick(kernel, self.mic_buffer.take(frames), self.system_buffer.take(frames))
+            else:
+                self._mix_tick(kernel, self.mic_buffer.drain(), self.system_buffer.drain())
+            self.levels.check()
+
+        # Whatever the capture threads delivered before they stopped
+        self._mix_tick(kernel, self.mic_buffer.drain(), self.system_buffer.drain())
+
+    def _mix_tick(self, kernel: MixKernel, mic_data: list[np.ndarray], system_data: list[np.ndarray]) -> None:
+        """Measure, mix and store one batch of captured blocks."""
+        if not (mic_data or system_data):
+            return
+        max_len, mic_len, sys_len = kernel.load(mic_data, system_data)
+
+        # Levels are measured per source, before padding/mixing
+        mic_peak, mic_energy = kernel.measure(kernel.mic[:mic_len])
+        sys_peak, sys_energy = kernel.measure(kernel.system[:sys_len])
+        self.levels.add("mic", mic_len, mic_peak, mic_energy)
+        self.levels.add("system", sys_len, sys_peak, sys_energy)
+
+        # A source that delivered nothing is padded with silence: count the underrun
+        for buffer, frames in ((self.mic_buffer, mic_len), (self.system_buffer, sys_len)):
+            if frames < max_len:
+                if frames == 0 and buffer is self.system_buffer and not self.loopback_device:
+                    continue  # No system source at all
+                buffer.underrun(max_len - frames)
+            else:
+                buffer.delivered()
+
+        if max_len > 0:
+            # Adaptive mixing: only attenuate when both sources are active
+            mixed = self.mixed_audio.reserve(max_len)
+            kernel.mix(max_len, mic_peak, sys_peak, mixed)
+            if self.encoder:
+                self.encoder.write(mixed)
+            if self.chunks:
+                self.chunks.write(mixed, max(mic_peak, sys_peak))
+                # The chunk files are the recording: memory stays flat however long the meeting
+                self.mixed_audio.discard()
+
+            if self.tracks_mode != "off":
+                # Unmixed sources, stored as int16 so both channels cost what one float track does
+                kernel.tracks(max_len, self.track_audio.reserve(max_len))
     
     def start_recording(self, title: str = None) -> str:
         """Start recording audio from all sources."""
         if self.is_recording:
             return ""
+        if self.tuning_thread is not None and self.tuning_thread.is_alive():
+            # Its probe streams hold the microphone (exclusive-mode devices allow one stream)
+            logger.info("Waiting for capture tuning to finish...")
+            self.tuning_thread.join()
         
         self.is_recording = True
         self.stop_event.clear()
-        self.mixed_audio = []
+        self.mixed_audio.clear()
+        self.track_audio.clear()
+        self.tracks_mode = CONFIG["recording"].get("tracks", "off")
         self.recording_start_time = datetime.now()
+        self.levels = SignalMonitor(
+            ("mic", "system") if self.loopback_device else ("mic",),
+            self.sample_rate,
+            threshold=CONFIG["recording"].get("signal_threshold", 0.001),
+            detect_seconds=CONFIG["recording"].get("silence_detect_seconds", 5.0),
+            on_change=self.on_source_state,
+        )
         
-        while not self.mic_queue.empty():
-            self.mic_queue.get()
-        while not self.system_queue.empty():
-            self.system_queue.get()
-        
-        self.mic_thread = threading.Thread(target=self._record_microphone, daemon=True)
-        self.system_thread = threading.Thread(target=self._record_system_audio, daemon=True)
-        self.mixer_thread = threading.Thread(target=self._mix_audio, daemon=True)
-        
-        self.mic_thread.start()
-        self.system_thread.start()
-        self.mixer_thread.start()
+        # Fresh buffers: overflow/underrun counters are per meeting
+        self.data_ready.clear()
+        self.mic_buffer = self._new_buffer("mic")
+        self.system_buffer = self._new_buffer("system")
         
         # Create subfolder for this meeting
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -877,12 +1078,35 @@ class AudioRecorder:
         self.current_meeting_folder = self.output_dir / folder_name
         self.current_meeting_folder.mkdir(exist_ok=True)
         self.current_filename = "audio.wav"
+
+        # Compressed formats are encoded block by block as the mixer produces them
+        self.recording_format = CONFIG["recording"].get("format", "wav")
+        self.encoder = None
+        self.chunks = None
+        chunk_minutes = CONFIG["recording"].get("chunk_minutes", 0)
+        if chunk_minutes and self.tracks_mode != "only":
+            self.chunks = self._open_chunks(chunk_minutes)
+        elif self.recording_format != "wav" and self.tracks_mode != "only":
+            self.encoder = open_encoder(
+                self.current_meeting_folder / self.current_filename, self.sample_rate, 1,
+                self.recording_format, CONFIG["recording"].get("opus_bitrate_kbps", 24),
+            )
+            if self.encoder is None:
+                self.recording_format = "wav"
+
+        self.mic_thread = threading.Thread(target=self._record_microphone, daemon=True)
+        self.system_thread = threading.Thread(target=self._record_system_audio, daemon=True)
+        self.mixer_thread = threading.Thread(target=self._mix_audio, daemon=True)
+        
+        self.mic_thread.start()
+        self.system_thread.start()
+        self.mixer_thread.start()
         
         logger.info(f"Recording started: {self.current_meeting_folder}")
         return str(self.current_meeting_folder)
     
     def stop_recording(self) -> tuple[str, float]:
-        """Stop recording and save to WAV file. Returns (filepath, duration)."""
+        """Stop recording and save the recording file. Returns (filepath, duration)."""
         if not self.is_recording:
             return "", 0
         
@@ -898,35 +1122,126 @@ class AudioRecorder:
         
         filepath = self.current_meeting_folder / self.current_filename
         duration = 0
-        
-        if self.mixed_audio:
-            audio_data = np.concatenate(self.mixed_audio)
-
-            # Normalize quiet recordings so Whisper gets a strong signal
-            peak = np.max(np.abs(audio_data))
-            if 0 < peak < 0.5:
-                gain = min(0.9 / peak, 10.0)  # Cap at 10x to avoid amplifying pure noise
-                audio_data = audio_data * gain
-                logger.info(f"Audio normalized: peak {peak:.4f} -> {peak * gain:.4f} (gain {gain:.1f}x)")
 
-            audio_int16 = (audio_data * 32767).astype(np.int16)
-            
-            with wave.open(str(filepath), 'wb') as wf:
-                wf.setnchannels(self.channels)
-                wf.setsampwidth(2)
-                wf.setframerate(self.sample_rate)
-                wf.writeframes(audio_int16.tobytes())
+        encoded_file = None
+        if self.encoder:
+            self.encoder.close()
+            encoded_file = self.encoder.path
+            self.encoder = None
+        if self.chunks:
+            self.chunks.close()  # Finishes the last chunk; the manifest stands in for the recording
+            encoded_file = self.chunks.path
+            frames = self.chunks.frames
+        else:
+            frames = len(self.mixed_audio)
+        
+        if frames:
+            # A chunked mix was dropped from memory as it was written: its PCM cache is
+            # decoded from the chunk files (block by block) when it is processed
+            audio_data = None
+            if not self.chunks:
+                audio_data = np.concatenate(self.mixed_audio.blocks())
+
+                # Normalize quiet recordings so Whisper gets a strong signal (in place).
+                # A file encoded while recording keeps the raw levels; the PCM cache is normalized.
+                peak = np.max(np.abs(audio_data))
+                if 0 < peak < 0.5:
+                    gain = min(0.9 / peak, 10.0)  # Cap at 10x to avoid amplifying pure noise
+                    audio_data *= gain
+                    logger.info(f"Audio normalized: peak {peak:.4f} -> {peak * gain:.4f} (gain {gain:.1f}x)")
+            self.mixed_audio.clear()
+
+            tracks_file = None
+            if self.tracks_mode != "off" and self.track_audio:
+                tracks_file = self._save_tracks()
+                if self.tracks_mode == "only":
+                    filepath = tracks_file
+
+            if encoded_file and filepath != tracks_file:
+                filepath = encoded_file  # Mix was already encoded (or chunked) while recording
+            elif filepath != tracks_file:
+                audio_int16 = (audio_data * 32767).astype(np.int16)
+
+                with wave.open(str(filepath), 'wb') as wf:
+                    wf.setnchannels(self.channels)
+                    wf.setsampwidth(2)
+                    wf.setframerate(self.sample_rate)
+                    wf.writeframes(audio_int16.tobytes())
+                del audio_int16
+
+            # Keep the float PCM as the shared decode so no stage has to decode the WAV
+            if audio_data is not None and self.sample_rate == DECODED_SAMPLE_RATE:
+                DecodedAudio.from_array(audio_data, filepath)
             
-            duration = len(audio_data) / self.sample_rate
+            duration = frames / self.sample_rate
             logger.info(f"Recording saved: {filepath} ({duration:.1f}s)")
+
+            capture = {
+                "block_size": self.block_size,
+                "mix_latency": self.mix_latency,
+                "tuning": self.tuning,
+                "sources": {"mic": self.mic_buffer.stats(), "system": self.system_buffer.stats()},
+            }
+            self.levels.save(self.current_meeting_folder, capture)
+            self._log_capture(capture)
+            if not self.levels.has_signal:
+                logger.warning("No source rose above the signal threshold - recording is silent")
         else:
             logger.warning("No audio recorded")
             # Remove empty folder
+            if encoded_file:
+                encoded_file.unlink(missing_ok=True)
+            self.chunks = None
             self.current_meeting_folder.rmdir()
             return "", 0
         
         return str(filepath), duration
     
+    def _open_chunks(self, chunk_minutes: float) -> ChunkWriter:
+        """Start the chunk writer in the recording format (WAV if soundfile is missing)."""
+        args = (self.current_meeting_folder, self.sample_rate, chunk_minutes * 60)
+        options = dict(
+            opus_bitrate_kbps=CONFIG["recording"].get("opus_bitrate_kbps", 24),
+            threshold=CONFIG["recording"].get("signal_threshold", 0.001),
+            on_chunk=self.on_chunk,
+        )
+        try:
+            return ChunkWriter(*args, fmt=self.recording_format, **options)
+        except ImportError:
+            logger.warning(f"soundfile is not installed - writing WAV chunks instead of {self.recording_format}")
+            self.recording_format = "wav"
+            return ChunkWriter(*args, fmt="wav", **options)
+
+    @staticmethod
+    def _log_capture(capture: dict) -> None:
+        """Summarize audio lost or padded while recording."""
+        for source, stats in capture["sources"].items():
+            lost = stats["overflow_seconds"]
+            if stats["overflows"] or stats["device_overflows"]:
+                logger.warning(
+                    f"Capture '{source}': {stats['overflows']} buffer overflow(s) ({lost:.2f}s dropped), "
+                    f"{stats['device_overflows']} device overflow(s)"
+                )
+            logger.debug(
+                f"Capture '{source}': peak fill {stats['max_fill_seconds']:.2f}s of "
+                f"{stats['capacity_seconds']:.2f}s, {stats['underruns']} underrun tick(s)"
+            )
+
+    def _save_tracks(self) -> Path:
+        """Write the unmixed mic/system blocks as the 2-channel tracks recording."""
+        tracks_file = self.current_meeting_folder / TRACKS_FILE
+        try:
+            tracks_file = write_tracks(
+                tracks_file, self.track_audio.blocks(), self.sample_rate, self.recording_format,
+                CONFIG["recording"].get("opus_bitrate_kbps", 24),
+            )
+        except ImportError:
+            logger.warning(f"soundfile is not installed - saving tracks as WAV instead of {self.recording_format}")
+            tracks_file = write_tracks(tracks_file, self.track_audio.blocks(), self.sample_rate)
+        self.track_audio.clear()
+        logger.info(f"Mic/system tracks saved: {tracks_file}")
+        return tracks_file
+
     def cleanup(self):
         """Clean up resources."""
         self.pa.terminate()
@@ -935,10 +1250,39 @@ class AudioRecorder:
 # ============================================================
 # MEETING PROCESSOR
 # ============================================================
+def _with_time(action: str, spoken_at: dict[str, float]) -> str:
+    """Append ``(at mm:ss)`` to an action spotted in the transcript."""
+    if action not in spoken_at:
+        return action
+    start = spoken_at[action]
+    return f"{action} *(at {int(start // 60)}:{int(start % 60):02d})*"
+
+
+def _shift_segment(segment: dict, offset: float) -> dict:
+    """Move a segment (and its words) from chunk time to meeting time."""
+    segment["start"] += offset
+    segment["end"] += offset
+    for word in segment.get("words", ()):
+        word["start"] += offset
+        word["end"] += offset
+    return segment
+
+
 class MeetingProcessor:
     def __init__(self) -> None:
         self.whisper: WhisperModel | None = None
+        self._whisper_lock = threading.Lock()
         self.llm_provider: LLMProvider = get_provider(CONFIG)
+        # Diarization worker, so speaker embedding runs while Whisper decodes
+        self._diarization_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="diarize")
+        # Finished chunks of a meeting still being recorded, transcribed in order
+        self._chunk_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="chunks")
+        self._chunk_jobs: dict[Path, Future] = {}
+        # Whisper decodes at once - queued meetings and chunks alike - within processing.workers
+        self._decode_slots = threading.BoundedSemaphore(max(1, CONFIG["processing"]["workers"]))
+        # Embedding model for the semantic index, loaded on first use; the lock serialises index appends
+        self._embedder = None
+        self._semantic_lock = threading.Lock()
         logger.info(f"LLM provider: {self.llm_provider.name}")
 
     def set_provider(self, provider: LLMProvider) -> None:
@@ -950,55 +1294,247 @@ class MeetingProcessor:
         self.llm_provider = provider
         logger.info(f"LLM provider switched to: {provider.name}")
 
+    def shutdown(self) -> None:
+        """Stop the chunk and diarization workers without waiting for them (on quit).
+
+        Queued chunks are dropped; they are transcribed again when the meeting is processed.
+        """
+        self._chunk_pool.shutdown(wait=False, cancel_futures=True)
+        self._diarization_pool.shutdown(wait=False, cancel_futures=True)
+
     def _ensure_whisper_loaded(self) -> None:
         """Load Whisper model on first use."""
-        if self.whisper is None:
-            logger.info(f"Loading Whisper model '{CONFIG['whisper']['model']}' on {CONFIG['whisper']['device']}...")
-            self.whisper = WhisperModel(
-                CONFIG["whisper"]["model"],
-                device=CONFIG["whisper"]["device"],
-                compute_type=CONFIG["whisper"]["compute_type"]
-            )
-            logger.info("Whisper model loaded.")
+        with self._whisper_lock:  # Queue workers may process meetings concurrently
+            if self.whisper is None:
+                logger.info(f"Loading Whisper model '{CONFIG['whisper']['model']}' on {CONFIG['whisper']['device']}...")
+                # One worker per channel and per queue worker so parallel transcriptions really run in parallel
+                channels = 2 if CONFIG["whisper"].get("per_channel", False) else 1
+                self.whisper = WhisperModel(
+                    CONFIG["whisper"]["model"],
+                    device=CONFIG["whisper"]["device"],
+                    compute_type=CONFIG["whisper"]["compute_type"],
+                    num_workers=channels * max(1, CONFIG["processing"]["workers"])
+                )
+                logger.info("Whisper model loaded.")
     
-    def transcribe(self, audio_path: str) -> dict:
-        """Transcribe audio file using Whisper."""
+    def transcribe_stream(self, audio_path: str | DecodedAudio, word_timestamps: bool | None = None,
+                          start_offset: float = 0.0, language: str | None = None,
+                          speech_map: SpeechMap | None = None) -> tuple[Iterator[dict], object]:
+        """Start a Whisper transcription and return its segments lazily.
+
+        Args:
+            audio_path: Path to the audio file, or its shared :class:`DecodedAudio`.
+            word_timestamps: Run the word alignment pass and keep per-word timings in
+                the segments. Defaults to ``CONFIG["whisper"]["word_timestamps"]``.
+            start_offset: Seconds of audio to skip (resuming an interrupted run).
+                Segment timestamps stay relative to the start of the file.
+            language: Language code; defaults to ``CONFIG["whisper"]["language"]``.
+            speech_map: Speech intervals from the VAD pre-pass. Whisper then only
+                decodes the condensed speech buffer, and its own VAD is skipped.
+                With no speech after ``start_offset`` nothing is decoded.
+
+        Returns:
+            Tuple of (iterator of segment dicts, faster-whisper TranscriptionInfo).
+            Decoding happens as the iterator is consumed. ``info.duration`` only
+            covers the audio Whisper actually received.
+        """
         self._ensure_whisper_loaded()
-        logger.info(f"Transcribing: {audio_path}")
-        
+        decoded = audio_path if isinstance(audio_path, DecodedAudio) else DecodedAudio.open(audio_path)
+        logger.info(f"Transcribing: {decoded.pcm_path}" + (f" from {start_offset:.1f}s" if start_offset else ""))
+
+        if word_timestamps is None:
+            word_timestamps = CONFIG["whisper"].get("word_timestamps", False)
+
+        if speech_map is not None:
+            speech_map = speech_map.clip(start_offset)
+            audio = speech_map.condense(decoded.samples)
+            if not len(audio):
+                # No speech after start_offset (e.g. finished chunks covered it): nothing to decode
+                logger.info("No speech left to transcribe")
+                return iter(()), no_speech_info(language or CONFIG["whisper"]["language"])
+            to_file_time = speech_map.to_original
+        else:
+            # Whisper reads a zero-copy view of the shared PCM; seeking is just slicing
+            audio = decoded.view(start_offset)
+            to_file_time = SpeechMap.uncondensed(start_offset, decoded.duration).to_original
+
         segments, info = self.whisper.transcribe(
-            audio_path,
-            language=CONFIG["whisper"]["language"],
+            audio,
+            language=language or CONFIG["whisper"]["language"],
             beam_size=5,
-            word_timestamps=True,
-            vad_filter=True,
+            word_timestamps=word_timestamps,
+            vad_filter=speech_map is None,
             vad_parameters=dict(min_silence_duration_ms=500, speech_pad_ms=200)
         )
         
         logger.info(f"Detected language: {info.language} (confidence: {info.language_probability:.2f})")
-        
-        transcript_segments = []
-        full_text_parts = []
-        
-        for segment in segments:
-            transcript_segments.append({
-                "start": segment.start,
-                "end": segment.end,
-                "text": segment.text.strip()
-            })
-            full_text_parts.append(segment.text.strip())
-            mins, secs = int(segment.start // 60), int(segment.start % 60)
-            logger.debug(f"  [{mins:02d}:{secs:02d}] {segment.text.strip()[:60]}...")
-        
+
+        def segment_dicts() -> Iterator[dict]:
+            for segment in segments:
+                seg_data = {
+                    "start": to_file_time(segment.start),
+                    "end": to_file_time(segment.end, is_end=True),
+                    "text": segment.text.strip(),
+                    "avg_logprob": segment.avg_logprob,
+                }
+                if word_timestamps and segment.words:
+                    seg_data["words"] = [
+                        {"start": to_file_time(w.start), "end": to_file_time(w.end, is_end=True),
+                         "word": w.word.strip(), "probability": w.probability}
+                        for w in segment.words
+                    ]
+                mins, secs = int(seg_data["start"] // 60), int(seg_data["start"] % 60)
+                logger.debug(f"  [{mins:02d}:{secs:02d}] {seg_data['text'][:60]}...")
+                yield seg_data
+
+        return segment_dicts(), info
+
+    def _speech_map(self, decoded: DecodedAudio, output_dir: Path | None = None,
+                    filename: str = SPEECH_MAP_FILE) -> SpeechMap | None:
+        """Run (or reuse) the VAD pre-pass for a recording; None when disabled.
+
+        With ``output_dir`` the intervals are stored as ``speech.json`` so resumed
+        runs and later stages reuse them instead of running VAD again.
+        """
+        vad_config = CONFIG["vad"]
+        if not vad_config.get("enabled", True):
+            return None
+        params = {k: vad_config[k] for k in DEFAULT_VAD_PARAMS if k in vad_config}
+        if output_dir is None:
+            return SpeechMap.detect(decoded.samples, params)
+        return SpeechMap.for_audio(decoded.samples, output_dir, params, filename)
+
+    def transcribe_channels(self, channels: dict[int, DecodedAudio], output_dir: Path | None = None,
+                            start_offset: float = 0.0, language: str | None = None) -> tuple[Iterator[dict], object]:
+        """Transcribe the mic and system channels of a tracks recording in parallel.
+
+        Each channel gets its own VAD pass and Whisper decode (on its own thread);
+        the segments come back merged in time order and tagged with ``channel``.
+
+        Returns:
+            Tuple of (iterator of segment dicts, TranscriptionInfo of the channel
+            with the most speech).
+        """
+        streams, infos = {}, []
+        for channel, decoded in channels.items():
+            speech_map = self._speech_map(decoded, output_dir, f"speech.ch{channel}.json")
+            if speech_map is not None and not len(speech_map.clip(start_offset).intervals):
+                logger.info(f"No speech on channel {channel}, skipping it")
+                continue
+            segments, info = self.transcribe_stream(
+                decoded, start_offset=start_offset, language=language, speech_map=speech_map
+            )
+            streams[channel] = segments
+            infos.append((speech_map.speech_duration if speech_map else info.duration, info))
+
+        if not infos:
+            return iter(()), None
+        return merge_channel_segments(streams), max(infos, key=lambda item: item[0])[1]
+
+    def transcribe_chunk(self, manifest_path: str | Path, entry: dict, meta: dict | None = None) -> None:
+        """Queue one finished chunk of a recording in progress for transcription.
+
+        Segments go into the meeting's streaming transcript (times offset to the
+        meeting), so :meth:`process` later only decodes what no chunk covered.
+
+        Args:
+            manifest_path: The meeting's ``chunks.json``.
+            entry: The chunk's manifest entry (``file``, ``offset``, ``duration``).
+            meta: Job settings saved in the checkpoint (meeting type, title, ...).
+        """
+        output_dir = Path(manifest_path).parent
+        self._chunk_jobs[output_dir] = self._chunk_pool.submit(
+            self._transcribe_chunk, Path(manifest_path), entry, meta or {}
+        )
+
+    def _transcribe_chunk(self, manifest_path: Path, entry: dict, meta: dict) -> None:
+        output_dir = manifest_path.parent
+        writer = StreamingTranscriptWriter(output_dir, resume=True, meta={"audio": manifest_path.name, **meta})
+        spotter = self._open_spotter(writer)
+        try:
+            # Skip whatever an earlier chunk (or resumed run) already covered
+            start = max(writer.last_end, writer.meta.get("transcribed_until", 0.0)) - entry["offset"]
+            if start < entry["duration"]:
+                decoded = DecodedAudio.open(output_dir / entry["file"])
+                speech_map = self._speech_map(decoded)
+                if speech_map is None or len(speech_map.clip(max(start, 0.0)).intervals):
+                    # A decode slot, so a chunk and the queue's meetings stay within processing.workers
+                    with self._decode_slots:
+                        segments, info = self.transcribe_stream(
+                            decoded, start_offset=max(start, 0.0), language=writer.meta.get("language"),
+                            speech_map=speech_map,
+                        )
+                        writer.meta.setdefault("language", info.language)
+                        for seg_data in segments:
+                            seg_data = _shift_segment(seg_data, entry["offset"])
+                            writer.write(seg_data)
+                            if spotter:
+                                spotter.feed(seg_data)
+                decoded.remove()
+            writer.meta["transcribed_until"] = entry["offset"] + entry["duration"]
+            logger.info(f"Chunk transcribed: {entry['file']}")
+        finally:
+            writer.close()
+            if spotter:
+                spotter.close()
+
+    @staticmethod
+    def _open_spotter(writer: StreamingTranscriptWriter) -> TranscriptActionSpotter | None:
+        """Action-phrase spotter fed alongside ``writer`` (None if disabled)."""
+        if not CONFIG["actions"].get("from_transcript", True):
+            return None
+
+        def spotted(item: dict) -> None:
+            logger.info(f"Action spotted at {int(item['start'] // 60)}:{int(item['start'] % 60):02d}: {item['action']}")
+
+        return TranscriptActionSpotter(
+            writer.output_dir, resume_until=writer.last_end if writer.resumed else None, on_item=spotted
+        )
+
+    def _wait_for_chunks(self, output_dir: Path) -> None:
+        """Let chunk transcriptions of this meeting finish before the final pass."""
+        job = self._chunk_jobs.pop(output_dir, None)
+        if job is None:
+            return
+        try:
+            job.result()
+        except Exception as e:
+            # The final pass resumes from the last checkpoint and covers the rest
+            logger.error(f"Chunk transcription failed: {e}")
+
+    def transcribe(self, audio_path: str, word_timestamps: bool | None = None) -> dict:
+        """Transcribe audio file using Whisper, keeping the result in memory.
+
+        Args:
+            audio_path: Path to the audio file.
+            word_timestamps: See :meth:`transcribe_stream`.
+
+        Returns:
+            Dictionary with language, duration, full text and segments (a ``SegmentStore``).
+        """
+        decoded = DecodedAudio.open(audio_path)
+        try:
+            speech_map = self._speech_map(decoded)
+            segments, info = self.transcribe_stream(decoded, word_timestamps, speech_map=speech_map)
+
+            transcript_segments = SegmentStoreBuilder()
+            for seg_data in segments:
+                transcript_segments.append_dict(seg_data)
+            duration = decoded.duration
+            store = transcript_segments.build({"language": info.language, "duration": duration})
+        finally:
+            decoded.remove()  # The PCM cache is only needed while decoding
+
         return {
             "language": info.language,
-            "duration": info.duration,
-            "text": " ".join(full_text_parts),
-            "segments": transcript_segments
+            "duration": duration,
+            "text": store.full_text(),
+            "segments": store
         }
     
     def generate_mom(self, transcript: str, date: str, duration: str,
-                     meeting_type: str = "Business Meeting", summary_length: str = "Detailed") -> str:
+                     meeting_type: str = "Business Meeting", summary_length: str = "Detailed",
+                     context: str = "", stats: dict | None = None) -> str:
         """Generate Minutes of Meeting using the configured LLM provider.
 
         Args:
@@ -1007,58 +1543,163 @@ class MeetingProcessor:
             duration: Meeting duration string.
             meeting_type: Type of meeting (maps to template).
             summary_length: "Brief" or "Detailed".
+            context: Previous meetings section (see ``meeting_context``), put
+                before the transcript.
+            stats: If given, filled with the prompt sizes (see ``PromptBuilder.build``)
+                and the provider's token counts.
 
         Returns:
             Generated meeting minutes text.
         """
         template = MOM_TEMPLATES.get(meeting_type, MOM_TEMPLATES["Business Meeting"])
-        prompt = template.format(
-            transcript=transcript,
-            date=date,
-            duration=duration
-        )
 
-        # Add brief instruction if selected
-        if summary_length == "Brief":
-            brief_instruction = """
-
-IMPORTANT: Generate a BRIEF, CONCISE summary. Keep each section to 2-3 bullet points maximum.
-Focus only on the most critical information. Skip sections with no significant content.
-Total output should be approximately 1 page."""
-            prompt = prompt.replace("Generate the meeting minutes now:",
-                                   brief_instruction + "\n\nGenerate the meeting minutes now:")
-
-        logger.info(f"Generating MoM ({meeting_type}, {summary_length}) with {self.llm_provider.name}...")
-
-        # Resolve temperature from the active provider's config section
+        # Resolve temperature and response length from the active provider's config section
         provider_name = CONFIG.get("llm", {}).get("provider", "ollama")
         temperature = CONFIG.get(provider_name, {}).get("temperature", 0.3)
-        max_tokens = CONFIG.get("openai", {}).get("max_tokens", 4096)
-
-        return self.llm_provider.generate(prompt, temperature=temperature, max_tokens=max_tokens)
+        max_tokens = CONFIG.get(provider_name, {}).get("max_tokens", 2048)
+
+        # Sized to the model's context window, cutting the transcript if needed
+        builder = PromptBuilder(self.llm_provider.context_window, max_tokens)
+        prompt, prompt_stats = builder.build(
+            template, transcript, context=context,
+            instructions=BRIEF_INSTRUCTION if summary_length == "Brief" else "",
+            date=date, duration=duration,
+        )
+        compression = f", {'+'.join(prompt_stats['compression'])}" if prompt_stats["compression"] else ""
+        logger.info(f"Generating MoM ({meeting_type}, {summary_length}) with {self.llm_provider.name} - "
+                    f"prompt ~{prompt_stats['prompt_tokens']} of {builder.budget} tokens{compression}")
+
+        mom = self.llm_provider.generate(prompt, temperature=temperature, max_tokens=max_tokens, stats=prompt_stats)
+        if prompt_stats.get("provider_prompt_tokens"):
+            logger.info(f"Prompt: {prompt_stats['provider_prompt_tokens']} tokens counted by the provider")
+        if stats is not None:
+            stats.update(prompt_stats)
+        return mom
     
     def process(self, audio_path: str, meeting_type: str = "Business Meeting", 
-                summary_length: str = "Detailed", title: str = None) -> dict:
-        """Full pipeline: transcribe and generate MoM."""
+                summary_length: str = "Detailed", title: str = None, resume: bool = True) -> dict:
+        """Full pipeline: transcribe and generate MoM.
+
+        Transcription is checkpointed to the meeting folder; with ``resume`` an
+        interrupted run continues from the last saved segment instead of from zero.
+        """
         audio_path = Path(audio_path)
         output_dir = audio_path.parent  # Meeting subfolder
         
-        # Transcribe
+        # Transcribe, streaming segments to disk as they are decoded
         logger.info("STEP 1: Transcription")
+        self._wait_for_chunks(output_dir)
+
+        # Job settings ride along in the checkpoint so startup can resume the run
+        writer = StreamingTranscriptWriter(
+            output_dir,
+            resume=resume,
+            meta={"audio": audio_path.name, "meeting_type": meeting_type,
+                  "summary_length": summary_length, "title": title},
+        )
+        # Chunks transcribed while recording count as done, including their silent tails
+        start_offset = max(writer.last_end, writer.meta.get("transcribed_until", 0.0)) if writer.resumed else 0.0
+        spotter = self._open_spotter(writer)
+        decoded = DecodedAudio.open(audio_path)
+
+        # Separate mic/system tracks: local/remote labels, optionally per-channel Whisper
+        tracks_file = find_tracks(output_dir)
+        channels = {}
+        if tracks_file and CONFIG["whisper"].get("per_channel", False):
+            channels = {ch: DecodedAudio.open(tracks_file, channel=ch) for ch in (MIC, SYSTEM)}
+
+        # Levels measured while recording: a silent capture needs no VAD or Whisper
+        levels = load_levels(output_dir)
+        silent = levels is not None and not levels.get("has_signal", True)
+
+        # VAD pre-pass: Whisper only decodes speech, and silent recordings stop here
+        speech_map = None if silent else self._speech_map(decoded, output_dir)
+
+        # Diarization only reads the shared PCM, so it runs beside Whisper
+        diarization_future = None
+        if not silent and CONFIG["diarization"].get("enabled", False):
+            params = {k: CONFIG["diarization"][k] for k in DEFAULT_DIARIZATION_PARAMS if k in CONFIG["diarization"]}
+            diarization_future = self._diarization_pool.submit(
+                diarize, decoded.samples, speech_map, output_dir, params
+            )
 
-        transcript_data = self.transcribe(str(audio_path))
+        language = writer.meta.get("language")
+        try:
+            min_speech = CONFIG["vad"].get("min_speech_seconds", 0.0)
+            if silent:
+                logger.warning("Recording was silent on every source - skipping transcription")
+            elif speech_map is not None and speech_map.speech_duration < min_speech:
+                logger.warning(
+                    f"Only {speech_map.speech_duration:.1f}s of speech detected "
+                    f"(minimum {min_speech:.1f}s) - skipping transcription"
+                )
+            else:
+                with self._decode_slots:  # Shared with chunk transcriptions
+                    if channels:
+                        segments, info = self.transcribe_channels(channels, output_dir, start_offset, language)
+                    else:
+                        segments, info = self.transcribe_stream(
+                            decoded, start_offset=start_offset, language=language, speech_map=speech_map
+                        )
+                    if info is not None:
+                        language = writer.meta["language"] = info.language
+                    for seg_data in segments:
+                        writer.write(seg_data)
+                        if spotter:
+                            spotter.feed(seg_data)
+        finally:
+            writer.close()
+            if spotter:
+                spotter.close()
 
-        # Save transcript
         transcript_file = output_dir / "transcript.txt"
-        with open(transcript_file, 'w', encoding='utf-8') as f:
-            f.write(transcript_data['text'])
+        segments_file = output_dir / "segments.segs"
+        segments_json_file = output_dir / "segments.json" if CONFIG["whisper"].get("segments_json", True) else None
+        transcript_data = {"language": language, "duration": decoded.duration}
+
+        diarization = None
+        if diarization_future is not None:
+            try:
+                diarization = diarization_future.result()
+                transcript_data["speakers"] = diarization.num_speakers
+            except Exception as e:
+                logger.error(f"Diarization failed, transcript will have no speaker labels: {e}")
+
+        # Per-channel energy decides local (mic) vs remote (system) for each segment
+        annotators = [diarization.annotate] if diarization else []
+        if tracks_file:
+            annotators.append(ChannelActivity.from_file(tracks_file).annotate)
+
+        def annotate(segment: dict) -> dict:
+            for annotator in annotators:
+                segment = annotator(segment)
+            return segment
+
+        store = writer.finalize(
+            transcript_file, segments_file, segments_json_file, meta=transcript_data,
+            annotate=annotate if annotators else None,
+        )
         logger.info(f"Transcript saved: {transcript_file}")
+        logger.info(f"Segments saved: {segments_file}")
+
+        # Full-text search across meetings: only this meeting's rows change
+        if CONFIG["search"].get("index", True) and len(store):
+            try:
+                with TranscriptIndex(output_dir.parent) as index:
+                    index.add_meeting(segments_file, store, title or output_dir.name)
+            except Exception as e:
+                logger.error(f"Could not update the transcript search index: {e}")
+
+        # All audio stages are done; the float32 cache is 2x the WAV size
+        if not CONFIG["whisper"].get("keep_decoded_audio", False):
+            decoded.remove()
+            for channel_audio in channels.values():
+                channel_audio.remove()
         
         # CHECK: Is transcript empty or too short?
-        transcript_text = transcript_data['text'].strip()
-        word_count = len(transcript_text.split())
+        word_count = writer.word_count
         
-        if not transcript_text or word_count < 10:
+        if word_count < 10:
             logger.warning(
                 f"Transcript is empty or too short! Words captured: {word_count}. "
                 "Possible causes: wrong audio device, loopback not working, or audio was muted."
@@ -1088,7 +1729,7 @@ No audio was captured from this meeting. The transcript is empty.
 3. Ensure the loopback device matches your speaker (e.g., DELL S2725HS)
 
 ### Audio File
-The audio file has been saved: `audio.wav`
+The audio file has been saved: `{audio_path.name}`
 You can play it to verify if any audio was captured.
 """
             mom_file = output_dir / "MoM.md"
@@ -1112,7 +1753,24 @@ You can play it to verify if any audio was captured.
         duration_secs = int(transcript_data['duration'] % 60)
         duration_str = f"{duration_mins} minutes {duration_secs} seconds"
         
-        mom = self.generate_mom(transcript_data['text'], date_str, duration_str, meeting_type, summary_length)
+        # Related open items and decisions of earlier meetings, within a token budget
+        passage_vectors, context = None, ""
+        if meeting_type in CONFIG["context"].get("previous_meetings", []):
+            if CONFIG["search"].get("semantic", False):
+                passage_vectors, context = self._previous_meetings_context(output_dir, store, title)
+            else:
+                logger.warning("Previous meetings context needs search.semantic - skipped")
+
+        # The transcript is only loaded as one string here, for the prompt
+        prompt_stats = {}
+        if CONFIG["compression"].get("enabled", True):
+            prompt_transcript, prompt_stats["transcript_compression"] = self._compress_transcript(store, meeting_type)
+        else:
+            prompt_transcript = transcript_file.read_text(encoding='utf-8')
+        mom = self.generate_mom(prompt_transcript, date_str, duration_str, meeting_type, summary_length, context,
+                                stats=prompt_stats)
+        with open(output_dir / PROMPT_STATS_FILE, "w", encoding="utf-8") as f:
+            json.dump(prompt_stats, f, indent=2)
         
         # Add title to MoM if provided
         if title:
@@ -1130,7 +1788,11 @@ You can play it to verify if any audio was captured.
         
         # Track action items
         logger.info("STEP 4: Tracking Action Items")
-        self._track_action_items(mom, output_dir, title)
+        action_items, spoken_at = self._track_action_items(mom, output_dir, title)
+
+        if CONFIG["search"].get("semantic", False):
+            logger.info("STEP 5: Semantic Indexing")
+            self._index_semantic(output_dir, store, mom, title, passage_vectors, action_items, spoken_at)
         
         return {
             "transcript_file": str(transcript_file),
@@ -1223,179 +1885,116 @@ You can play it to verify if any audio was captured.
             logger.exception(f"PDF export failed: {e}")
             return None
     
-    def _track_action_items(self, mom_content: str, meeting_folder: Path, title: str = None):
+    def _compress_transcript(self, store: SegmentStore, meeting_type: str) -> tuple[str, dict]:
+        """The transcript text for the prompt, compressed with the meeting type's settings.
+
+        Returns:
+            The text and the compression stats (settings, tokens before and
+            after, segments dropped per reason).
+        """
+        started = time.perf_counter()
+        settings = settings_for(CONFIG["compression"], meeting_type)
+        compressed, dropped = compress_segments(store, **settings)
+        text, original = transcript_text(compressed), transcript_text(store)
+        if not text.strip():
+            text = original  # Everything was filtered out (e.g. min_avg_logprob too strict)
+        before, after = estimate_tokens(original), estimate_tokens(text)
+        logger.info(f"Transcript compressed for the prompt: ~{before} -> ~{after} tokens "
+                    f"({1 - after / before:.0%} fewer) in {(time.perf_counter() - started) * 1000:.0f} ms")
+        return text, {"settings": settings, "tokens_before": before, "tokens_after": after, "dropped": dropped}
+
+    def _get_embedder(self):
+        """The semantic index's embedding model, loaded on first use (call with ``_semantic_lock`` held)."""
+        if self._embedder is None:
+            self._embedder = get_embedder(CONFIG["search"].get("embedding_model", "all-MiniLM-L6-v2"))
+            logger.info(f"Semantic index embedder: {self._embedder.name} ({self._embedder.dim}-d)")
+        return self._embedder
+
+    def _previous_meetings_context(self, meeting_folder: Path, store: SegmentStore,
+                                   title: str = None) -> tuple[np.ndarray | None, str]:
+        """Embed the transcript passages and retrieve related items of earlier meetings.
+
+        Returns:
+            The passage embeddings (reused when the meeting is indexed) and the
+            prompt section ("" if nothing relevant or on error).
+        """
+        settings = CONFIG["context"]
+        try:
+            started = time.perf_counter()
+            with self._semantic_lock:
+                embedder = self._get_embedder()
+                vectors = embedder.encode([p["text"] for p in passages_from_segments(store)])
+                context = previous_meetings_context(
+                    meeting_folder.parent, meeting_key(meeting_folder), title, vectors, embedder,
+                    max_tokens=settings.get("max_tokens", 600), top_k=settings.get("top_k", 12),
+                )
+            items = context.count("\n- ")
+            logger.info(f"Previous meetings context: {items} items in {time.perf_counter() - started:.1f}s")
+            return vectors, context
+        except Exception as e:
+            logger.error(f"Could not build the previous meetings context: {e}")
+            return None, ""
+
+    def _index_semantic(self, meeting_folder: Path, store: SegmentStore, mom_content: str, title: str = None,
+                        transcript_vectors: np.ndarray | None = None, action_items: list[list[str]] = (),
+                        spoken_at: dict[str, float] | None = None):
+        """Add the meeting's transcript passages, MoM sections and action items to the semantic index.
+
+        ``transcript_vectors`` are the passage embeddings if already computed
+        (by the previous meetings context).
+        """
+        transcript_passages = passages_from_segments(store)
+        mom_passages = passages_from_mom(mom_content) + passages_from_actions(action_items, spoken_at)
+        try:
+            with self._semantic_lock:
+                embedder = self._get_embedder()
+                if transcript_vectors is None:
+                    transcript_vectors = embedder.encode([p["text"] for p in transcript_passages])
+                vectors = np.concatenate([
+                    transcript_vectors.reshape(-1, embedder.dim),
+                    embedder.encode([p["text"] for p in mom_passages]).reshape(-1, embedder.dim),
+                ])
+                with SemanticIndex(meeting_folder.parent, embedder) as index:
+                    added = index.add_meeting(
+                        meeting_key(meeting_folder), transcript_passages + mom_passages,
+                        title or meeting_folder.name, vectors,
+                    )
+            logger.info(f"Semantic index: {added} passages added")
+        except Exception as e:
+            logger.error(f"Could not update the semantic index: {e}")
+
+    def _track_action_items(self, mom_content: str, meeting_folder: Path,
+                            title: str = None) -> tuple[list[list[str]], dict[str, float]]:
         """
         Extract and save action items to meeting folder.
         
         Uses two-pass approach:
         1. Extract from formal action-oriented sections
         2. Detect conversational action phrases throughout content
+
+        Candidates spotted in the transcript while it was decoded are merged in
+        after the MoM's own items, with the time they were spoken.
+
+        Returns:
+            The items (``[action, owner, deadline]`` lists) and the transcript
+            time of those spotted in the transcript.
         """
         try:
-            import re
-            
-            action_items = []
-            in_action_section = False
-            
-            # Keywords to detect actionable sections (using partial matches)
-            action_keywords = [
-                'action item', 'next step', 'follow-up', 'follow up',
-                'practice exercise', 'practice exercises', 
-                'key takeaway', 'key takeaways',
-                'further learning', 'recommendation', 
-                'to-do', 'todo', 'tasks', 'call to action',
-                'resources mentioned', 'tools mentioned'
-            ]
-            
-            # ==================================================================
             # PASS 1: Extract from formal action sections
-            # ==================================================================
-            lines = mom_content.split('\n')
-            for i, line in enumerate(lines):
-                line_lower = line.lower()
-                
-                # Detect action items section (must be a header line)
-                if line.startswith('#') and any(kw in line_lower for kw in action_keywords):
-                    in_action_section = True
-                    continue
-                
-                # Detect end of section (next header that isn't an actionable section)
-                if in_action_section and line.startswith('#'):
-                    if not any(kw in line_lower for kw in action_keywords):
-                        in_action_section = False
-                    continue
-                
-                # Capture action items
-                if in_action_section:
-                    stripped = line.strip()
-                    if not stripped:
-                        continue
-                    
-                    # Table row (skip header and separator rows)
-                    if stripped.startswith('|') and '---' not in stripped:
-                        cells = [c.strip() for c in stripped.split('|')]
-                        cells = [c for c in cells if c]
-                        
-                        # Skip header row
-                        header_words = ['action', 'item', 'task', 'owner', 'deadline', 'status', 'priority']
-                        if cells and any(h in cells[0].lower() for h in header_words):
-                            continue
-                        # Skip if first cell is just "#"
-                        if cells and cells[0] == '#':
-                            continue
-                        
-                        # Handle tables with row number column (e.g., | 1 | Action | Owner |)
-                        if cells and cells[0].isdigit() and len(cells) > 1:
-                            action_text = cells[1] if len(cells) > 1 else ""
-                            if action_text and len(action_text) > 3:
-                                action_items.append(cells[1:])  # Skip the # column
-                        elif cells and len(cells[0]) > 3:
-                            # No row number column
-                            action_items.append(cells)
-                    
-                    # Bullet points (- item or * item)
-                    elif stripped.startswith('- ') or stripped.startswith('* '):
-                        item = stripped[2:].strip()
-                        item = item.replace('**', '').replace('`', '').strip()
-                        if item and len(item) > 3:
-                            action_items.append([item])
-                    
-                    # Numbered list (1. Item or 1) Item)
-                    elif stripped and stripped[0].isdigit():
-                        # Try to extract after "1. " or "1) "
-                        item = None
-                        if '. ' in stripped[:5]:
-                            item = stripped.split('. ', 1)[1].strip()
-                        elif ') ' in stripped[:5]:
-                            item = stripped.split(') ', 1)[1].strip()
-                        
-                        if item:
-                            item = item.replace('**', '').replace('`', '').strip()
-                            if len(item) > 3:
-                                action_items.append([item])
-            
-            # ==================================================================
-            # PASS 2: Detect conversational action phrases
-            # ==================================================================
-            conversational_patterns = [
-                r'i want you to ([^.!?]+)',
-                r'my suggestion is ([^.!?]+)',
-                r'you should ([^.!?]+)',
-                r'please try ([^.!?]+)',
-                r'make sure to ([^.!?]+)',
-                r'don\'t forget to ([^.!?]+)',
-                r'remember to ([^.!?]+)',
-                r'note this down[:\s]+([^.!?]+)',
-                r'note down ([^.!?]+)',
-                r'as a challenge[,\s]+([^.!?]+)',
-                r'challenge for you[:\s]+([^.!?]+)',
-                r'homework[:\s]+([^.!?]+)',
-                r'assignment[:\s]+([^.!?]+)',
-                r'practice ([^.!?]+)',
-                r'try this out[:\s]+([^.!?]+)',
-                r'check out ([^.!?]+)',
-                r'take a look at ([^.!?]+)',
-                r'read about ([^.!?]+)',
-                r'learn more about ([^.!?]+)',
-                r'explore ([^.!?]+)',
-                r'download ([^.!?]+)',
-                r'search for ([^.!?]+)',
-                r'look into ([^.!?]+)',
-            ]
-            
-            # Search entire content for conversational action items
-            full_content = mom_content.lower()
-            conversational_items = []
-            
-            for pattern in conversational_patterns:
-                matches = re.finditer(pattern, full_content, re.IGNORECASE)
-                for match in matches:
-                    if match.group(1):
-                        item_text = match.group(1).strip()
-                        # Clean up the text
-                        item_text = item_text.replace('**', '').replace('`', '')
-                        item_text = item_text.replace('\n', ' ').strip()
-                        
-                        # Skip if too short or too long
-                        if len(item_text) > 10 and len(item_text) < 200:
-                            # Capitalize first letter
-                            item_text = item_text[0].upper() + item_text[1:]
-                            conversational_items.append(item_text)
-            
-            # Deduplicate conversational items (remove very similar ones)
-            unique_conversational = []
-            for item in conversational_items:
-                # Check if this item is substantially different from existing ones
-                is_unique = True
-                item_words = set(item.lower().split())
-                for existing in unique_conversational:
-                    existing_words = set(existing.lower().split())
-                    # If >70% word overlap, consider it duplicate
-                    overlap = len(item_words & existing_words)
-                    if overlap / max(len(item_words), 1) > 0.7:
-                        is_unique = False
-                        break
-                
-                if is_unique:
-                    unique_conversational.append(item)
+            action_items = extract_section_items(mom_content)
+
+            # PASS 2: Detect conversational action phrases (one scan, precompiled triggers)
+            conversational_items = extract_conversational(mom_content)
             
-            # Add conversational items (but don't duplicate formal ones)
-            for conv_item in unique_conversational:
-                # Check if already in formal action items
-                is_duplicate = False
-                for action_item in action_items:
-                    formal_text = action_item[0] if isinstance(action_item, list) else action_item
-                    if isinstance(formal_text, str):
-                        # Check for substantial overlap
-                        formal_words = set(formal_text.lower().split())
-                        conv_words = set(conv_item.lower().split())
-                        overlap = len(formal_words & conv_words)
-                        if overlap / max(len(conv_words), 1) > 0.5:
-                            is_duplicate = True
-                            break
-                
-                if not is_duplicate:
-                    action_items.append([conv_item])
+            # Deduplicate conversational items (>70% word overlap with a kept one) and
+            # skip those already listed (>50% overlap); indexed, so near-linear
+            action_items = merge_action_items(action_items, conversational_items)
+
+            # PASS 3: Transcript candidates the MoM doesn't already cover, same thresholds
+            spoken_at = {}
+            for candidate in load_action_candidates(meeting_folder):
+                spoken_at.setdefault(candidate["action"], candidate["start"])
+            action_items = merge_action_items(action_items, list(spoken_at))
             
             # ==================================================================
             # Save action items file
@@ -1417,7 +2016,7 @@ You can play it to verify if any audio was captured.
                         f.write("| # | Action | Owner | Deadline | Status |\n")
                         f.write("|---|--------|-------|----------|--------|\n")
                         for i, item in enumerate(action_items, 1):
-                            action = item[0] if len(item) > 0 else ""
+                            action = _with_time(item[0], spoken_at) if len(item) > 0 else ""
                             owner = item[1] if len(item) > 1 else "TBD"
                             deadline = item[2] if len(item) > 2 else "TBD"
                             f.write(f"| {i} | {action} | {owner} | {deadline} | ⬜ Pending |\n")
@@ -1425,7 +2024,7 @@ You can play it to verify if any audio was captured.
                         # Simple list format
                         for i, item in enumerate(action_items, 1):
                             action_text = item[0] if isinstance(item, list) else item
-                            f.write(f"{i}. ⬜ {action_text}\n")
+                            f.write(f"{i}. ⬜ {_with_time(action_text, spoken_at)}\n")
                 else:
                     f.write("*No action items identified in this meeting.*\n")
                 
@@ -1434,14 +2033,29 @@ You can play it to verify if any audio was captured.
             
             logger.info(f"Action items saved: {len(action_items)} items -> {action_file}")
 
+            # Cross-meeting index: only this meeting's rows change
+            if CONFIG["actions"].get("index", True):
+                try:
+                    with ActionIndex(meeting_folder.parent) as index:
+                        index.record_meeting(meeting_folder, action_items, meeting_name, datetime.now().date(), spoken_at)
+                except Exception as e:
+                    logger.error(f"Could not update the action-item index: {e}")
+
             # Log breakdown for debugging
             formal_count = len([item for item in action_items if isinstance(item, list) and len(item) > 1])
-            conversational_count = len(action_items) - formal_count
-            if conversational_count > 0:
-                logger.debug(f"  {formal_count} from formal sections, {conversational_count} from conversational phrases")
+            transcript_count = len([item for item in action_items if len(item) == 1 and item[0] in spoken_at])
+            conversational_count = len(action_items) - formal_count - transcript_count
+            if conversational_count > 0 or transcript_count > 0:
+                logger.debug(
+                    f"  {formal_count} from formal sections, {conversational_count} from conversational phrases, "
+                    f"{transcript_count} from the transcript"
+                )
+
+            return action_items, spoken_at
 
         except Exception as e:
             logger.exception(f"Action item tracking failed: {e}")
+            return [], {}
 
 
 # ============================================================
@@ -1517,11 +2131,11 @@ from tkinter import messagebox
 
 class FloatingButton:
     def __init__(self):
-        self.recorder = AudioRecorder()
+        self.recorder = AudioRecorder(on_source_state=self._on_source_state, on_chunk=self._on_chunk)
+        self.source_alerts = {}  # source -> "silent"/"dead" while recording
         self.processor = MeetingProcessor()
         self.email_sender = EmailSender()
         self.current_file = ""
-        self.processing = False
         
         # Create main window
         self.root = tk.Tk()
@@ -1534,7 +2148,7 @@ class FloatingButton:
         
         # Window size (increased for device + LLM provider dropdowns)
         self.width = 220
-        self.height = 190
+        self.height = 205
         
         # Position at top-right corner
         screen_width = self.root.winfo_screenwidth()
@@ -1721,6 +2335,17 @@ class FloatingButton:
             fg='#888888'
         )
         self.status_label.pack()
+
+        # Processing queue indicator (running job's step and queued count)
+        self.queue_var = tk.StringVar(value="")
+        self.queue_label = tk.Label(
+            self.frame,
+            textvariable=self.queue_var,
+            font=('Arial', 7),
+            bg='#2d2d2d',
+            fg='#cc9900'
+        )
+        self.queue_label.pack()
         
         # Make window draggable (bind to frame and status label, not button)
         self.frame.bind('<Button-1>', self._start_drag)
@@ -1745,6 +2370,7 @@ class FloatingButton:
         logger.debug(f"Output folder: {self.recorder.output_dir}")
         logger.debug(f"Whisper model: {CONFIG['whisper']['model']} on {CONFIG['whisper']['device']}")
         logger.debug(f"LLM provider:  {self.processor.llm_provider.name}")
+        logger.debug(f"Workers:       {CONFIG['processing']['workers']}")
         logger.debug(f"Email to:      {CONFIG['email']['recipient_email']}")
         if self.recorder.available_devices:
             for dev in self.recorder.available_devices:
@@ -1752,6 +2378,18 @@ class FloatingButton:
                 logger.debug(f"  {marker} {dev['name']}")
         else:
             logger.warning("No loopback devices found - only mic will be recorded!")
+
+        # Recordings are processed by a fixed worker pool; pending jobs survive restarts
+        self.jobs = JobQueue(
+            self.recorder.output_dir / JOBS_FILE,
+            self._process_recording,
+            workers=CONFIG["processing"]["workers"],
+            on_change=lambda: self.root.after(0, self._update_queue_status),
+        )
+        self.jobs.start()
+
+        # Pick up transcriptions interrupted by a crash or quit
+        self.root.after(1000, self._resume_interrupted)
     
     def _on_title_focus_in(self, event):
         """Clear placeholder text on focus."""
@@ -1783,12 +2421,15 @@ class FloatingButton:
                 model=CONFIG["ollama"]["model"],
                 url=CONFIG["ollama"]["url"],
                 context_window=CONFIG["ollama"]["context_window"],
+                keep_alive=CONFIG["ollama"].get("keep_alive", "10m"),
             )
         else:
             model_map = {"GPT-4o": "gpt-4o", "GPT-4o-mini": "gpt-4o-mini"}
             model_id = model_map.get(selected, "gpt-4o-mini")
             api_key = os.environ.get("OPENAI_API_KEY", CONFIG.get("openai", {}).get("api_key", ""))
-            provider = OpenAIProvider(model=model_id, api_key=api_key)
+            provider = OpenAIProvider(
+                model=model_id, api_key=api_key, context_window=CONFIG["openai"].get("context_window", 128000)
+            )
             if not provider.is_available():
                 self.status_var.set("No API key!")
                 self.root.after(3000, lambda: self.status_var.set("Ready"))
@@ -1816,15 +2457,34 @@ class FloatingButton:
         if self.recording_start and self.recorder.is_recording:
             elapsed = datetime.now() - self.recording_start
             mins, secs = divmod(int(elapsed.total_seconds()), 60)
-            self.status_var.set(f"⏺ {mins:02d}:{secs:02d}")
+            status = f"⏺ {mins:02d}:{secs:02d}"
+            if self.source_alerts:
+                status += "  ⚠ " + ", ".join(f"{src} {state}" for src, state in self.source_alerts.items())
+            self.status_var.set(status)
             self.timer_id = self.root.after(1000, self._update_timer)
+
+    def _on_source_state(self, source: str, state: str) -> None:
+        """Called from the mixer thread when a source goes silent/dead or recovers."""
+        self.root.after(0, self._show_source_state, source, state)
+
+    def _on_chunk(self, manifest_path: Path, entry: dict) -> None:
+        """Called from the mixer thread when a chunk file is finished: transcribe it now."""
+        self.processor.transcribe_chunk(manifest_path, entry, meta={
+            "meeting_type": self.selected_meeting_type,
+            "summary_length": self.selected_summary_length,
+            "title": self.selected_title,
+        })
+
+    def _show_source_state(self, source: str, state: str) -> None:
+        """Show a silent or dead audio source in the status line (UI thread)."""
+        if state == "ok":
+            self.source_alerts.pop(source, None)
+        else:
+            self.source_alerts[source] = state
+        self.status_label.config(fg='#ff9900' if self.source_alerts else '#888888')
     
     def _toggle_recording(self):
         """Toggle recording state."""
-        if self.processing:
-            self.status_var.set("Processing...")
-            return
-        
         if self.recorder.is_recording:
             # Stop recording
             self._stop_recording()
@@ -1854,6 +2514,7 @@ class FloatingButton:
             title = None
         self.selected_title = title
         
+        self.source_alerts = {}
         self.current_file = self.recorder.start_recording(title)
         self.recording_start = datetime.now()
         
@@ -1878,20 +2539,26 @@ class FloatingButton:
         
         # Stop recording
         self.current_file, duration = self.recorder.stop_recording()
+        self.source_alerts = {}
+        self.status_label.config(fg='#888888')
         
-        # Update UI
-        self.button.config(bg='#cc9900', text="● REC")
-        self.status_var.set("Processing...")
-        self.processing = True
+        # Update UI - processing is queued, so the next meeting can be recorded right away
+        self.button.config(text="● REC")
+        self._enable_inputs()
+        self.title_var.set("Meeting title...")
         
         if self.current_file and duration > 5:
-            # Process in background thread
-            threading.Thread(target=self._process_recording, daemon=True).start()
+            # The job carries its own options; the dropdowns may change before it runs
+            self.jobs.submit(
+                self.current_file,
+                meeting_type=self.selected_meeting_type,
+                summary_length=self.selected_summary_length,
+                title=self.selected_title,
+            )
+            self.status_var.set("Queued")
         else:
-            self.processing = False
-            self._enable_inputs()
             self.status_var.set("Too short")
-            self.root.after(2000, lambda: self.status_var.set("Ready"))
+        self.root.after(2000, lambda: self._set_idle_status("Ready"))
     
     def _enable_inputs(self) -> None:
         """Re-enable all input fields."""
@@ -1902,23 +2569,25 @@ class FloatingButton:
         self.llm_dropdown.config(state='normal')
         self.title_entry.config(state='normal')
     
-    def _process_recording(self):
-        """Process recording in background."""
+    def _process_recording(self, job: dict) -> None:
+        """Process one queued recording (runs on a queue worker thread).
+
+        Args:
+            job: Job dict with ``audio_file``, ``meeting_type``, ``summary_length`` and ``title``.
+        """
         try:
-            # Update status
-            self.root.after(0, lambda: self.status_var.set("Transcribing..."))
-            
-            # Process with Whisper + Ollama using selected options
+            self.jobs.set_stage(job, "Transcribing...")
+
+            # Process with Whisper + Ollama using the job's options
             result = self.processor.process(
-                self.current_file,
-                self.selected_meeting_type,
-                self.selected_summary_length,
-                self.selected_title
+                job["audio_file"],
+                job["meeting_type"],
+                job["summary_length"],
+                job["title"]
             )
-            
-            # Update status
-            self.root.after(0, lambda: self.status_var.set("Emailing..."))
-            
+
+            self.jobs.set_stage(job, "Emailing...")
+
             # Send email
             meeting_date = datetime.now().strftime("%B %d, %Y at %I:%M %p")
             email_sent = self.email_sender.send_mom(
@@ -1926,23 +2595,55 @@ class FloatingButton:
                 result["mom_file"],
                 meeting_date
             )
-            
+
             # Final status
-            if email_sent:
-                self.root.after(0, lambda: self.status_var.set("✓ Emailed!"))
-            else:
-                self.root.after(0, lambda: self.status_var.set("✓ Saved"))
-            
-        except Exception as e:
-            logger.error(f"Processing error: {e}")
-            self.root.after(0, lambda: self.status_var.set("Error!"))
-        
+            self.root.after(0, self._set_idle_status, "✓ Emailed!" if email_sent else "✓ Saved")
+        except Exception:
+            self.root.after(0, self._set_idle_status, "Error!")
+            raise  # The queue logs it and marks the job failed
         finally:
-            self.processing = False
-            self.root.after(0, self._enable_inputs)
-            self.root.after(3000, lambda: self.status_var.set("Ready"))
-            # Clear title for next meeting
-            self.root.after(0, lambda: self.title_var.set("Meeting title..."))
+            self.root.after(3000, self._set_idle_status, "Ready")
+
+    def _set_idle_status(self, text: str) -> None:
+        """Show a status message unless a recording's timer owns the status line (UI thread)."""
+        if not self.recorder.is_recording:
+            self.status_var.set(text)
+
+    def _update_queue_status(self) -> None:
+        """Refresh the queued/running indicator (UI thread)."""
+        counts = self.jobs.counts()
+        running = self.jobs.running()
+        parts = []
+        if running:
+            stage = running[0]["stage"] or "Processing..."
+            parts.append(stage if len(running) == 1 else f"{stage} ({len(running)} running)")
+        if counts["queued"]:
+            parts.append(f"{counts['queued']} queued")
+        self.queue_var.set(("⚙ " + " · ".join(parts)) if parts else "")
+
+    def _resume_interrupted(self) -> None:
+        """Queue transcriptions left unfinished by a crash, reboot or quit.
+
+        Jobs already in the persistent queue resume on their own; this catches
+        checkpointed recordings that were never queued (e.g. from older versions)
+        and retries failed ones, up to ``MAX_ATTEMPTS`` runs per recording.
+        """
+        for checkpoint in sorted(self.recorder.output_dir.glob(f"*/{TRANSCRIBE_CHECKPOINT}")):
+            state = StreamingTranscriptWriter.load_checkpoint(checkpoint.parent) or {}
+            meta = state.get("meta", {})
+            audio_file = checkpoint.parent / meta.get("audio", "audio.wav")
+            if not audio_file.exists():
+                continue
+            attempts = self.jobs.attempts(str(audio_file))
+            if attempts >= MAX_ATTEMPTS:
+                logger.warning(f"Not resuming {audio_file}: failed {attempts} times (see {JOBS_FILE})")
+                continue
+            self.jobs.submit(
+                str(audio_file),
+                meeting_type=meta.get("meeting_type", MEETING_TYPES[0]),
+                summary_length=meta.get("summary_length", "Detailed"),
+                title=meta.get("title"),
+            )
     
     def _open_folder(self):
         """Open recordings folder."""
@@ -1953,6 +2654,7 @@ class FloatingButton:
         if self.recorder.is_recording:
             self.recorder.stop_recording()
         self.recorder.cleanup()
+        self.processor.shutdown()
         self.root.quit()
         self.root.destroy()
     
@@ -6,10 +6,11 @@ Supports Ollama (local) and OpenAI GPT models.
 """
 
 import argparse
-import json
 import os
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
+from typing import Iterator
 
 from dotenv import load_dotenv
 from faster_whisper import WhisperModel
@@ -19,6 +20,67 @@ from loguru import logger
 load_dotenv(Path(__file__).parent.parent / ".env")
 
 from llm_providers import LLMProvider, OllamaProvider, OpenAIProvider
+from chunks import concat_chunks
+from decoded_audio import DecodedAudio
+from diarization import diarize
+from prompt_builder import PromptBuilder
+from segment_store import SegmentStoreBuilder
+from semantic_index import SemanticIndex, meeting_key, passages_from_mom, passages_from_segments
+from speech_map import SpeechMap, no_speech_info
+from tracks import merge_channel_segments
+from transcript_compression import compress_segments
+from transcript_index import TranscriptIndex
+from transcript_writer import StreamingTranscriptWriter, transcript_text
+
+
+NOTES_PROMPT = """You are a professional meeting note-taker. Analyze the following meeting transcript and create comprehensive meeting notes.
+
+## Instructions:
+1. Create a clear, organized summary
+2. Extract ALL action items with assignees if mentioned
+3. List key decisions made
+4. Note any deadlines or dates mentioned
+5. Highlight important topics discussed
+6. Flag any unresolved questions or follow-ups needed
+
+## Output Format:
+Use this exact structure:
+
+# Meeting Summary
+[2-3 sentence overview of the meeting's purpose and outcome]
+
+## Key Discussion Points
+- [Topic 1]: [Brief description]
+- [Topic 2]: [Brief description]
+...
+
+## Decisions Made
+1. [Decision with context]
+2. [Decision with context]
+...
+
+## Action Items
+| Action | Owner | Deadline |
+|--------|-------|----------|
+| [Task] | [Person/TBD] | [Date/TBD] |
+...
+
+## Follow-ups & Open Questions
+- [Question or item needing follow-up]
+...
+
+## Notable Quotes/Points
+- "[Exact quote if significant]" - regarding [topic]
+...
+
+---
+
+## Transcript:
+{transcript}
+
+---
+
+Please generate the meeting notes now:"""
 
 
 class MeetingProcessor:
@@ -30,6 +92,7 @@ class MeetingProcessor:
         device: str = "cuda",
         compute_type: str = "float16",
         llm_provider: LLMProvider | None = None,
+        num_workers: int = 1,
     ) -> None:
         """Initialize the meeting processor.
 
@@ -38,6 +101,7 @@ class MeetingProcessor:
             device: Device to use (cuda, cpu).
             compute_type: Compute type (float16, int8, float32).
             llm_provider: LLM provider instance. Defaults to OllamaProvider if not given.
+            num_workers: Whisper workers; use 2 for parallel per-channel transcription.
         """
         self.llm_provider = llm_provider or OllamaProvider(
             model="llama3.1:8b",
@@ -49,27 +113,58 @@ class MeetingProcessor:
             whisper_model,
             device=device,
             compute_type=compute_type,
+            num_workers=num_workers,
         )
         logger.info("Whisper model loaded.")
 
-    def transcribe(self, audio_path: str, language: str | None = None) -> dict:
-        """Transcribe audio file using Whisper.
+    def transcribe_stream(
+        self,
+        audio_path: str | DecodedAudio,
+        language: str | None = None,
+        word_timestamps: bool = False,
+        start_offset: float = 0.0,
+        speech_map: SpeechMap | None = None,
+    ) -> tuple[Iterator[dict], object]:
+        """Start a Whisper transcription and return its segments lazily.
 
         Args:
-            audio_path: Path to audio file.
+            audio_path: Path to audio file, or its shared :class:`DecodedAudio`.
             language: Language code (e.g., 'en', 'es') or None for auto-detect.
+            word_timestamps: Run the word alignment pass and keep per-word timings
+                in the segments. Off by default since it slows decoding.
+            start_offset: Seconds of audio to skip (resuming an interrupted run).
+                Segment timestamps stay relative to the start of the file.
+            speech_map: Speech intervals from the VAD pre-pass. Whisper then only
+                decodes the condensed speech buffer, and its own VAD is skipped.
+                With no speech after ``start_offset`` nothing is decoded.
 
         Returns:
-            Dictionary with transcript text and segments.
+            Tuple of (iterator of segment dicts, faster-whisper TranscriptionInfo).
+            Decoding happens as the iterator is consumed. ``info.duration`` only
+            covers the audio Whisper actually received.
         """
-        logger.info(f"Transcribing: {audio_path}")
+        decoded = audio_path if isinstance(audio_path, DecodedAudio) else DecodedAudio.open(audio_path)
+        logger.info(f"Transcribing: {decoded.pcm_path}" + (f" from {start_offset:.1f}s" if start_offset else ""))
+
+        if speech_map is not None:
+            speech_map = speech_map.clip(start_offset)
+            audio = speech_map.condense(decoded.samples)
+            if not len(audio):
+                # No speech after start_offset (e.g. finished chunks covered it): nothing to decode
+                logger.info("No speech left to transcribe")
+                return iter(()), no_speech_info(language)
+            to_file_time = speech_map.to_original
+        else:
+            # Whisper reads a zero-copy view of the shared PCM; seeking is just slicing
+            audio = decoded.view(start_offset)
+            to_file_time = SpeechMap.uncondensed(start_offset, decoded.duration).to_original
 
         segments, info = self.whisper.transcribe(
-            audio_path,
+            audio,
             language=language,
             beam_size=5,
-            word_timestamps=True,
-            vad_filter=True,
+            word_timestamps=word_timestamps,
+            vad_filter=speech_map is None,
             vad_parameters=dict(
                 min_silence_duration_ms=500,
                 speech_pad_ms=200,
@@ -78,102 +173,140 @@ class MeetingProcessor:
 
         logger.info(f"Detected language: {info.language} (confidence: {info.language_probability:.2f})")
 
-        transcript_segments = []
-        full_text_parts = []
-
-        for segment in segments:
-            seg_data = {
-                "start": segment.start,
-                "end": segment.end,
-                "text": segment.text.strip(),
-            }
-            transcript_segments.append(seg_data)
-            full_text_parts.append(segment.text.strip())
+        def segment_dicts() -> Iterator[dict]:
+            for segment in segments:
+                seg_data = {
+                    "start": to_file_time(segment.start),
+                    "end": to_file_time(segment.end, is_end=True),
+                    "text": segment.text.strip(),
+                    "avg_logprob": segment.avg_logprob,
+                }
+                if word_timestamps and segment.words:
+                    seg_data["words"] = [
+                        {
+                            "start": to_file_time(word.start),
+                            "end": to_file_time(word.end, is_end=True),
+                            "word": word.word.strip(),
+                            "probability": word.probability,
+                        }
+                        for word in segment.words
+                    ]
+
+                logger.debug(
+                    f"  [{self._format_time(seg_data['start'])} -> {self._format_time(seg_data['end'])}] "
+                    f"{seg_data['text'][:50]}..."
+                )
+                yield seg_data
+
+        return segment_dicts(), info
+
+    def transcribe(
+        self,
+        audio_path: str,
+        language: str | None = None,
+        word_timestamps: bool = False,
+        vad: bool = True,
+    ) -> dict:
+        """Transcribe audio file using Whisper, keeping the result in memory.
 
-            logger.debug(
-                f"  [{self._format_time(segment.start)} -> {self._format_time(segment.end)}] "
-                f"{segment.text.strip()[:50]}..."
-            )
+        Args:
+            audio_path: Path to audio file.
+            language: Language code (e.g., 'en', 'es') or None for auto-detect.
+            word_timestamps: See :meth:`transcribe_stream`.
+            vad: Run the VAD pre-pass and only decode the detected speech.
 
-        full_text = " ".join(full_text_parts)
+        Returns:
+            Dictionary with transcript text and segments (a ``SegmentStore``).
+        """
+        decoded = DecodedAudio.open(audio_path)
+        try:
+            speech_map = SpeechMap.detect(decoded.samples) if vad else None
+            segments, info = self.transcribe_stream(decoded, language, word_timestamps, speech_map=speech_map)
+
+            transcript_segments = SegmentStoreBuilder()
+            for seg_data in segments:
+                transcript_segments.append_dict(seg_data)
+            duration = decoded.duration
+            store = transcript_segments.build({"language": info.language, "duration": duration})
+        finally:
+            decoded.remove()  # The PCM cache is only needed while decoding
 
         return {
             "language": info.language,
-            "duration": info.duration,
-            "text": full_text,
-            "segments": transcript_segments,
+            "duration": duration,
+            "text": store.full_text(),
+            "segments": store,
         }
 
+    def transcribe_channels(
+        self,
+        audio_path: str | Path,
+        output_dir: Path,
+        language: str | None = None,
+        word_timestamps: bool = False,
+        start_offset: float = 0.0,
+        vad: bool = True,
+    ) -> tuple[Iterator[dict], object, list[DecodedAudio]]:
+        """Transcribe the two channels (mic, system) of a recording in parallel.
+
+        Returns:
+            Tuple of (segment dicts merged in time order and tagged with
+            ``channel``, TranscriptionInfo of the channel with the most speech,
+            the per-channel decoded audio to remove when done).
+        """
+        base_name = Path(audio_path).stem
+        streams, infos, decoded_channels = {}, [], []
+        for channel in (0, 1):
+            decoded = DecodedAudio.open(audio_path, cache_dir=output_dir, channel=channel)
+            decoded_channels.append(decoded)
+            speech_map = None
+            if vad:
+                speech_map = SpeechMap.for_audio(
+                    decoded.samples, output_dir, filename=f"{base_name}_speech.ch{channel}.json"
+                )
+                if not len(speech_map.clip(start_offset).intervals):
+                    logger.info(f"No speech on channel {channel}, skipping it")
+                    continue
+            segments, info = self.transcribe_stream(
+                decoded, language, word_timestamps, start_offset, speech_map=speech_map
+            )
+            streams[channel] = segments
+            infos.append((speech_map.speech_duration if speech_map else info.duration, info))
+
+        if not infos:
+            return iter(()), None, decoded_channels
+        info = max(infos, key=lambda item: item[0])[1]
+        return merge_channel_segments(streams), info, decoded_channels
+
     def _format_time(self, seconds: float) -> str:
         """Format seconds as MM:SS."""
         mins = int(seconds // 60)
         secs = int(seconds % 60)
         return f"{mins:02d}:{secs:02d}"
 
-    def summarize(self, transcript: str, custom_prompt: str | None = None) -> str:
+    def summarize(self, transcript: str, custom_prompt: str | None = None, max_tokens: int = 2048,
+                  stats: dict | None = None) -> str:
         """Generate meeting notes using the configured LLM provider.
 
         Args:
             transcript: The full transcript text.
             custom_prompt: Optional custom prompt template (use {transcript} placeholder).
+            max_tokens: Maximum tokens in the notes; the prompt gets the rest of
+                the provider's context window.
+            stats: If given, filled with the prompt sizes (see ``PromptBuilder.build``)
+                and the provider's token counts.
 
         Returns:
             Formatted meeting notes.
         """
-        if custom_prompt:
-            prompt = custom_prompt.replace("{transcript}", transcript)
-        else:
-            prompt = f"""You are a professional meeting note-taker. Analyze the following meeting transcript and create comprehensive meeting notes.
-
-## Instructions:
-1. Create a clear, organized summary
-2. Extract ALL action items with assignees if mentioned
-3. List key decisions made
-4. Note any deadlines or dates mentioned
-5. Highlight important topics discussed
-6. Flag any unresolved questions or follow-ups needed
-
-## Output Format:
-Use this exact structure:
-
-# Meeting Summary
-[2-3 sentence overview of the meeting's purpose and outcome]
-
-## Key Discussion Points
-- [Topic 1]: [Brief description]
-- [Topic 2]: [Brief description]
-...
-
-## Decisions Made
-1. [Decision with context]
-2. [Decision with context]
-...
-
-## Action Items
-| Action | Owner | Deadline |
-|--------|-------|----------|
-| [Task] | [Person/TBD] | [Date/TBD] |
-...
-
-## Follow-ups & Open Questions
-- [Question or item needing follow-up]
-...
-
-## Notable Quotes/Points
-- "[Exact quote if significant]" - regarding [topic]
-...
-
----
-
-## Transcript:
-{transcript}
-
----
-
-Please generate the meeting notes now:"""
-
-        logger.info(f"Generating summary with {self.llm_provider.name}...")
-        return self.llm_provider.generate(prompt)
+        builder = PromptBuilder(self.llm_provider.context_window, max_tokens)
+        prompt, prompt_stats = builder.build(custom_prompt or NOTES_PROMPT, transcript)
+        logger.info(f"Generating summary with {self.llm_provider.name} - "
+                    f"prompt ~{prompt_stats['prompt_tokens']} of {builder.budget} tokens")
+        notes = self.llm_provider.generate(prompt, max_tokens=max_tokens, stats=prompt_stats)
+        if stats is not None:
+            stats.update(prompt_stats)
+        return notes
 
     def process_meeting(
         self,
@@ -181,6 +314,14 @@ Please generate the meeting notes now:"""
         output_dir: str | None = None,
         language: str | None = None,
         custom_prompt: str | None = None,
+        word_timestamps: bool = False,
+        segments_json: bool = True,
+        resume: bool = False,
+        vad: bool = True,
+        diarization: bool = False,
+        num_speakers: int | None = None,
+        per_channel: bool = False,
+        search_index: str | None = None,
     ) -> dict:
         """Full pipeline: transcribe audio and generate meeting notes.
 
@@ -189,6 +330,20 @@ Please generate the meeting notes now:"""
             output_dir: Directory for output files (default: same as audio).
             language: Language code or None for auto-detect.
             custom_prompt: Optional custom summarization prompt.
+            word_timestamps: Include word-level timings in the saved segments.
+            segments_json: Also export the segments as JSON next to the binary store.
+            resume: Continue an interrupted transcription from its last checkpoint
+                and merge the new segments with the saved ones.
+            vad: Run the VAD pre-pass (saved as ``<name>_speech.json``) so Whisper
+                only decodes speech; recordings without speech are not transcribed.
+            diarization: Label speakers (CPU, in parallel with Whisper); embeddings
+                are cached as ``<name>_speaker_embeddings.npz``.
+            num_speakers: Fixed speaker count for diarization (None = detect).
+            per_channel: Treat a 2-channel WAV as separate mic/system tracks:
+                transcribe both channels in parallel and label segments local/remote.
+            search_index: Add the transcript (and notes) to the search indexes in
+                this folder (e.g. ``recordings``), see ``transcript_index.py`` and
+                ``semantic_index.py``.
 
         Returns:
             Dictionary with paths to generated files.
@@ -202,35 +357,106 @@ Please generate the meeting notes now:"""
 
         base_name = audio_path.stem
 
-        # Step 1: Transcribe
+        # Step 1: Transcribe, streaming segments to disk as they are decoded
         logger.info("STEP 1: Transcription")
 
-        transcript_data = self.transcribe(str(audio_path), language)
+        writer = StreamingTranscriptWriter(output_dir, prefix=f"{base_name}_", resume=resume)
+        start_offset = writer.last_end
+        decoded = DecodedAudio.open(audio_path, cache_dir=output_dir)
+        speech_map = None
+        if vad:
+            speech_map = SpeechMap.for_audio(decoded.samples, output_dir, filename=f"{base_name}_speech.json")
+
+        diarization_pool = diarization_future = None
+        if diarization:
+            diarization_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="diarize")
+            diarization_future = diarization_pool.submit(
+                diarize, decoded.samples, speech_map, output_dir,
+                {"num_speakers": num_speakers}, f"{base_name}_speaker_embeddings.npz",
+            )
 
-        # Save transcript
+        language = language or writer.meta.get("language")
+        channels = []
+        try:
+            if speech_map is not None and not len(speech_map.intervals):
+                logger.warning("No speech detected - skipping transcription")
+            else:
+                if per_channel:
+                    segments, info, channels = self.transcribe_channels(
+                        audio_path, output_dir, language, word_timestamps, start_offset, vad
+                    )
+                else:
+                    segments, info = self.transcribe_stream(
+                        decoded, language, word_timestamps, start_offset, speech_map=speech_map
+                    )
+                if info is not None:
+                    language = writer.meta["language"] = info.language
+                for seg_data in segments:
+                    writer.write(seg_data)
+        finally:
+            writer.close()
+
+        speakers = None
+        if diarization_future is not None:
+            speakers = diarization_future.result()
+            diarization_pool.shutdown()
+
+        duration = decoded.duration
+        header = (
+            "Meeting Transcript\n"
+            f"Audio: {audio_path.name}\n"
+            f"Duration: {self._format_time(duration)}\n"
+            f"Language: {language}\n"
+            f"Processed: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n"
+            + "=" * 60 + "\n\n"
+        )
         transcript_file = output_dir / f"{base_name}_transcript.txt"
-        with open(transcript_file, 'w', encoding='utf-8') as f:
-            f.write("Meeting Transcript\n")
-            f.write(f"Audio: {audio_path.name}\n")
-            f.write(f"Duration: {self._format_time(transcript_data['duration'])}\n")
-            f.write(f"Language: {transcript_data['language']}\n")
-            f.write(f"Processed: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
-            f.write("=" * 60 + "\n\n")
-            f.write(transcript_data['text'])
+        segments_file = output_dir / f"{base_name}_segments.segs"
+        segments_json_file = output_dir / f"{base_name}_segments.json" if segments_json else None
+        store = writer.finalize(
+            transcript_file,
+            segments_file,
+            segments_json_file,
+            header=header,
+            meta={"language": language, "duration": duration},
+            annotate=speakers.annotate if speakers else None,
+        )
+        if search_index and len(store):
+            with TranscriptIndex(Path(search_index)) as index:
+                index.add_meeting(segments_file, store, base_name)
+            logger.info(f"Transcript added to the search index in {search_index}")
 
         logger.info(f"Transcript saved: {transcript_file}")
-
-        # Save segments with timestamps (JSON)
-        segments_file = output_dir / f"{base_name}_segments.json"
-        with open(segments_file, 'w', encoding='utf-8') as f:
-            json.dump(transcript_data['segments'], f, indent=2)
-
         logger.info(f"Segments saved: {segments_file}")
+        if segments_json_file:
+            logger.info(f"Segments JSON saved: {segments_json_file}")
+
+        # All audio stages are done; drop the float32 decode caches
+        decoded.remove()
+        for channel_audio in channels:
+            channel_audio.remove()
+
+        if not writer.word_count:
+            logger.warning("Transcript is empty - skipping summarization")
+            return {
+                "transcript_file": str(transcript_file),
+                "segments_file": str(segments_file),
+                "segments_json_file": str(segments_json_file) if segments_json_file else None,
+                "notes_file": None,
+                "duration": duration,
+                "word_count": 0,
+            }
+
+        # The prompt gets the transcript without fillers, stutters and "Yeah." turns
+        compressed, _ = compress_segments(store)
+        prompt_transcript = transcript_text(compressed) or transcript_text(store)
+        logger.info(f"Transcript compressed for the prompt: {len(store)} -> {len(compressed)} segments")
 
         # Step 2: Summarize
         logger.info("STEP 2: Summarization")
 
-        summary = self.summarize(transcript_data['text'], custom_prompt)
+        prompt_stats = {}
+        summary = self.summarize(prompt_transcript, custom_prompt, stats=prompt_stats)
 
         # Save meeting notes
         notes_file = output_dir / f"{base_name}_notes.md"
@@ -241,18 +467,26 @@ Please generate the meeting notes now:"""
 
         logger.info(f"Meeting notes saved: {notes_file}")
 
+        if search_index:
+            passages = passages_from_segments(store) + passages_from_mom(summary)
+            with SemanticIndex(Path(search_index)) as index:
+                index.add_meeting(meeting_key(output_dir, base_name), passages, base_name)
+            logger.info(f"Transcript and notes added to the semantic index in {search_index}")
+
         # Summary stats
         logger.info(
-            f"Processing complete - Duration: {self._format_time(transcript_data['duration'])}, "
-            f"Words: {len(transcript_data['text'].split())}"
+            f"Processing complete - Duration: {self._format_time(duration)}, "
+            f"Words: {writer.word_count}"
         )
 
         return {
             "transcript_file": str(transcript_file),
             "segments_file": str(segments_file),
+            "segments_json_file": str(segments_json_file) if segments_json_file else None,
             "notes_file": str(notes_file),
-            "duration": transcript_data['duration'],
-            "word_count": len(transcript_data['text'].split()),
+            "duration": duration,
+            "word_count": writer.word_count,
+            "prompt_stats": prompt_stats,
         }
 
 
@@ -263,7 +497,7 @@ def main() -> None:
     )
     parser.add_argument(
         "audio",
-        help="Path to audio file (WAV, MP3, etc.)",
+        help="Path to audio file (WAV, MP3, etc.) or a chunked recording's chunks.json",
     )
     parser.add_argument(
         "-o", "--output",
@@ -286,6 +520,13 @@ def main() -> None:
         default="llama3.1:8b",
         help="Ollama model name (default: llama3.1:8b)",
     )
+    parser.add_argument(
+        "--context-window",
+        type=int,
+        default=16384,
+        help="Ollama context window in tokens, prompt + notes; about an hour of transcript fits, "
+             "longer transcripts are compressed and then cut to fit (default: 16384)",
+    )
     parser.add_argument(
         "--openai-model",
         default="gpt-4o-mini",
@@ -300,6 +541,51 @@ def main() -> None:
         action="store_true",
         help="Use CPU instead of GPU",
     )
+    parser.add_argument(
+        "--word-timestamps",
+        action="store_true",
+        help="Include word-level timestamps in the saved segments (slower transcription)",
+    )
+    parser.add_argument(
+        "--no-segments-json",
+        action="store_true",
+        help="Only write the binary segment store, skip the segments JSON export",
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Resume an interrupted transcription from its last checkpoint",
+    )
+    parser.add_argument(
+        "--no-vad",
+        action="store_true",
+        help="Skip the VAD pre-pass and let Whisper decode the whole recording",
+    )
+    parser.add_argument(
+        "--diarize",
+        action="store_true",
+        help="Label speakers in the transcript (CPU, runs alongside Whisper)",
+    )
+    parser.add_argument(
+        "--num-speakers",
+        type=int,
+        help="Number of speakers for --diarize (default: detect)",
+    )
+    parser.add_argument(
+        "--per-channel",
+        action="store_true",
+        help="Input is a 2-channel mic/system recording: transcribe each channel in parallel",
+    )
+    parser.add_argument(
+        "--export",
+        metavar="OUT",
+        help="Join a chunked recording (chunks.json) into one WAV/FLAC/Opus file and exit",
+    )
+    parser.add_argument(
+        "--index",
+        metavar="DIR",
+        help="Add the transcript to the search indexes in DIR (e.g. recordings); see transcript_index.py and semantic_index.py",
+    )
     parser.add_argument(
         "--transcript-only",
         action="store_true",
@@ -308,6 +594,10 @@ def main() -> None:
 
     args = parser.parse_args()
 
+    if args.export:
+        logger.info(f"Exported: {concat_chunks(args.audio, args.export)}")
+        return
+
     device = "cpu" if args.cpu else "cuda"
     compute_type = "float32" if args.cpu else "float16"
 
@@ -319,23 +609,38 @@ def main() -> None:
             logger.error("OPENAI_API_KEY environment variable not set. Cannot use OpenAI provider.")
             return
     else:
-        llm_provider = OllamaProvider(model=args.ollama_model, url="http://localhost:11434/api/generate")
+        llm_provider = OllamaProvider(
+            model=args.ollama_model,
+            url="http://localhost:11434/api/generate",
+            context_window=args.context_window,
+        )
 
     processor = MeetingProcessor(
         whisper_model=args.whisper_model,
         device=device,
         compute_type=compute_type,
         llm_provider=llm_provider,
+        num_workers=2 if args.per_channel else 1,
     )
 
     if args.transcript_only:
-        transcript_data = processor.transcribe(args.audio, args.language)
+        transcript_data = processor.transcribe(
+            args.audio, args.language, args.word_timestamps, vad=not args.no_vad
+        )
         logger.info(f"Transcript:\n{transcript_data['text']}")
     else:
         processor.process_meeting(
             args.audio,
             output_dir=args.output,
             language=args.language,
+            word_timestamps=args.word_timestamps,
+            segments_json=not args.no_segments_json,
+            resume=args.resume,
+            vad=not args.no_vad,
+            diarization=args.diarize,
+            num_speakers=args.num_speakers,
+            per_channel=args.per_channel,
+            search_index=args.index,
         )
 
 
@@ -0,0 +1,143 @@
+"""
+Prompt Builder.
+
+Fills a prompt template with a transcript so that the prompt and the response
+fit the model's context window. Ollama silently drops the start of a prompt
+longer than ``num_ctx`` - the instructions - and a long prompt is slow to
+evaluate, so prompts are sized before they are sent. Tokens are estimated
+(about 4 characters each, with a margin for names and numbers). Fillers,
+stutters and acknowledgement turns are removed before, once, by
+``transcript_compression``; a transcript still over the budget is ``cut``: the
+start and the end of the meeting are kept and the middle is replaced with a
+marker (logged as a warning).
+
+Templates keep everything that changes per meeting - the meeting details, the
+previous meetings context and the transcript - after their static part, so the
+provider can reuse the prefix it evaluated for the last prompt of the same
+template. The estimated sizes, including that static prefix, are returned as
+stats, which the provider completes with the prompt tokens it actually counted.
+"""
+
+import os
+import re
+
+from loguru import logger
+
+CHARS_PER_TOKEN = 4           # Rough English average, for budgeting before the provider tokenizes
+PROMPT_MARGIN = 0.1           # Share of the budget kept spare for estimation error
+PROMPT_STATS_FILE = "prompt_stats.json"
+
+TRANSCRIPT_PLACEHOLDER = "{transcript}"
+
+_TRANSCRIPT_HEADING_RE = re.compile(r"(?:^---[ \t]*\n\s*)?^## Transcript:", re.MULTILINE)
+
+
+def estimate_tokens(text: str) -> int:
+    """Approximate token count of ``text``."""
+    return len(text) // CHARS_PER_TOKEN + 1
+
+
+class PromptBuilder:
+    """Sizes prompts for one model, whose ``context_window`` tokens hold the prompt and the response."""
+
+    def __init__(self, context_window: int, max_tokens: int) -> None:
+        """
+        Args:
+            context_window: Model context in tokens (Ollama ``num_ctx``).
+            max_tokens: Tokens reserved for the response.
+        """
+        self.context_window = context_window
+        self.max_tokens = max_tokens
+        self.budget = int((context_window - max_tokens) * (1 - PROMPT_MARGIN))
+
+    def build(self, template: str, transcript: str, context: str = "", instructions: str = "",
+              **fields: str) -> tuple[str, dict]:
+        """Fill ``template`` within the prompt budget.
+
+        Args:
+            template: Prompt with a ``{transcript}`` placeholder and optionally
+                other ``{name}`` placeholders filled from ``fields``.
+            transcript: Transcript text (already compressed), cut if it does not fit.
+            context: Section put before the "## Transcript:" heading (e.g. the
+                previous meetings context).
+            instructions: Extra instructions put before the closing line of
+                the template (e.g. the brief-summary instruction).
+            **fields: Values of the other placeholders (date, duration, ...).
+
+        Returns:
+            Tuple of (prompt, stats) - stats holds the budget, the estimated
+            template / transcript / prompt tokens, the compression steps
+            applied (``["cut"]`` or none) and the tokens of the static prefix (the start of the
+            template the prompt shares with every other prompt built from it).
+        """
+        head, placeholder, tail = template.partition(TRANSCRIPT_PLACEHOLDER)
+        for name, value in fields.items():
+            head = head.replace(f"{{{name}}}", value)
+            tail = tail.replace(f"{{{name}}}", value)
+        if context:
+            head = _insert_context(head, context)
+        if instructions:
+            tail = _insert_instructions(tail, instructions)
+
+        template_tokens = estimate_tokens(head + tail)
+        stats = {
+            "context_window": self.context_window,
+            "max_tokens": self.max_tokens,
+            "budget": self.budget,
+            "template_tokens": template_tokens,
+            "transcript_tokens": estimate_tokens(transcript) if placeholder else 0,
+            "compression": [],
+        }
+        if not placeholder:
+            transcript = ""
+        available = self.budget - template_tokens
+        if estimate_tokens(transcript) > available:
+            words = len(transcript.split())
+            transcript = _cut_middle(transcript, max(available, 0) * CHARS_PER_TOKEN)
+            stats["compression"].append("cut")
+            logger.warning(
+                f"Transcript does not fit the {self.context_window}-token context window - kept "
+                f"{len(transcript.split())} of {words} words (raise context_window for long meetings)"
+            )
+
+        prompt = head + transcript + tail
+        stats["compressed_tokens"] = estimate_tokens(transcript) if placeholder else 0
+        stats["prompt_tokens"] = estimate_tokens(prompt)
+        stats["prefix_tokens"] = estimate_tokens(os.path.commonprefix([template, prompt]))
+        return prompt, stats
+
+
+def _insert_context(head: str, context: str) -> str:
+    """Put ``context`` before the transcript heading (the "---" rule above it included)."""
+    matches = list(_TRANSCRIPT_HEADING_RE.finditer(head))
+    if not matches:
+        return f"{head}{context}\n"
+    at = matches[-1].start()
+    return f"{head[:at]}{context}\n{head[at:]}"
+
+
+def _insert_instructions(tail: str, instructions: str) -> str:
+    """Put ``instructions`` before the closing line of the template."""
+    before, _, last = tail.rstrip().rpartition("\n")
+    if not last.strip():
+        return f"{tail}\n\n{instructions}"
+    return f"{before}\n{instructions}\n\n{last}"
+
+
+def _cut_middle(text: str, max_chars: int) -> str:
+    """Keep the start and the end of ``text`` (agenda and wrap-up), about ``max_chars`` in all."""
+    words = text.split(" ")
+    marker = "\n\n[... {} words from the middle of the meeting omitted to fit the context window ...]\n\n"
+    keep = max_chars - len(marker) - 8
+    if keep <= 0:
+        return marker.format(len(words)).strip()
+    head_end, size = 0, 0
+    while head_end < len(words) and size + len(words[head_end]) + 1 <= keep // 2:
+        size += len(words[head_end]) + 1
+        head_end += 1
+    tail_start, size = len(words), 0
+    while tail_start > head_end and size + len(words[tail_start - 1]) + 1 <= keep - keep // 2:
+        size += len(words[tail_start - 1]) + 1
+        tail_start -= 1
+    omitted = tail_start - head_end
+    return " ".join(words[:head_end]) + marker.format(omitted) + " ".join(words[tail_start:])
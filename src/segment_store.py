@@ -0,0 +1,396 @@
+"""
+Compact Transcript Segment Store.
+
+Stores Whisper segments column-wise (parallel NumPy arrays plus one UTF-8 text
+blob) instead of a list of per-segment dicts, with a binary on-disk format that
+is memory-mapped on load and can be sliced by time range without parsing the
+whole file. JSON export is kept as an optional view for tools that expect it.
+"""
+
+import json
+import math
+import struct
+from array import array
+from pathlib import Path
+from typing import Iterable, Iterator
+
+import numpy as np
+
+MAGIC = b"AINTSEG1"
+FORMAT_VERSION = 1
+_ALIGN = 8
+
+# Column name -> dtype. Offsets index into the text blobs / word columns and
+# always have one more entry than the rows they describe. ``speaker`` and
+# ``channel`` (0 = local mic, 1 = remote system) are -1 for unlabeled segments,
+# ``avg_logprob`` (Whisper's decoding confidence) is NaN where unknown; all
+# three are absent from older files.
+_COLUMNS = {
+    "start": "<f8",
+    "end": "<f8",
+    "speaker": "<i2",
+    "channel": "i1",
+    "avg_logprob": "<f4",
+    "text_offsets": "<i8",
+    "word_offsets": "<i8",
+    "word_start": "<f8",
+    "word_end": "<f8",
+    "word_probability": "<f4",
+    "word_text_offsets": "<i8",
+    "text_blob": "u1",
+    "word_blob": "u1",
+}
+
+
+class Segment:
+    """A single transcript segment (lightweight, slot-based)."""
+
+    __slots__ = ("start", "end", "text", "words", "speaker", "channel", "avg_logprob")
+
+    def __init__(self, start: float, end: float, text: str, words: list[dict] | None = None,
+                 speaker: int | None = None, channel: int | None = None,
+                 avg_logprob: float | None = None) -> None:
+        self.start = start
+        self.end = end
+        self.text = text
+        self.words = words
+        self.speaker = speaker
+        self.channel = channel
+        self.avg_logprob = avg_logprob
+
+    def to_dict(self) -> dict:
+        """Return the JSON-compatible dict form used by ``segments.json``."""
+        data = {"start": self.start, "end": self.end, "text": self.text}
+        if self.speaker is not None:
+            data["speaker"] = self.speaker
+        if self.channel is not None:
+            data["channel"] = self.channel
+        if self.avg_logprob is not None:
+            data["avg_logprob"] = self.avg_logprob
+        if self.words:
+            data["words"] = self.words
+        return data
+
+    def __repr__(self) -> str:
+        return f"Segment({self.start:.2f}-{self.end:.2f}, {self.text[:40]!r})"
+
+
+class SegmentStoreBuilder:
+    """Accumulates segments into compact typed buffers while decoding."""
+
+    def __init__(self) -> None:
+        self._start = array("d")
+        self._end = array("d")
+        self._speaker = array("h")
+        self._channel = array("b")
+        self._avg_logprob = array("f")
+        self._text_offsets = array("q", [0])
+        self._word_offsets = array("q", [0])
+        self._word_start = array("d")
+        self._word_end = array("d")
+        self._word_probability = array("f")
+        self._word_text_offsets = array("q", [0])
+        self._text_blob = bytearray()
+        self._word_blob = bytearray()
+
+    def __len__(self) -> int:
+        return len(self._start)
+
+    def append(self, start: float, end: float, text: str, words: list[dict] | None = None,
+               speaker: int | None = None, channel: int | None = None, avg_logprob: float | None = None) -> None:
+        """Add one segment (and its optional word timings, speaker and channel labels, confidence)."""
+        self._start.append(start)
+        self._end.append(end)
+        self._speaker.append(-1 if speaker is None else speaker)
+        self._channel.append(-1 if channel is None else channel)
+        self._avg_logprob.append(math.nan if avg_logprob is None else avg_logprob)
+        self._text_blob += text.encode("utf-8")
+        self._text_offsets.append(len(self._text_blob))
+
+        for word in words or ():
+            self._word_start.append(word["start"])
+            self._word_end.append(word["end"])
+            self._word_probability.append(word.get("probability", 0.0))
+            self._word_blob += word["word"].encode("utf-8")
+            self._word_text_offsets.append(len(self._word_blob))
+        self._word_offsets.append(len(self._word_start))
+
+    def append_dict(self, segment: dict) -> None:
+        """Add a segment given in the ``segments.json`` dict form."""
+        self.append(segment["start"], segment["end"], segment["text"], segment.get("words"),
+                    segment.get("speaker"), segment.get("channel"), segment.get("avg_logprob"))
+
+    def build(self, meta: dict | None = None) -> "SegmentStore":
+        """Freeze the buffers into a :class:`SegmentStore`.
+
+        The store shares memory with the builder, so the builder cannot be
+        appended to afterwards.
+        """
+        columns = {
+            "start": np.frombuffer(self._start, dtype=np.float64),
+            "end": np.frombuffer(self._end, dtype=np.float64),
+            "speaker": np.frombuffer(self._speaker, dtype=np.int16),
+            "channel": np.frombuffer(self._channel, dtype=np.int8),
+            "avg_logprob": np.frombuffer(self._avg_logprob, dtype=np.float32),
+            "text_offsets": np.frombuffer(self._text_offsets, dtype=np.int64),
+            "word_offsets": np.frombuffer(self._word_offsets, dtype=np.int64),
+            "word_start": np.frombuffer(self._word_start, dtype=np.float64),
+            "word_end": np.frombuffer(self._word_end, dtype=np.float64),
+            "word_probability": np.frombuffer(self._word_probability, dtype=np.float32),
+            "word_text_offsets": np.frombuffer(self._word_text_offsets, dtype=np.int64),
+            "text_blob": np.frombuffer(bytes(self._text_blob), dtype=np.uint8),
+            "word_blob": np.frombuffer(bytes(self._word_blob), dtype=np.uint8),
+        }
+        return SegmentStore(columns, meta)
+
+
+class SegmentStore:
+    """Column-oriented, optionally memory-mapped collection of transcript segments.
+
+    Segments are expected in chronological order (as Whisper yields them), which
+    lets :meth:`slice_time` use binary search instead of a scan.
+    """
+
+    def __init__(self, columns: dict[str, np.ndarray], meta: dict | None = None) -> None:
+        self._c = columns
+        self.meta = meta or {}
+
+    # ------------------------------------------------------------------
+    # Construction
+    # ------------------------------------------------------------------
+    @classmethod
+    def from_dicts(cls, segments: Iterable[dict], meta: dict | None = None) -> "SegmentStore":
+        """Build a store from ``segments.json``-style dicts."""
+        builder = SegmentStoreBuilder()
+        for segment in segments:
+            builder.append_dict(segment)
+        return builder.build(meta)
+
+    @classmethod
+    def load(cls, path: str | Path, mmap: bool = True) -> "SegmentStore":
+        """Open a store written by :meth:`save`.
+
+        Args:
+            path: Path to the ``.segs`` file.
+            mmap: Memory-map the file instead of reading it into RAM.
+
+        Returns:
+            The loaded store; with ``mmap`` its columns are views into the file.
+        """
+        path = Path(path)
+        if mmap:
+            raw = np.memmap(path, dtype=np.uint8, mode="r")
+        else:
+            raw = np.fromfile(path, dtype=np.uint8)
+
+        if bytes(raw[: len(MAGIC)]) != MAGIC:
+            raise ValueError(f"Not a segment store: {path}")
+        (header_len,) = struct.unpack_from("<I", raw, len(MAGIC))
+        header_start = len(MAGIC) + 4
+        header = json.loads(bytes(raw[header_start:header_start + header_len]).decode("utf-8"))
+        if header.get("version") != FORMAT_VERSION:
+            raise ValueError(f"Unsupported segment store version: {header.get('version')}")
+
+        data_start = _data_start(header_len)
+        columns = {}
+        for name, (dtype, offset, count) in header["columns"].items():
+            columns[name] = np.frombuffer(raw, dtype=np.dtype(dtype), count=count, offset=data_start + offset)
+        for name, missing in (("speaker", -1), ("channel", -1), ("avg_logprob", np.nan)):
+            if name not in columns:
+                columns[name] = np.full(columns["start"].size, missing, dtype=np.dtype(_COLUMNS[name]))
+        return cls(columns, header.get("meta"))
+
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+    def save(self, path: str | Path) -> Path:
+        """Write the store in the binary columnar format.
+
+        Layout: magic, uint32 header length, JSON header (column dtype, offset
+        relative to the data section, and element count, plus metadata), then
+        each column as raw little-endian data, 8-byte aligned.
+        """
+        path = Path(path)
+        columns = self._compacted()
+
+        layout, pos = {}, 0
+        for name, col in columns.items():
+            layout[name] = [col.dtype.str, pos, int(col.size)]
+            pos += col.nbytes
+            pos += -pos % _ALIGN
+        header = json.dumps({"version": FORMAT_VERSION, "meta": self.meta, "columns": layout}).encode("utf-8")
+        data_start = _data_start(len(header))
+
+        tmp_path = path.with_suffix(path.suffix + ".tmp")
+        with open(tmp_path, "wb") as f:
+            f.write(MAGIC)
+            f.write(struct.pack("<I", len(header)))
+            f.write(header)
+            for name, col in columns.items():
+                f.seek(data_start + layout[name][1])
+                f.write(col.tobytes())
+            f.truncate(data_start + pos)
+        tmp_path.replace(path)
+        return path
+
+    def _compacted(self) -> dict[str, np.ndarray]:
+        """Return the columns rebased to start at zero (drops data outside a slice)."""
+        c = self._c
+        n = len(self)
+        t0, t1 = int(c["text_offsets"][0]), int(c["text_offsets"][n])
+        w0, w1 = int(c["word_offsets"][0]), int(c["word_offsets"][n])
+        b0, b1 = int(c["word_text_offsets"][w0]), int(c["word_text_offsets"][w1])
+        columns = {
+            "start": c["start"],
+            "end": c["end"],
+            "speaker": c["speaker"],
+            "channel": c["channel"],
+            "avg_logprob": c["avg_logprob"],
+            "text_offsets": c["text_offsets"] - t0,
+            "word_offsets": c["word_offsets"] - w0,
+            "word_start": c["word_start"][w0:w1],
+            "word_end": c["word_end"][w0:w1],
+            "word_probability": c["word_probability"][w0:w1],
+            "word_text_offsets": c["word_text_offsets"][w0:w1 + 1] - b0,
+            "text_blob": c["text_blob"][t0:t1],
+            "word_blob": c["word_blob"][b0:b1],
+        }
+        return {name: np.ascontiguousarray(columns[name], dtype=dtype) for name, dtype in _COLUMNS.items()}
+
+    def write_json(self, path: str | Path, indent: int | None = 2) -> Path:
+        """Export the ``segments.json`` view, writing one segment at a time."""
+        path = Path(path)
+        pad = "\n" + " " * indent if indent else ""
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("[")
+            for i in range(len(self)):
+                f.write("," if i else "")
+                f.write(pad)
+                f.write(json.dumps(self[i].to_dict()))
+            f.write("\n]" if indent and len(self) else "]")
+        return path
+
+    # ------------------------------------------------------------------
+    # Access
+    # ------------------------------------------------------------------
+    def __len__(self) -> int:
+        return int(self._c["start"].size)
+
+    def __getitem__(self, i: int) -> Segment:
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError(i)
+        speaker, channel = int(self._c["speaker"][i]), int(self._c["channel"][i])
+        avg_logprob = float(self._c["avg_logprob"][i])
+        return Segment(float(self._c["start"][i]), float(self._c["end"][i]), self.text(i), self.words(i),
+                       speaker if speaker >= 0 else None, channel if channel >= 0 else None,
+                       None if math.isnan(avg_logprob) else round(avg_logprob, 4))
+
+    def __iter__(self) -> Iterator[Segment]:
+        for i in range(len(self)):
+            yield self[i]
+
+    @property
+    def starts(self) -> np.ndarray:
+        return self._c["start"]
+
+    @property
+    def ends(self) -> np.ndarray:
+        return self._c["end"]
+
+    @property
+    def speakers(self) -> np.ndarray:
+        """Per-segment speaker labels (-1 where unlabeled)."""
+        return self._c["speaker"]
+
+    @property
+    def channels(self) -> np.ndarray:
+        """Per-segment channel labels (0 = local mic, 1 = remote system, -1 unlabeled)."""
+        return self._c["channel"]
+
+    @property
+    def avg_logprobs(self) -> np.ndarray:
+        """Per-segment Whisper average log-probability (NaN where unknown)."""
+        return self._c["avg_logprob"]
+
+    @property
+    def has_speakers(self) -> bool:
+        """Whether any segment carries a speaker or channel label."""
+        return bool(len(self) and ((self._c["speaker"] >= 0).any() or (self._c["channel"] >= 0).any()))
+
+    @property
+    def word_count(self) -> int:
+        offsets = self._c["word_offsets"]
+        return int(offsets[-1] - offsets[0])
+
+    def text(self, i: int) -> str:
+        """Decode the text of segment ``i``."""
+        offsets = self._c["text_offsets"]
+        return bytes(self._c["text_blob"][offsets[i]:offsets[i + 1]]).decode("utf-8")
+
+    def words(self, i: int) -> list[dict] | None:
+        """Return the word timings of segment ``i`` (None if not recorded)."""
+        w0, w1 = int(self._c["word_offsets"][i]), int(self._c["word_offsets"][i + 1])
+        if w0 == w1:
+            return None
+        starts, ends = self._c["word_start"], self._c["word_end"]
+        probs, offsets, blob = self._c["word_probability"], self._c["word_text_offsets"], self._c["word_blob"]
+        return [
+            {
+                "start": float(starts[w]),
+                "end": float(ends[w]),
+                "word": bytes(blob[offsets[w]:offsets[w + 1]]).decode("utf-8"),
+                "probability": float(probs[w]),
+            }
+            for w in range(w0, w1)
+        ]
+
+    def full_text(self, sep: str = " ") -> str:
+        """Join all segment texts."""
+        return sep.join(self.text(i) for i in range(len(self)))
+
+    def turns(self) -> Iterator[tuple[int, int, float, float, str]]:
+        """Yield ``(speaker, channel, start, end, text)`` for runs of segments with the same labels."""
+        speakers, channels = self._c["speaker"], self._c["channel"]
+        i, n = 0, len(self)
+        while i < n:
+            j = i + 1
+            while j < n and speakers[j] == speakers[i] and channels[j] == channels[i]:
+                j += 1
+            text = " ".join(t for t in (self.text(k) for k in range(i, j)) if t)
+            yield int(speakers[i]), int(channels[i]), float(self._c["start"][i]), float(self._c["end"][j - 1]), text
+            i = j
+
+    def to_dicts(self) -> list[dict]:
+        """Materialize the list-of-dicts view (small stores / compatibility)."""
+        return [segment.to_dict() for segment in self]
+
+    def slice_time(self, start: float, end: float) -> "SegmentStore":
+        """Return the segments overlapping ``[start, end)`` as a store of views.
+
+        Only the two binary searches touch the time columns; text and word data
+        stay in the (possibly memory-mapped) blobs until accessed.
+        """
+        lo = int(np.searchsorted(self._c["end"], start, side="right"))
+        hi = int(np.searchsorted(self._c["start"], end, side="left"))
+        return self._rows(lo, max(lo, hi))
+
+    def _rows(self, lo: int, hi: int) -> "SegmentStore":
+        """Return rows ``[lo, hi)`` as a new store sharing the underlying buffers.
+
+        Offset columns keep pointing into the full text/word buffers, so only the
+        per-segment columns need slicing.
+        """
+        columns = dict(self._c)
+        for name in ("start", "end", "speaker", "channel", "avg_logprob"):
+            columns[name] = self._c[name][lo:hi]
+        for name in ("text_offsets", "word_offsets"):
+            columns[name] = self._c[name][lo:hi + 1]
+        return SegmentStore(columns, self.meta)
+
+
+def _data_start(header_len: int) -> int:
+    """Offset of the (aligned) column data section for a given header size."""
+    pos = len(MAGIC) + 4 + header_len
+    return pos + (-pos % _ALIGN)
@@ -0,0 +1,642 @@
+"""
+Semantic Meeting Index.
+
+Finds past discussions by meaning rather than exact words ("pricing decision for
+the Q3 launch" also finds "we agreed to keep the launch price at $49"). Transcript
+passages (consecutive segments merged to ~60 words, with start/end times), MoM
+sections and action items are embedded with a small CPU model and stored under
+``recordings/semantic_index/``:
+
+- ``vectors.f32`` - append-only, memory-mapped matrix of L2-normalised embeddings
+- ``lists.i32`` - the inverted-file (IVF) list of every row; searches score only
+  the rows in the lists whose centroids are closest to the query
+- ``kinds.u8`` - transcript / MoM / action per row, so filtered searches mask
+  scores before ranking
+- ``ivf.npz`` - spherical k-means centroids (retrained as the index grows) and
+  ``ivf.f32``, a copy of the vectors ordered by list so each probed list is one
+  contiguous read
+- ``passages.sqlite`` - meeting, kind, times and text per row
+
+Adding a meeting appends its rows and assigns them to the nearest centroid, so
+updates are incremental; re-indexing a meeting tombstones its old rows. The
+list-ordered copy is rewritten once a quarter of the rows are newer than it.
+
+The embedding model is ``sentence-transformers`` (``all-MiniLM-L6-v2`` by
+default, optional). Without it a NumPy feature-hashing embedder is used - it
+matches shared words rather than meaning, but needs no download.
+
+Usage:
+    python src/semantic_index.py search "pricing decision for the Q3 launch"
+    python src/semantic_index.py reindex
+"""
+
+import argparse
+import hashlib
+import json
+import math
+import re
+import sqlite3
+import time
+from collections import Counter
+from pathlib import Path
+
+import numpy as np
+from loguru import logger
+
+from action_index import parse_action_file
+from segment_store import SegmentStore
+from transcript_index import format_time
+
+INDEX_DIR = "semantic_index"
+VECTORS_FILE = "vectors.f32"
+LISTS_FILE = "lists.i32"
+KINDS_FILE = "kinds.u8"
+IVF_FILE = "ivf.npz"
+GROUPED_FILE = "ivf.f32"
+META_FILE = "passages.sqlite"
+
+DEFAULT_MODEL = "all-MiniLM-L6-v2"
+HASHING_MODEL = "hashing-1024"
+
+PASSAGE_WORDS = 60        # Segments are merged into passages of about this many words...
+PASSAGE_SECONDS = 45.0    # ...spanning at most this long
+MOM_SECTION_CHARS = 2000  # MoM sections are cut to this length before embedding
+
+KINDS = ("transcript", "mom", "action")  # Stored per row as its index, so searches filter before ranking
+
+UNASSIGNED = -1   # Row added before the first training (scanned on every search)
+DELETED = -2      # Tombstoned row
+
+_MIN_TRAIN_ROWS = 20_000  # Exact search below this (a few ms); IVF above
+_RETRAIN_FACTOR = 4       # Retrain once the index is this many times its last training size
+_REGROUP_FRACTION = 0.25  # Rewrite the list-ordered vectors once this share of rows is newer
+_TRAIN_SAMPLE = 32_768
+_KMEANS_ITERATIONS = 10
+_ASSIGN_BATCH = 16_384
+
+_WORD_RE = re.compile(r"\w+", re.UNICODE)
+_STOPWORDS = frozenset(
+    "a an and are as at be but by for from has have i if in is it its of on or so that the their them "
+    "they this to um uh was we were what will with you your yeah okay just like".split()
+)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+CREATE TABLE IF NOT EXISTS passages (
+    id INTEGER PRIMARY KEY,
+    meeting TEXT NOT NULL,
+    title TEXT,
+    kind TEXT NOT NULL,
+    start REAL,
+    end REAL,
+    text TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS passages_meeting ON passages(meeting);
+"""
+
+
+# ============================================================
+# Embedders
+# ============================================================
+class HashingEmbedder:
+    """NumPy-only fallback: signed feature hashing of the content words."""
+
+    related = 0.2  # Cosine above which two texts share a topic (a few words in common)
+
+    def __init__(self, dim: int = 1024) -> None:
+        self.dim = dim
+        self.name = f"hashing-{dim}"
+
+    def encode(self, texts: list[str]) -> np.ndarray:
+        out = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for i, text in enumerate(texts):
+            words = [w for w in _WORD_RE.findall(text.lower()) if w not in _STOPWORDS]
+            for feature, count in Counter(words).items():
+                # blake2b rather than crc32: CRC is linear, so similar words would collide systematically
+                h = int.from_bytes(hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest(), "little")
+                weight = 1.0 + math.log(count)  # Sublinear, so a repeated word does not dominate
+                out[i, h % self.dim] += weight if h >> 63 else -weight
+        return _normalize(out)
+
+
+class SentenceTransformerEmbedder:
+    """Small sentence-transformers model on the CPU."""
+
+    related = 0.3  # Cosine above which two texts share a topic
+
+    def __init__(self, model_name: str = DEFAULT_MODEL) -> None:
+        from sentence_transformers import SentenceTransformer
+
+        self.model = SentenceTransformer(model_name, device="cpu")
+        self.name = model_name
+        self.dim = int(self.model.get_sentence_embedding_dimension())
+
+    def encode(self, texts: list[str]) -> np.ndarray:
+        vectors = self.model.encode(texts, batch_size=64, normalize_embeddings=True, convert_to_numpy=True)
+        return np.ascontiguousarray(vectors, dtype=np.float32)
+
+
+def get_embedder(model_name: str = DEFAULT_MODEL):
+    """The embedder for ``model_name``, falling back to hashing without sentence-transformers."""
+    if model_name.startswith("hashing-"):
+        return HashingEmbedder(int(model_name.split("-", 1)[1]))
+    try:
+        return SentenceTransformerEmbedder(model_name)
+    except ImportError:
+        logger.warning(f"sentence-transformers not installed - semantic index uses {HASHING_MODEL}, not {model_name}")
+        return HashingEmbedder()
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors / np.maximum(norms, 1e-12)
+
+
+# ============================================================
+# Passages
+# ============================================================
+def passages_from_segments(store: SegmentStore) -> list[dict]:
+    """Merge consecutive transcript segments into passages with start/end times."""
+    passages, texts, words, start = [], [], 0, None
+    for i in range(len(store)):
+        text = store.text(i).strip()
+        if not text:
+            continue
+        seg_start, seg_end = float(store.starts[i]), float(store.ends[i])
+        if start is None:
+            start = seg_start
+        texts.append(text)
+        words += len(text.split())
+        if words >= PASSAGE_WORDS or seg_end - start >= PASSAGE_SECONDS:
+            passages.append({"kind": "transcript", "start": start, "end": seg_end, "text": " ".join(texts)})
+            texts, words, start = [], 0, None
+    if texts:
+        passages.append({"kind": "transcript", "start": start, "end": float(store.ends[len(store) - 1]),
+                         "text": " ".join(texts)})
+    return passages
+
+
+def passages_from_mom(mom_content: str) -> list[dict]:
+    """One passage per MoM section (``## Decisions Made`` ...), headed by its title.
+
+    The section's lines are kept (one item per line), so callers can split it again.
+    """
+    passages, heading, lines = [], "", []
+
+    def flush() -> None:
+        body = "\n".join(
+            line.strip().lstrip("-*").strip() for line in lines
+            if line.strip() and not line.strip().startswith("|-")
+        )
+        if body and body.lower() not in ("none discussed", "none discussed."):
+            text = f"{heading}: {body}" if heading else body
+            passages.append({"kind": "mom", "start": None, "end": None, "text": text[:MOM_SECTION_CHARS]})
+
+    for line in mom_content.split("\n"):
+        if line.startswith("#"):
+            flush()
+            heading, lines = line.lstrip("#").strip(), []
+        else:
+            lines.append(line)
+    flush()
+    return passages
+
+
+def passages_from_actions(items: list[list[str]], spoken_at: dict[str, float] | None = None) -> list[dict]:
+    """One passage per action item (``[action, owner, deadline]`` lists), timed if spoken."""
+    spoken_at = spoken_at or {}
+    return [
+        {"kind": "action", "start": spoken_at.get(item[0]), "end": spoken_at.get(item[0]), "text": item[0]}
+        for item in items if item and item[0].strip()
+    ]
+
+
+# ============================================================
+# Index
+# ============================================================
+class SemanticIndex:
+    """Memory-mapped embedding matrix with an IVF nearest-neighbour index."""
+
+    def __init__(self, path: str | Path, embedder=None, model_name: str = DEFAULT_MODEL) -> None:
+        """Open (creating if needed) the index.
+
+        Args:
+            path: The recordings folder (the index lives in ``semantic_index/``)
+                or the index folder itself.
+            embedder: Embedder to use; by default the one the index was built
+                with, else ``model_name``.
+            model_name: Model for a new index.
+
+        Raises:
+            ValueError: ``embedder`` is not the model the index was built with
+                (run ``reindex`` to rebuild it).
+        """
+        folder = Path(path)
+        if folder.name != INDEX_DIR:
+            folder = folder / INDEX_DIR
+        folder.mkdir(parents=True, exist_ok=True)
+        self.folder = folder
+        self.conn = sqlite3.connect(folder / META_FILE, timeout=30)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript(_SCHEMA)
+        meta = dict(self.conn.execute("SELECT key, value FROM meta").fetchall())
+
+        self.embedder = embedder or get_embedder(meta.get("model", model_name))
+        if meta.get("model") not in (None, self.embedder.name):
+            raise ValueError(
+                f"Semantic index was built with {meta['model']}, not {self.embedder.name} - "
+                "rebuild it with: python src/semantic_index.py reindex"
+            )
+        self.dim = self.embedder.dim
+        self.trained_on = int(meta.get("trained_on", 0))
+        if "model" not in meta:
+            self._set_meta(model=self.embedder.name, dim=self.dim)
+            logger.info(f"New semantic index in {folder}, built with {self.embedder.name} ({self.dim}-d)")
+
+        self.vectors_path = folder / VECTORS_FILE
+        self.lists_path = folder / LISTS_FILE
+        self.kinds_path = folder / KINDS_FILE
+        self.count = self._reconcile()
+        self._load_ivf()
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def __enter__(self) -> "SemanticIndex":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def _set_meta(self, **values) -> None:
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)",
+                [(key, str(value)) for key, value in values.items()],
+            )
+
+    def _reconcile(self) -> int:
+        """Trim the row files to the rows all of them hold (after a crash mid-append)."""
+        row_bytes = 4 * self.dim
+        vectors = self.vectors_path.stat().st_size // row_bytes if self.vectors_path.exists() else 0
+        lists = self.lists_path.stat().st_size // 4 if self.lists_path.exists() else 0
+        if not self.kinds_path.exists():
+            # Index built before kinds were stored: recover them from the passage table
+            kinds = np.zeros(min(vectors, lists), dtype=np.uint8)
+            for row, kind in self.conn.execute("SELECT id, kind FROM passages WHERE id < ?", (len(kinds),)):
+                kinds[row] = KINDS.index(kind)
+            kinds.tofile(self.kinds_path)
+        count = min(vectors, lists, self.kinds_path.stat().st_size)
+        sizes = ((self.vectors_path, count * row_bytes), (self.lists_path, count * 4), (self.kinds_path, count))
+        for path, size in sizes:
+            if path.exists() and path.stat().st_size != size:
+                with open(path, "r+b") as f:
+                    f.truncate(size)
+        return count
+
+    def _vectors(self) -> np.ndarray:
+        if not self.count:
+            return np.zeros((0, self.dim), dtype=np.float32)
+        return np.memmap(self.vectors_path, dtype=np.float32, mode="r", shape=(self.count, self.dim))
+
+    def _lists(self, mode: str = "r") -> np.ndarray:
+        if not self.count:
+            return np.zeros(0, dtype=np.int32)
+        return np.memmap(self.lists_path, dtype=np.int32, mode=mode, shape=(self.count,))
+
+    def _kinds(self) -> np.ndarray:
+        if not self.count:
+            return np.zeros(0, dtype=np.uint8)
+        return np.memmap(self.kinds_path, dtype=np.uint8, mode="r", shape=(self.count,))
+
+    def _load_ivf(self) -> None:
+        """Centroids plus the list-ordered copy of the vectors, if it matches its row map."""
+        self.centroids, self._grouped, self._grouped_rows, self._offsets = None, None, None, None
+        self.grouped_upto = 0
+        ivf_path, grouped_path = self.folder / IVF_FILE, self.folder / GROUPED_FILE
+        if not ivf_path.exists():
+            return
+        with np.load(ivf_path) as ivf:
+            self.centroids = ivf["centroids"]
+            rows, offsets, grouped_upto = ivf["rows"], ivf["offsets"], int(ivf["grouped_upto"])
+        if grouped_path.exists() and grouped_path.stat().st_size == len(rows) * 4 * self.dim and grouped_upto <= self.count:
+            self._grouped_rows, self._offsets, self.grouped_upto = rows, offsets, grouped_upto
+            if len(rows):
+                self._grouped = np.memmap(grouped_path, dtype=np.float32, mode="r", shape=(len(rows), self.dim))
+
+    # ------------------------------------------------------------------
+    # Updates
+    # ------------------------------------------------------------------
+    def add_meeting(self, meeting: str, passages: list[dict], title: str | None = None,
+                    vectors: np.ndarray | None = None) -> int:
+        """Embed and add one meeting's passages, replacing any it had before.
+
+        Args:
+            meeting: Meeting key (e.g. its folder name).
+            passages: Dicts with ``kind``, ``start``, ``end`` and ``text``.
+            title: Meeting title shown in results.
+            vectors: The passages' embeddings, if already computed with this
+                index's embedder.
+
+        Returns:
+            The number of passages added.
+        """
+        self.remove_meeting(meeting)
+        keep = [i for i, p in enumerate(passages) if p["text"].strip()]
+        if not keep:
+            return 0
+        passages = [passages[i] for i in keep]
+        if vectors is None:
+            vectors = self.embedder.encode([p["text"] for p in passages])
+        else:
+            vectors = np.ascontiguousarray(vectors[keep], dtype=np.float32)
+        if self.centroids is not None:
+            assigned = np.argmax(vectors @ self.centroids.T, axis=1).astype(np.int32)
+        else:
+            assigned = np.full(len(vectors), UNASSIGNED, dtype=np.int32)
+
+        first = self.count
+        with open(self.vectors_path, "ab") as f:
+            f.write(vectors.tobytes())
+        with open(self.lists_path, "ab") as f:
+            f.write(assigned.tobytes())
+        with open(self.kinds_path, "ab") as f:
+            f.write(np.array([KINDS.index(p["kind"]) for p in passages], dtype=np.uint8).tobytes())
+        with self.conn:
+            self.conn.executemany(
+                "INSERT INTO passages (id, meeting, title, kind, start, end, text) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [(first + i, meeting, title or meeting, p["kind"], p["start"], p["end"], p["text"])
+                 for i, p in enumerate(passages)],
+            )
+        self.count += len(passages)
+
+        live = self.count - self._deleted()
+        if live >= _MIN_TRAIN_ROWS and (self.centroids is None or live >= _RETRAIN_FACTOR * self.trained_on):
+            self.train()
+        elif self.centroids is not None:
+            # Rows since the last regroup are gathered one by one at query time; keep them a small share
+            grouped = 0 if self._grouped_rows is None else len(self._grouped_rows)
+            if self.count - self.grouped_upto > max(_MIN_TRAIN_ROWS, grouped * _REGROUP_FRACTION):
+                self._regroup()
+        return len(passages)
+
+    def remove_meeting(self, meeting: str) -> None:
+        rows = [row for (row,) in self.conn.execute("SELECT id FROM passages WHERE meeting = ?", (meeting,))]
+        if not rows:
+            return
+        lists = self._lists("r+")
+        lists[rows] = DELETED
+        lists.flush()
+        del lists
+        with self.conn:
+            self.conn.execute("DELETE FROM passages WHERE meeting = ?", (meeting,))
+
+    def _deleted(self) -> int:
+        return int(np.count_nonzero(self._lists() == DELETED))
+
+    def train(self) -> None:
+        """(Re)build the IVF centroids with spherical k-means and reassign every live row."""
+        started = time.perf_counter()
+        vectors, lists = self._vectors(), self._lists()
+        live = np.flatnonzero(lists != DELETED)
+        n_lists = int(np.clip(np.sqrt(len(live)), 16, 4096))
+        rng = np.random.default_rng(0)
+        sample = np.sort(rng.choice(live, size=min(len(live), _TRAIN_SAMPLE), replace=False))
+        data = np.asarray(vectors[sample])
+        centroids = data[rng.choice(len(data), size=n_lists, replace=False)].copy()
+
+        for _ in range(_KMEANS_ITERATIONS):
+            assigned = np.argmax(data @ centroids.T, axis=1)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, assigned, data)
+            counts = np.bincount(assigned, minlength=n_lists)
+            empty = counts == 0
+            sums[empty] = data[rng.choice(len(data), size=int(empty.sum()), replace=False)]
+            centroids = _normalize(sums)
+
+        lists = self._lists("r+")
+        for i in range(0, len(live), _ASSIGN_BATCH):
+            rows = live[i:i + _ASSIGN_BATCH]
+            lists[rows] = np.argmax(np.asarray(vectors[rows]) @ centroids.T, axis=1)
+        lists.flush()
+        del lists
+
+        self.centroids = centroids.astype(np.float32)
+        self.trained_on = len(live)
+        self._set_meta(trained_on=self.trained_on)
+        self._regroup()
+        logger.info(
+            f"Semantic index trained: {n_lists} lists over {len(live)} passages "
+            f"in {time.perf_counter() - started:.1f}s"
+        )
+
+    def _regroup(self) -> None:
+        """Rewrite the live vectors ordered by list, so a query reads each probed list in one slice."""
+        lists = np.asarray(self._lists())
+        rows = np.flatnonzero(lists >= 0)
+        order = rows[np.argsort(lists[rows], kind="stable")]
+        offsets = np.concatenate(([0], np.cumsum(np.bincount(lists[order], minlength=len(self.centroids)))))
+        vectors = self._vectors()
+
+        # Drop the old maps before replacing their files
+        self._grouped = None
+        grouped_tmp = self.folder / (GROUPED_FILE + ".tmp")
+        with open(grouped_tmp, "wb") as f:
+            for i in range(0, len(order), _ASSIGN_BATCH):
+                f.write(np.asarray(vectors[order[i:i + _ASSIGN_BATCH]]).tobytes())
+        grouped_tmp.replace(self.folder / GROUPED_FILE)
+        ivf_tmp = self.folder / ("tmp_" + IVF_FILE)
+        np.savez(ivf_tmp, centroids=self.centroids, rows=order, offsets=offsets, grouped_upto=self.count)
+        ivf_tmp.replace(self.folder / IVF_FILE)
+        self._load_ivf()
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+    def search(self, query: str, k: int = 10, meeting: str | None = None, nprobe: int | None = None,
+               kind: str | None = None) -> list[dict]:
+        """Passages closest in meaning to ``query``.
+
+        Args:
+            query: Free-text question or description.
+            k: Number of passages returned.
+            meeting: Only meetings whose key or title contains this (exact scoring).
+            nprobe: IVF lists scanned (default: about 1/8 of them, at least 8);
+                more is slower and closer to exact.
+            kind: Only ``"transcript"`` passages, ``"mom"`` sections or ``"action"`` items.
+
+        Returns:
+            Dicts with ``id`` (row), ``meeting``, ``title``, ``kind``, ``start``,
+            ``end``, ``text`` and ``score`` (cosine similarity), best first.
+        """
+        if not self.count:
+            return []
+        return self.search_vector(self.embedder.encode([query])[0], k, meeting, nprobe, kind)
+
+    def search_vector(self, q: np.ndarray, k: int = 10, meeting: str | None = None, nprobe: int | None = None,
+                      kind: str | None = None, exclude: str | None = None) -> list[dict]:
+        """Like :meth:`search` for an embedded query; ``exclude`` skips one meeting key."""
+        if not self.count:
+            return []
+        vectors, lists = self._vectors(), self._lists()
+        # Minutes and action items are a small share of the rows, and the centroids
+        # follow the transcript passages: while a kind is small, score every row of it
+        kind_rows = np.flatnonzero(np.asarray(self._kinds()) == KINDS.index(kind)) if kind else None
+
+        if meeting:
+            rows = np.array([row for (row,) in self.conn.execute(
+                "SELECT id FROM passages WHERE meeting LIKE ? OR title LIKE ?", (f"%{meeting}%",) * 2
+            )], dtype=np.int64)
+            scores = np.asarray(vectors[rows]) @ q if len(rows) else np.zeros(0, dtype=np.float32)
+        elif self.centroids is None:
+            rows = np.arange(self.count)
+            scores = vectors @ q
+        elif kind_rows is not None and len(kind_rows) < _MIN_TRAIN_ROWS:
+            rows = kind_rows
+            scores = np.asarray(vectors[rows]) @ q
+        else:
+            n_lists = len(self.centroids)
+            nprobe = min(n_lists, nprobe or max(8, n_lists // 8))
+            probe = np.argpartition(-(self.centroids @ q), nprobe - 1)[:nprobe]
+            parts_rows, parts_scores = [], []
+            if self._grouped is not None:
+                for c in probe:
+                    lo, hi = self._offsets[c], self._offsets[c + 1]
+                    parts_rows.append(self._grouped_rows[lo:hi])
+                    parts_scores.append(self._grouped[lo:hi] @ q)
+            # Rows added since the last regroup
+            tail = np.asarray(lists[self.grouped_upto:])
+            tail_rows = self.grouped_upto + np.flatnonzero(np.isin(tail, probe) | (tail == UNASSIGNED))
+            parts_rows.append(tail_rows)
+            parts_scores.append(np.asarray(vectors[tail_rows]) @ q)
+            rows, scores = np.concatenate(parts_rows), np.concatenate(parts_scores)
+
+        if not len(rows):
+            return []
+        # Filters mask the scores, so the top k are all eligible
+        scores[np.asarray(lists[rows]) == DELETED] = -np.inf
+        if kind:
+            scores[np.asarray(self._kinds()[rows]) != KINDS.index(kind)] = -np.inf
+        if exclude:
+            excluded = [row for (row,) in self.conn.execute("SELECT id FROM passages WHERE meeting = ?", (exclude,))]
+            scores[np.isin(rows, excluded)] = -np.inf
+        top = np.argpartition(-scores, min(k, len(scores)) - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+
+        best = {int(rows[i]): float(scores[i]) for i in top if scores[i] > 0}
+        if not best:
+            return []
+        placeholders = ",".join("?" * len(best))
+        found = {
+            row[0]: row for row in self.conn.execute(
+                f"SELECT id, meeting, title, kind, start, end, text FROM passages WHERE id IN ({placeholders})",
+                list(best),
+            )
+        }
+        return [
+            {"id": row, "meeting": found[row][1], "title": found[row][2], "kind": found[row][3],
+             "start": found[row][4], "end": found[row][5], "text": found[row][6], "score": round(score, 4)}
+            for row, score in best.items() if row in found
+        ]
+
+    def stats(self) -> dict:
+        return {
+            "model": self.embedder.name,
+            "passages": self.count - self._deleted(),
+            "rows": self.count,
+            "lists": 0 if self.centroids is None else len(self.centroids),
+            "meetings": self.conn.execute("SELECT COUNT(DISTINCT meeting) FROM passages").fetchone()[0],
+        }
+
+    # ------------------------------------------------------------------
+    # Backfill
+    # ------------------------------------------------------------------
+    def reindex(self, recordings_dir: str | Path) -> int:
+        """Index every meeting's segment store, minutes and action items; returns the number of meetings."""
+        meetings = 0
+        for segments_file in sorted(Path(recordings_dir).glob("*/*segments.segs")):
+            folder = segments_file.parent
+            actions = None
+            if segments_file.name == "segments.segs":  # Recorder: segments.segs + MoM.md + action_items.md
+                notes, key, actions = folder / "MoM.md", folder.name, folder / "action_items.md"
+            else:  # CLI: <name>_segments.segs + <name>_notes.md
+                base = segments_file.name[:-len("_segments.segs")]
+                notes, key = folder / f"{base}_notes.md", meeting_key(folder, base)
+            try:
+                passages = passages_from_segments(SegmentStore.load(segments_file))
+                if notes.exists():
+                    passages += passages_from_mom(notes.read_text(encoding="utf-8"))
+                if actions and actions.exists():
+                    _, items, _, spoken_at = parse_action_file(actions)
+                    passages += passages_from_actions(items, spoken_at)
+                self.add_meeting(key, passages)
+                meetings += 1
+            except Exception as e:
+                logger.warning(f"Skipping {segments_file}: {e}")
+        return meetings
+
+
+def meeting_key(folder: Path, base_name: str | None = None) -> str:
+    """Index key of a recording: its folder, plus the file name when a folder holds several."""
+    return f"{folder.name}/{base_name}" if base_name else folder.name
+
+
+def rebuild(recordings_dir: str | Path, model_name: str = DEFAULT_MODEL) -> SemanticIndex:
+    """Delete the index (e.g. after changing the model) and index every meeting again."""
+    folder = Path(recordings_dir) / INDEX_DIR
+    for name in (VECTORS_FILE, LISTS_FILE, KINDS_FILE, IVF_FILE, GROUPED_FILE, META_FILE, META_FILE + "-wal", META_FILE + "-shm"):
+        (folder / name).unlink(missing_ok=True)
+    index = SemanticIndex(recordings_dir, model_name=model_name)
+    index.reindex(recordings_dir)
+    return index
+
+
+def main() -> None:
+    """CLI entry point for semantic search across meetings."""
+    parser = argparse.ArgumentParser(description="Semantic search across meeting transcripts and minutes")
+    parser.add_argument(
+        "-r", "--recordings",
+        default="recordings",
+        help="Recordings folder holding the index (default: recordings)",
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    search_cmd = commands.add_parser("search", help="Find passages related to a description")
+    search_cmd.add_argument("query", help='e.g. "pricing decision for the Q3 launch"')
+    search_cmd.add_argument("--meeting", help="Meeting title or folder (substring)")
+    search_cmd.add_argument("--kind", choices=KINDS, help="Only transcript passages, MoM sections or action items")
+    search_cmd.add_argument("-n", "--limit", type=int, default=10, help="Results to show (default: 10)")
+    search_cmd.add_argument("--json", action="store_true", help="Print results as JSON")
+
+    reindex_cmd = commands.add_parser("reindex", help="Rebuild the index from every meeting folder")
+    reindex_cmd.add_argument("--model", default=DEFAULT_MODEL,
+                             help=f"Embedding model (default: {DEFAULT_MODEL}; '{HASHING_MODEL}' needs no download)")
+    commands.add_parser("stats", help="Index size and model")
+
+    args = parser.parse_args()
+    if args.command == "reindex":
+        with rebuild(args.recordings, args.model) as index:
+            stats = index.stats()
+        print(f"Indexed {stats['meetings']} meeting(s), {stats['passages']} passage(s) with {stats['model']}")
+        return
+
+    with SemanticIndex(args.recordings) as index:
+        if args.command == "stats":
+            print(json.dumps(index.stats(), indent=2))
+            return
+        started = time.perf_counter()
+        results = index.search(args.query, args.limit, args.meeting, kind=args.kind)
+        elapsed = (time.perf_counter() - started) * 1000
+        if args.json:
+            print(json.dumps(results, indent=2))
+            return
+        for hit in results:
+            text = " ".join(hit["text"].split())
+            text = text if len(text) <= 160 else text[:157] + "..."
+            where = format_time(hit["start"]) if hit["start"] is not None else {"mom": "minutes"}.get(hit["kind"], hit["kind"])
+            print(f"{hit['score']:.3f}  {hit['title']} @ {where}  {text}")
+        print(f"{len(results)} result(s) in {elapsed:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
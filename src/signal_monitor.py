@@ -0,0 +1,161 @@
+"""
+Capture Signal Monitor.
+
+Keeps running RMS/peak statistics per audio source (microphone, system loopback)
+while the recorder mixes, so a dead or silent source is flagged within seconds
+of starting a meeting instead of after Whisper has decoded the whole file. The
+final levels are saved with the recording, and a recording where no source ever
+rose above the signal threshold is not transcribed at all.
+"""
+
+import json
+import math
+import time
+from pathlib import Path
+from typing import Callable
+
+import numpy as np
+from loguru import logger
+
+LEVELS_FILE = "levels.json"
+
+# Source states reported to the callback
+OK = "ok"
+SILENT = "silent"   # Data arrives, but stays below the signal threshold
+DEAD = "dead"       # No data at all (device not delivering buffers)
+
+
+class SourceLevels:
+    """Running level statistics for one audio source."""
+
+    __slots__ = ("name", "frames", "sum_squares", "peak", "signal_frames", "last_signal", "state")
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.frames = 0
+        self.sum_squares = 0.0
+        self.peak = 0.0
+        self.signal_frames = 0
+        self.last_signal = None  # Monotonic time the source last exceeded the threshold
+        self.state = OK
+
+    @property
+    def rms(self) -> float:
+        return math.sqrt(self.sum_squares / self.frames) if self.frames else 0.0
+
+    def to_dict(self, sample_rate: int) -> dict:
+        return {
+            "state": self.state,
+            "seconds": round(self.frames / sample_rate, 2),
+            "signal_seconds": round(self.signal_frames / sample_rate, 2),
+            "rms": round(self.rms, 6),
+            "peak": round(self.peak, 6),
+        }
+
+
+class SignalMonitor:
+    """Per-source RMS/peak tracking with early silent/dead source detection."""
+
+    def __init__(
+        self,
+        sources: tuple[str, ...],
+        sample_rate: int,
+        threshold: float = 0.001,
+        detect_seconds: float = 5.0,
+        on_change: Callable[[str, str], None] | None = None,
+    ) -> None:
+        """Create a monitor for the given sources.
+
+        Args:
+            sources: Source names, e.g. ``("mic", "system")``.
+            sample_rate: Sample rate of the chunks passed to :meth:`update`.
+            threshold: Peak amplitude a chunk must exceed to count as signal.
+            detect_seconds: How long a source may stay silent or deliver nothing
+                before it is reported.
+            on_change: Called as ``on_change(source, state)`` from the mixer
+                thread whenever a source changes between ok/silent/dead.
+        """
+        self.sample_rate = sample_rate
+        self.threshold = threshold
+        self.detect_seconds = detect_seconds
+        self.on_change = on_change
+        self.sources = {name: SourceLevels(name) for name in sources}
+        self.started = time.monotonic()
+
+    def update(self, source: str, chunk: np.ndarray) -> float:
+        """Add one chunk of a source's samples and return the chunk peak."""
+        if not len(chunk):
+            return 0.0
+        peak = float(np.max(np.abs(chunk)))
+        self.add(source, len(chunk), peak, float(np.dot(chunk, chunk)))
+        return peak
+
+    def add(self, source: str, frames: int, peak: float, sum_squares: float) -> None:
+        """Add statistics the caller already measured for ``frames`` samples of a source."""
+        if not frames:
+            return
+        levels = self.sources[source]
+        levels.frames += frames
+        levels.sum_squares += sum_squares
+        levels.peak = max(levels.peak, peak)
+        if peak > self.threshold:
+            levels.signal_frames += frames
+            levels.last_signal = time.monotonic()
+
+    def check(self) -> None:
+        """Re-evaluate every source's state and report changes (call periodically)."""
+        now = time.monotonic()
+        if now - self.started < self.detect_seconds:
+            return
+        for levels in self.sources.values():
+            if not levels.frames:
+                state = DEAD
+            elif levels.last_signal is None or now - levels.last_signal >= self.detect_seconds:
+                state = SILENT
+            else:
+                state = OK
+            if state != levels.state:
+                levels.state = state
+                if state == OK:
+                    logger.info(f"Audio source '{levels.name}' has signal again")
+                else:
+                    logger.warning(f"Audio source '{levels.name}' is {state}")
+                if self.on_change:
+                    self.on_change(levels.name, state)
+
+    @property
+    def has_signal(self) -> bool:
+        """Whether any source ever rose above the threshold."""
+        return any(levels.signal_frames for levels in self.sources.values())
+
+    def summary(self) -> dict:
+        return {
+            "threshold": self.threshold,
+            "has_signal": self.has_signal,
+            "sources": {name: levels.to_dict(self.sample_rate) for name, levels in self.sources.items()},
+        }
+
+    def save(self, output_dir: str | Path, capture: dict | None = None) -> Path:
+        """Write the level summary next to the recording.
+
+        Args:
+            output_dir: The meeting folder.
+            capture: Per-source capture buffer metrics (overflows, underruns,
+                dropout timestamps) stored alongside the levels.
+        """
+        summary = self.summary()
+        if capture:
+            summary["capture"] = capture
+        path = Path(output_dir) / LEVELS_FILE
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(summary, f, indent=2)
+        return path
+
+
+def load_levels(output_dir: str | Path) -> dict | None:
+    """Read the level summary saved with a recording (None if there is none)."""
+    try:
+        with open(Path(output_dir) / LEVELS_FILE, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
@@ -0,0 +1,162 @@
+"""
+Standalone VAD Pre-pass.
+
+Runs Silero VAD (bundled with faster-whisper) once over the shared decoded audio
+and stores the speech intervals in the meeting folder. The speech map is used to
+compact the recording into a speech-only buffer for Whisper - with a remap table
+back to file time - and to spot recordings with no speech before any decoding.
+"""
+
+import json
+from pathlib import Path
+from types import SimpleNamespace
+
+import numpy as np
+from loguru import logger
+
+from decoded_audio import SAMPLE_RATE
+
+SPEECH_MAP_FILE = "speech.json"
+
+DEFAULT_VAD_PARAMS = {
+    "threshold": 0.5,
+    "min_silence_duration_ms": 500,
+    "speech_pad_ms": 200,
+}
+
+
+class SpeechMap:
+    """Speech intervals of a recording and the condensed-time remap table."""
+
+    def __init__(self, intervals: np.ndarray, duration: float, params: dict | None = None) -> None:
+        """Create a speech map.
+
+        Args:
+            intervals: ``(n, 2)`` array of speech [start, end) times in seconds, sorted.
+            duration: Total recording duration in seconds.
+            params: VAD parameters the intervals were detected with.
+        """
+        self.intervals = np.asarray(intervals, dtype=np.float64).reshape(-1, 2)
+        self.duration = duration
+        self.params = params or {}
+
+        # Remap table: where each interval starts in the condensed (speech-only) timeline
+        lengths = self.intervals[:, 1] - self.intervals[:, 0]
+        self._condensed_starts = np.concatenate(([0.0], np.cumsum(lengths)[:-1])) if len(lengths) else lengths
+
+    # ------------------------------------------------------------------
+    # Construction / persistence
+    # ------------------------------------------------------------------
+    @classmethod
+    def detect(cls, samples: np.ndarray, params: dict | None = None) -> "SpeechMap":
+        """Run Silero VAD over 16 kHz mono float32 samples."""
+        from faster_whisper.vad import VadOptions, get_speech_timestamps
+
+        params = {**DEFAULT_VAD_PARAMS, **(params or {})}
+        chunks = get_speech_timestamps(samples, VadOptions(**params))
+        intervals = np.array([[c["start"], c["end"]] for c in chunks], dtype=np.float64) / SAMPLE_RATE
+        return cls(intervals, len(samples) / SAMPLE_RATE, params)
+
+    @classmethod
+    def uncondensed(cls, start: float, duration: float) -> "SpeechMap":
+        """A map of all the audio from ``start`` as one interval: ``to_original`` just adds ``start``.
+
+        Used when Whisper reads the audio as recorded (no VAD, or no speech found).
+        """
+        return cls(np.array([[start, max(start, duration)]]), duration)
+
+    @classmethod
+    def for_audio(cls, samples: np.ndarray, output_dir: str | Path, params: dict | None = None,
+                  filename: str = SPEECH_MAP_FILE) -> "SpeechMap":
+        """Load the stored speech map for a meeting, or detect and store it once.
+
+        Args:
+            samples: Decoded audio (usually a :class:`DecodedAudio` memmap).
+            output_dir: Meeting folder holding ``speech.json``.
+            params: VAD parameters; a stored map made with other params is redone.
+            filename: Name of the speech map file.
+        """
+        path = Path(output_dir) / filename
+        params = {**DEFAULT_VAD_PARAMS, **(params or {})}
+        stored = cls.load(path)
+        if stored is not None and stored.params == params and abs(stored.duration - len(samples) / SAMPLE_RATE) < 0.01:
+            return stored
+
+        logger.info("Running VAD pre-pass...")
+        detected = cls.detect(samples, params)
+        # The intervals as stored, so this run and a later one loading them agree (e.g. on cached embeddings)
+        speech_map = cls(detected.intervals.round(3), detected.duration, detected.params)
+        speech_map.save(path)
+        logger.info(
+            f"Speech: {speech_map.speech_duration:.1f}s of {speech_map.duration:.1f}s "
+            f"({speech_map.speech_ratio:.0%}) in {len(speech_map.intervals)} intervals"
+        )
+        return speech_map
+
+    @classmethod
+    def load(cls, path: str | Path) -> "SpeechMap | None":
+        """Read a speech map written by :meth:`save` (None if missing or unreadable)."""
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+        return cls(np.array(data["intervals"], dtype=np.float64), data["duration"], data.get("params"))
+
+    def save(self, path: str | Path) -> None:
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({
+                "duration": self.duration,
+                "speech_duration": self.speech_duration,
+                "speech_ratio": self.speech_ratio,
+                "params": self.params,
+                "intervals": self.intervals.round(3).tolist(),
+            }, f, indent=2)
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+    @property
+    def speech_duration(self) -> float:
+        return float((self.intervals[:, 1] - self.intervals[:, 0]).sum())
+
+    @property
+    def speech_ratio(self) -> float:
+        return self.speech_duration / self.duration if self.duration else 0.0
+
+    def clip(self, start: float) -> "SpeechMap":
+        """Return the map restricted to speech after ``start`` seconds (for resuming)."""
+        if start <= 0:
+            return self
+        kept = self.intervals[self.intervals[:, 1] > start].copy()
+        if len(kept):
+            kept[0, 0] = max(kept[0, 0], start)
+        return SpeechMap(kept, self.duration, self.params)
+
+    def condense(self, samples: np.ndarray) -> np.ndarray:
+        """Concatenate the speech intervals of ``samples`` into one speech-only buffer."""
+        bounds = np.round(self.intervals * SAMPLE_RATE).astype(np.int64)
+        if not len(bounds):
+            return np.zeros(0, dtype=np.float32)
+        return np.concatenate([samples[s:e] for s, e in bounds]).astype(np.float32, copy=False)
+
+    def to_original(self, t: float, is_end: bool = False) -> float:
+        """Map a time in the condensed buffer back to file time.
+
+        A time exactly on the boundary between two intervals maps to the end of
+        the earlier one when ``is_end`` is set, and to the start of the later one
+        otherwise.
+        """
+        if not len(self.intervals):
+            return t
+        side = "left" if is_end else "right"
+        k = max(int(np.searchsorted(self._condensed_starts, t, side=side)) - 1, 0)
+        return float(self.intervals[k, 0] + (t - self._condensed_starts[k]))
+
+
+def no_speech_info(language: str | None) -> SimpleNamespace:
+    """Stand-in for faster-whisper's ``TranscriptionInfo`` when no speech is left to decode.
+
+    ``duration`` is what Whisper received - nothing.
+    """
+    return SimpleNamespace(language=language, language_probability=0.0, duration=0.0, duration_after_vad=0.0)
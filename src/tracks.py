@@ -0,0 +1,153 @@
+"""
+Separate Mic / System Tracks.
+
+The recorder can keep the microphone and the loopback (system) audio as the two
+channels of ``tracks.wav`` (or ``.flac``/``.ogg`` in a compressed recording
+format) next to (or instead of) the mixed mono recording. The mic channel carries the local participant, the system channel
+everyone remote, so:
+
+- per-channel energy is a cheap "local vs remote" label for every segment, and
+- Whisper can transcribe each channel on its own, in parallel, without the
+  adaptive mix attenuating overlapping speech.
+"""
+
+import heapq
+import queue
+import threading
+from pathlib import Path
+from typing import Iterator
+
+import numpy as np
+
+from audio_codec import AUDIO_SUFFIXES, StreamingEncoder, open_blocks
+from decoded_audio import SAMPLE_RATE
+
+TRACKS_FILE = "tracks.wav"
+
+# Channel order in tracks.wav
+MIC, SYSTEM = 0, 1
+CHANNEL_NAMES = {MIC: "local", SYSTEM: "remote"}
+
+_FRAME_SECONDS = 0.1       # Energy envelope resolution
+_READ_FRAMES = 1 << 20
+_DONE = object()
+
+
+def write_tracks(path: str | Path, blocks: list[np.ndarray], sample_rate: int = SAMPLE_RATE,
+                 fmt: str = "wav", opus_bitrate_kbps: int = 24) -> Path:
+    """Write interleaved int16 ``(n, 2)`` blocks as a 2-channel recording.
+
+    Returns:
+        The written file (its suffix follows ``fmt``).
+    """
+    if fmt == "wav":
+        import wave
+
+        path = Path(path).with_suffix(".wav")
+        with wave.open(str(path), "wb") as wf:
+            wf.setnchannels(2)
+            wf.setsampwidth(2)
+            wf.setframerate(sample_rate)
+            for block in blocks:
+                wf.writeframes(block.tobytes())
+        return path
+
+    encoder = StreamingEncoder(path, sample_rate, 2, fmt, opus_bitrate_kbps)
+    for block in blocks:
+        encoder.write(block)
+    encoder.close()
+    return encoder.path
+
+
+def find_tracks(folder: str | Path) -> Path | None:
+    """Return the tracks recording in a meeting folder, whatever its format."""
+    for suffix in AUDIO_SUFFIXES:
+        path = Path(folder) / f"{Path(TRACKS_FILE).stem}{suffix}"
+        if path.exists():
+            return path
+    return None
+
+
+class ChannelActivity:
+    """Per-channel RMS envelope of a tracks recording, for local/remote labels."""
+
+    def __init__(self, energy: np.ndarray, frame_seconds: float = _FRAME_SECONDS) -> None:
+        """Create from an ``(frames, channels)`` RMS envelope."""
+        self.energy = energy
+        self.frame_seconds = frame_seconds
+        # Prefix sums of squared RMS: any time range's energy in O(1)
+        self._cumulative = np.vstack([np.zeros((1, energy.shape[1])), np.cumsum(energy ** 2, axis=0)])
+
+    @classmethod
+    def from_file(cls, path: str | Path, frame_seconds: float = _FRAME_SECONDS) -> "ChannelActivity":
+        """Compute the envelope block by block from a tracks recording."""
+        opened = open_blocks(path, _READ_FRAMES)
+        if opened is None:
+            raise ValueError(f"Cannot read tracks recording: {path}")
+        rate, channels, blocks = opened
+        hop = max(1, int(rate * frame_seconds))
+
+        envelopes, carry = [], np.zeros((0, channels), dtype=np.float32)
+        for block in blocks:
+            if len(carry):
+                block = np.vstack([carry, block])
+            n = len(block) // hop * hop
+            if n:
+                frames = block[:n].reshape(-1, hop, channels)
+                envelopes.append(np.sqrt(np.einsum("fsc,fsc->fc", frames, frames) / hop))
+            carry = block[n:]
+        energy = np.vstack(envelopes) if envelopes else np.zeros((0, channels), dtype=np.float32)
+        return cls(energy, hop / rate)
+
+    def channel_at(self, start: float, end: float) -> int | None:
+        """Return the channel with the most energy in ``[start, end)`` (None if empty)."""
+        i0 = min(max(int(start / self.frame_seconds), 0), len(self.energy))
+        i1 = min(max(int(np.ceil(end / self.frame_seconds)), i0 + 1), len(self.energy))
+        if i1 <= i0:
+            return None
+        totals = self._cumulative[i1] - self._cumulative[i0]
+        if not totals.any():
+            return None
+        return int(totals.argmax())
+
+    def annotate(self, segment: dict) -> dict:
+        """Set ``segment["channel"]`` (0 = local mic, 1 = remote system) in place."""
+        if "channel" not in segment:
+            channel = self.channel_at(segment["start"], segment["end"])
+            if channel is not None:
+                segment["channel"] = channel
+        return segment
+
+
+def merge_channel_segments(streams: dict[int, Iterator[dict]]) -> Iterator[dict]:
+    """Consume per-channel segment iterators in parallel and merge them by start time.
+
+    Each iterator (a lazy Whisper decode) runs on its own thread, so the channels
+    decode concurrently; segments are tagged with their ``channel`` and yielded in
+    time order as soon as every channel has produced its next one.
+    """
+    def drain(channel: int, segments: Iterator[dict], out: queue.Queue) -> None:
+        try:
+            for segment in segments:
+                segment["channel"] = channel
+                out.put(segment)
+        except Exception as e:  # Re-raised in the consuming thread
+            out.put(e)
+        out.put(_DONE)
+
+    def receive(out: queue.Queue) -> Iterator[dict]:
+        while True:
+            item = out.get()
+            if item is _DONE:
+                return
+            if isinstance(item, Exception):
+                raise item
+            yield item
+
+    queues = []
+    for channel, segments in streams.items():
+        out = queue.Queue()
+        threading.Thread(target=drain, args=(channel, segments, out), daemon=True,
+                         name=f"transcribe-ch{channel}").start()
+        queues.append(receive(out))
+    return heapq.merge(*queues, key=lambda segment: segment["start"])
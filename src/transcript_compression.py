@@ -0,0 +1,149 @@
+"""
+Transcript Compression.
+
+Deterministic clean-up of the Whisper segments before they go into the MoM
+prompt. Spoken transcripts carry many tokens the model does not need: fillers
+("um", "uh"), stuttered and restarted words ("I I think", "we need we need"),
+acknowledgement-only segments ("Yeah.", "Right.") that split a speaker's turn
+in two, Whisper's repetition loops (the same segment text over and over) and,
+in noisy audio, low-confidence segments that are mostly hallucinated. Each step
+can be switched per meeting type (``CONFIG["compression"]``). Only the text
+given to the LLM is compressed; ``transcript.txt`` and the segments stay as
+decoded.
+"""
+
+import math
+import re
+
+from segment_store import SegmentStore, SegmentStoreBuilder
+
+DEFAULT_SETTINGS = {
+    "fillers": True,              # um, uh, er, hmm
+    "repetitions": True,          # Stutters, restarts and repeated segments
+    "merge_short": True,          # Drop acknowledgement segments, so the turns around them merge
+    "min_avg_logprob": None,      # Drop segments decoded below this confidence (e.g. -1.0)
+}
+
+_FILLER = r"(?:u+[hm]+|e+r+m*|a+h+|h+m+|m+h*m+)(?![\w'-])"
+# A filler with the commas around it ("so, um, we" -> "so we"); a sentence end after it is kept
+_FILLER_RE = re.compile(r"(?:,[ \t]*)?(?<![\w'-])" + _FILLER + r"(?:,|([.?!]))?[ \t]*", re.IGNORECASE)
+# One to three words said again right away ("I I", "we need, um, we need"); letters only, so numbers stay
+_REPEAT_RE = re.compile(
+    r"\b([a-z]+(?:'[a-z]+)?(?:\s+[a-z]+(?:'[a-z]+)?){0,2})(?:,?\s+(?:" + _FILLER + r",?\s+)?\1\b)+", re.IGNORECASE
+)
+# Words that are often doubled correctly ("he had had", "said that that", "what it is is"); kept
+# unless a comma or a filler sits between the two
+_VALID_DOUBLES = {"had", "that", "is", "was", "do", "does", "bye", "very", "so", "no", "there"}
+_SPACE_BEFORE_PUNCT_RE = re.compile(r"[ \t]+([,.?!])")
+_SPACES_RE = re.compile(r"[ \t]{2,}")
+_TRAILING_SPACES_RE = re.compile(r"[ \t]+$", re.MULTILINE)
+_NORMALIZE_RE = re.compile(r"[^\w\s]+")
+
+_ACKNOWLEDGEMENTS = {
+    "yeah", "yep", "ok", "okay", "right", "sure", "mhm", "uh-huh", "got it", "i see",
+    "alright", "all right", "cool", "great", "exactly", "thanks", "thank you",
+}
+
+
+def settings_for(config: dict, meeting_type: str) -> dict:
+    """Compression settings for ``meeting_type``: the defaults, the config's, then its ``by_type`` entry."""
+    settings = dict(DEFAULT_SETTINGS)
+    settings.update({key: config[key] for key in DEFAULT_SETTINGS if key in config})
+    settings.update(config.get("by_type", {}).get(meeting_type, {}))
+    return settings
+
+
+def remove_fillers(text: str) -> str:
+    """Drop filler words (um, uh, er, hmm)."""
+    return _clean_spacing(_FILLER_RE.sub(_drop_filler, text))
+
+
+def collapse_repeats(text: str) -> str:
+    """Collapse words and short phrases said two or more times in a row.
+
+    A word that can be doubled correctly ("had had") is only collapsed when a
+    comma or a filler separates the copies, or when it is said three times.
+    Run before :func:`remove_fillers`, which would hide that filler.
+    """
+    previous = None
+    while text != previous:  # "we we need, we need" takes two passes
+        previous, text = text, _REPEAT_RE.sub(_collapse_repeat, text)
+    return _clean_spacing(text)
+
+
+def is_acknowledgement(text: str) -> bool:
+    """Whether ``text`` only acknowledges ("Yeah.", "Okay.", "Got it!")."""
+    return text.strip(" .!,").lower() in _ACKNOWLEDGEMENTS
+
+
+def compress_segments(store: SegmentStore, fillers: bool = True, repetitions: bool = True,
+                      merge_short: bool = True, min_avg_logprob: float | None = None) -> tuple[SegmentStore, dict]:
+    """Compress the segments for the prompt (see the module docstring).
+
+    Args:
+        store: Decoded segments.
+        fillers: Remove filler words.
+        repetitions: Collapse stuttered words / phrases, and drop a segment
+            that repeats the speaker's previous one.
+        merge_short: Drop acknowledgement-only segments, so the turns of the
+            speaker on either side merge into one.
+        min_avg_logprob: Drop segments whose Whisper average log-probability
+            is below this (None keeps all; unknown confidence is kept).
+
+    Returns:
+        Tuple of (compressed store without word timings, counts of the
+        segments dropped per reason).
+    """
+    builder = SegmentStoreBuilder()
+    dropped = {"low_confidence": 0, "empty": 0, "acknowledgement": 0, "repeated": 0}
+    logprobs, speakers, channels = store.avg_logprobs, store.speakers, store.channels
+    previous = None
+    for i in range(len(store)):
+        logprob = float(logprobs[i])
+        if min_avg_logprob is not None and logprob < min_avg_logprob:
+            dropped["low_confidence"] += 1
+            continue
+        original = text = store.text(i)
+        if repetitions:
+            text = collapse_repeats(text)
+        if fillers:
+            text = remove_fillers(text)
+        text = text.strip()
+        if not text.strip(".,!?-"):
+            dropped["empty"] += 1
+            continue
+        if merge_short and is_acknowledgement(text):
+            dropped["acknowledgement"] += 1
+            continue
+        key = (int(speakers[i]), int(channels[i]), _NORMALIZE_RE.sub("", text.lower()))
+        if repetitions and key == previous:
+            dropped["repeated"] += 1
+            continue
+        previous = key
+        if original.lstrip()[:1].isupper():
+            text = text[0].upper() + text[1:]  # Sentence case again where a leading filler was removed
+        builder.append(float(store.starts[i]), float(store.ends[i]), text, None,
+                       key[0] if key[0] >= 0 else None, key[1] if key[1] >= 0 else None,
+                       None if math.isnan(logprob) else logprob)
+    return builder.build(store.meta), dropped
+
+
+def _drop_filler(match: re.Match) -> str:
+    """Replacement for a filler: a space, or the sentence end it carried if the text before has none."""
+    end = match.group(1)
+    before = match.string[:match.start()].rstrip()
+    return f"{end} " if end and before and before[-1] not in ".?!:" else " "
+
+
+def _collapse_repeat(match: re.Match) -> str:
+    """Replacement for a repeat: one copy, or the text as is for a grammatical double."""
+    unit, repeated = match.group(1), match.group(0)
+    if unit.lower() in _VALID_DOUBLES and "," not in repeated and len(repeated.split()) == 2:
+        return repeated
+    return unit
+
+
+def _clean_spacing(text: str) -> str:
+    text = _SPACE_BEFORE_PUNCT_RE.sub(r"\1", text)
+    text = _TRAILING_SPACES_RE.sub("", _SPACES_RE.sub(" ", text))
+    return text.strip(" \t")
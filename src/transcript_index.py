@@ -0,0 +1,253 @@
+"""
+Transcript Search Index.
+
+Answers "when did we discuss X?" across every meeting without grepping each
+folder: segment texts go into an SQLite FTS5 index under ``recordings/`` with
+the meeting and the segment's start/end time, so a query returns the meetings
+and the moments in them, best matches first. Plain words, ``"exact phrases"``,
+``prefix*`` terms and FTS5 operators (``AND``/``OR``/``NOT``, ``NEAR``) are
+supported.
+
+A meeting is indexed when processing finishes (or re-indexed when it is
+processed again); only its own rows change.
+
+Usage:
+    python src/transcript_index.py search "budget review"
+    python src/transcript_index.py search 'deploy* NOT staging' --meeting standup
+    python src/transcript_index.py reindex      # index every segment store under recordings/
+"""
+
+import argparse
+import re
+import sqlite3
+from datetime import date, datetime
+from pathlib import Path
+
+from loguru import logger
+
+from segment_store import SegmentStore
+
+INDEX_FILE = "transcript_index.sqlite"
+SEGMENTS_SUFFIX = "segments.segs"  # segments.segs (recorder) or <name>_segments.segs (CLI)
+
+_TOKEN_RE = re.compile(r"\w+\*?", re.UNICODE)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meetings (
+    id INTEGER PRIMARY KEY,
+    key TEXT NOT NULL UNIQUE,
+    title TEXT,
+    date TEXT,
+    path TEXT
+);
+CREATE TABLE IF NOT EXISTS segments (
+    id INTEGER PRIMARY KEY,
+    meeting_id INTEGER NOT NULL REFERENCES meetings(id) ON DELETE CASCADE,
+    start REAL NOT NULL,
+    end REAL NOT NULL,
+    speaker INTEGER,
+    text TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS segments_meeting ON segments(meeting_id);
+CREATE VIRTUAL TABLE IF NOT EXISTS segments_fts USING fts5(
+    text, content='segments', content_rowid='id', tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+);
+CREATE TRIGGER IF NOT EXISTS segments_ai AFTER INSERT ON segments BEGIN
+    INSERT INTO segments_fts(rowid, text) VALUES (new.id, new.text);
+END;
+CREATE TRIGGER IF NOT EXISTS segments_ad AFTER DELETE ON segments BEGIN
+    INSERT INTO segments_fts(segments_fts, rowid, text) VALUES ('delete', old.id, old.text);
+END;
+"""
+
+
+class TranscriptIndex:
+    """SQLite FTS5 index of transcript segments across meetings."""
+
+    def __init__(self, path: str | Path) -> None:
+        """Open (creating if needed) the index.
+
+        Args:
+            path: The index file, or the recordings folder to keep it in.
+        """
+        path = Path(path)
+        if path.suffix != ".sqlite":
+            path.mkdir(parents=True, exist_ok=True)
+            path = path / INDEX_FILE
+        self.path = path
+        self.conn = sqlite3.connect(path, timeout=30)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("PRAGMA foreign_keys=ON")
+        self.conn.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def __enter__(self) -> "TranscriptIndex":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    # ------------------------------------------------------------------
+    # Updates
+    # ------------------------------------------------------------------
+    def add_meeting(self, segments_file: str | Path, store: SegmentStore | None = None,
+                    title: str | None = None, meeting_date: date | None = None) -> int:
+        """Index (or re-index) one meeting's segments.
+
+        Args:
+            segments_file: The meeting's segment store; its path identifies the
+                meeting (a folder can hold several ``<name>_segments.segs``).
+            store: The already-loaded store (default: load ``segments_file``).
+            title: Meeting title (default: the folder name).
+            meeting_date: Meeting date (default: today).
+
+        Returns:
+            The number of segments indexed.
+        """
+        segments_file = Path(segments_file)
+        store = store if store is not None else SegmentStore.load(segments_file)
+        key = _meeting_key(segments_file)
+        title = title or segments_file.parent.name
+        meeting_date = (meeting_date or date.today()).isoformat()
+
+        speakers = store.speakers
+        rows = (
+            (float(store.starts[i]), float(store.ends[i]), int(speakers[i]) if speakers[i] >= 0 else None, store.text(i))
+            for i in range(len(store))
+        )
+        with self.conn:
+            # Re-indexing replaces the meeting's rows; the triggers keep the FTS table in sync
+            self.conn.execute("DELETE FROM meetings WHERE key = ?", (key,))
+            meeting_id = self.conn.execute(
+                "INSERT INTO meetings (key, title, date, path) VALUES (?, ?, ?, ?)",
+                (key, title, meeting_date, str(segments_file)),
+            ).lastrowid
+            self.conn.executemany(
+                "INSERT INTO segments (meeting_id, start, end, speaker, text) VALUES (?, ?, ?, ?, ?)",
+                ((meeting_id, *row) for row in rows if row[3].strip()),
+            )
+            count = self.conn.execute("SELECT COUNT(*) FROM segments WHERE meeting_id = ?", (meeting_id,)).fetchone()[0]
+        return count
+
+    def remove_meeting(self, segments_file: str | Path) -> None:
+        with self.conn:
+            self.conn.execute("DELETE FROM meetings WHERE key = ?", (_meeting_key(Path(segments_file)),))
+
+    def reindex(self, recordings_dir: str | Path) -> int:
+        """Index every segment store under ``recordings_dir``; returns the number of meetings."""
+        meetings = 0
+        for segments_file in sorted(Path(recordings_dir).glob(f"*/*{SEGMENTS_SUFFIX}")):
+            try:
+                meeting_date = date.fromtimestamp(segments_file.stat().st_mtime)
+                self.add_meeting(segments_file, meeting_date=meeting_date)
+                meetings += 1
+            except Exception as e:
+                logger.warning(f"Skipping {segments_file}: {e}")
+        return meetings
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+    def search(self, query: str, meeting: str | None = None, limit: int = 20) -> list[dict]:
+        """Segments matching ``query``, best match first.
+
+        Args:
+            query: FTS5 query - words (all must occur), ``"phrases"``,
+                ``prefix*``, ``AND``/``OR``/``NOT``. Text that is not valid FTS5
+                syntax is searched as plain words.
+            meeting: Only meetings whose title or folder contains this (case-insensitive).
+            limit: Maximum number of segments returned.
+
+        Returns:
+            Dicts with ``title``, ``date``, ``path``, ``start``, ``end``,
+            ``speaker`` and ``snippet`` (matches in ``[brackets]``).
+        """
+        sql = (
+            "SELECT m.title, m.date, m.path, s.start, s.end, s.speaker,"
+            " snippet(segments_fts, 0, '[', ']', '...', 16) AS snippet"
+            " FROM segments_fts JOIN segments s ON s.id = segments_fts.rowid"
+            " JOIN meetings m ON m.id = s.meeting_id WHERE segments_fts MATCH ?"
+        )
+        params: list = [query]
+        if meeting:
+            sql += " AND (m.title LIKE ? OR m.key LIKE ?)"
+            params += [f"%{meeting}%"] * 2
+        sql += " ORDER BY rank LIMIT ?"
+        params.append(limit)
+        try:
+            rows = self.conn.execute(sql, params).fetchall()
+        except sqlite3.OperationalError:
+            # Punctuation or a stray quote: search the words instead
+            tokens = _TOKEN_RE.findall(query)
+            if not tokens:
+                return []
+            params[0] = " ".join(_quote(token) for token in tokens)
+            rows = self.conn.execute(sql, params).fetchall()
+        return [dict(row) for row in rows]
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "meetings": self.conn.execute("SELECT COUNT(*) FROM meetings").fetchone()[0],
+            "segments": self.conn.execute("SELECT COUNT(*) FROM segments").fetchone()[0],
+        }
+
+
+def _meeting_key(segments_file: Path) -> str:
+    return f"{segments_file.parent.name}/{segments_file.name}"
+
+
+def _quote(token: str) -> str:
+    """Quote a word for FTS5, keeping a trailing ``*`` as a prefix query."""
+    if token.endswith("*"):
+        return f'"{token[:-1]}"*'
+    return f'"{token}"'
+
+
+def format_time(seconds: float) -> str:
+    """``h:mm:ss`` / ``m:ss`` for a transcript offset."""
+    seconds = int(seconds)
+    hours, rest = divmod(seconds, 3600)
+    return f"{hours}:{rest // 60:02d}:{rest % 60:02d}" if hours else f"{rest // 60}:{rest % 60:02d}"
+
+
+def main() -> None:
+    """CLI entry point for searching transcripts across meetings."""
+    parser = argparse.ArgumentParser(description="Search transcripts across meetings")
+    parser.add_argument(
+        "-r", "--recordings",
+        default="recordings",
+        help="Recordings folder holding the index (default: recordings)",
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    search_cmd = commands.add_parser("search", help="Find the meetings and moments matching a query")
+    search_cmd.add_argument("query", help='Words, "exact phrase", prefix*, AND/OR/NOT')
+    search_cmd.add_argument("--meeting", help="Meeting title or folder (substring)")
+    search_cmd.add_argument("-n", "--limit", type=int, default=20, help="Results to show (default: 20)")
+
+    commands.add_parser("reindex", help="Index every meeting's segment store")
+    commands.add_parser("stats", help="Meetings and segments in the index")
+
+    args = parser.parse_args()
+    with TranscriptIndex(Path(args.recordings)) as index:
+        if args.command == "search":
+            started = datetime.now()
+            results = index.search(args.query, args.meeting, args.limit)
+            elapsed = (datetime.now() - started).total_seconds() * 1000
+            for hit in results:
+                speaker = f" Speaker {hit['speaker'] + 1}:" if hit["speaker"] is not None else ""
+                print(f"{hit['title']} ({hit['date']}) @ {format_time(hit['start'])}{speaker} {hit['snippet']}")
+            print(f"{len(results)} result(s) in {elapsed:.1f} ms")
+        elif args.command == "reindex":
+            print(f"Indexed {index.reindex(args.recordings)} meeting(s)")
+        else:
+            stats = index.stats()
+            print(f"{stats['meetings']} meeting(s), {stats['segments']} segment(s)")
+
+
+if __name__ == "__main__":
+    main()
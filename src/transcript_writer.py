@@ -0,0 +1,227 @@
+"""
+Streaming Transcript Writer.
+
+Persists transcript segments as faster-whisper yields them: an append-only JSONL
+segment log plus a running plain-text part file, both fsync'ed at regular
+checkpoints. A crash late in a long decode therefore keeps everything decoded
+so far, and the final ``transcript.txt`` / segment store are assembled from the
+part files instead of from in-memory lists and one big joined string.
+
+Every checkpoint also records the end time of the last persisted segment, so an
+interrupted transcription can resume from that offset instead of from zero.
+"""
+
+import json
+import os
+import shutil
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Iterator
+
+from loguru import logger
+
+from segment_store import SegmentStore, SegmentStoreBuilder
+from tracks import CHANNEL_NAMES
+
+SEGMENTS_LOG = "segments.jsonl"
+TEXT_PART = "transcript.part.txt"
+CHECKPOINT = "transcribe_checkpoint.json"
+
+
+class StreamingTranscriptWriter:
+    """Append-only on-disk sink for transcript segments."""
+
+    def __init__(
+        self,
+        output_dir: str | Path,
+        prefix: str = "",
+        fsync_every: int = 20,
+        fsync_interval: float = 10.0,
+        resume: bool = False,
+        meta: dict | None = None,
+    ) -> None:
+        """Create the part files in ``output_dir``, or reopen them to resume.
+
+        Args:
+            output_dir: Folder the part files and final outputs live in.
+            prefix: Filename prefix (e.g. ``"meeting_"``) for the part files.
+            fsync_every: Checkpoint after this many segments.
+            fsync_interval: Checkpoint at least this often (seconds) while writing.
+            resume: Continue after the last checkpoint if one exists; part data
+                written after it (possibly torn) is discarded.
+            meta: Extra values saved in the checkpoint (e.g. detected language).
+        """
+        self.output_dir = Path(output_dir)
+        self.segments_log = self.output_dir / f"{prefix}{SEGMENTS_LOG}"
+        self.text_part = self.output_dir / f"{prefix}{TEXT_PART}"
+        self.checkpoint_file = self.output_dir / f"{prefix}{CHECKPOINT}"
+        self.fsync_every = fsync_every
+        self.fsync_interval = fsync_interval
+        self.meta = dict(meta or {})
+
+        self.segment_count = 0
+        self.word_count = 0
+        self.last_end = 0.0
+        self._pending = 0
+        self._last_sync = time.monotonic()
+        self._has_text = False
+        self.resumed = False
+
+        state = self.load_checkpoint(self.output_dir, prefix) if resume else None
+        if state and self.segments_log.exists() and self.text_part.exists():
+            # Drop anything written after the last fsync'ed checkpoint
+            with open(self.segments_log, "r+b") as f:
+                f.truncate(state["log_bytes"])
+            with open(self.text_part, "r+b") as f:
+                f.truncate(state["text_bytes"])
+            self.segment_count = state["segment_count"]
+            self.word_count = state["word_count"]
+            self.last_end = state["last_end"]
+            self._has_text = state["text_bytes"] > 0
+            self.meta = {**state.get("meta", {}), **self.meta}
+            self.resumed = True
+            mode = "a"
+            logger.info(f"Resuming transcript at {self.last_end:.1f}s ({self.segment_count} segments saved)")
+        else:
+            mode = "w"
+            self.checkpoint_file.unlink(missing_ok=True)
+
+        self._log_f = open(self.segments_log, mode, encoding="utf-8")
+        self._text_f = open(self.text_part, mode, encoding="utf-8")
+
+    @staticmethod
+    def load_checkpoint(output_dir: str | Path, prefix: str = "") -> dict | None:
+        """Read the checkpoint left by an interrupted run (None if there is none)."""
+        checkpoint_file = Path(output_dir) / f"{prefix}{CHECKPOINT}"
+        try:
+            with open(checkpoint_file, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+
+    def write(self, segment: dict) -> None:
+        """Append one segment dict (``start``/``end``/``text``[/``words``])."""
+        self._log_f.write(json.dumps(segment) + "\n")
+        text = segment["text"]
+        if text:
+            if self._has_text:
+                self._text_f.write(" ")
+            self._text_f.write(text)
+            self._has_text = True
+            self.word_count += len(text.split())
+        self.segment_count += 1
+        self.last_end = segment["end"]
+        self._pending += 1
+
+        if self._pending >= self.fsync_every or time.monotonic() - self._last_sync >= self.fsync_interval:
+            self.checkpoint()
+
+    def checkpoint(self) -> None:
+        """Flush and fsync both part files so everything written so far survives a crash.
+
+        The checkpoint file is replaced atomically afterwards, so it never points
+        past data that is actually on disk.
+        """
+        for f in (self._log_f, self._text_f):
+            f.flush()
+            os.fsync(f.fileno())
+
+        state = {
+            "segment_count": self.segment_count,
+            "word_count": self.word_count,
+            "last_end": self.last_end,
+            "log_bytes": os.fstat(self._log_f.fileno()).st_size,
+            "text_bytes": os.fstat(self._text_f.fileno()).st_size,
+            "meta": self.meta,
+            "updated": datetime.now().isoformat(timespec="seconds"),
+        }
+        tmp_file = self.checkpoint_file.with_suffix(".tmp")
+        with open(tmp_file, "w", encoding="utf-8") as f:
+            json.dump(state, f)
+            f.flush()
+            os.fsync(f.fileno())
+        tmp_file.replace(self.checkpoint_file)
+
+        self._pending = 0
+        self._last_sync = time.monotonic()
+
+    def close(self) -> None:
+        """Checkpoint and close the part files (they stay on disk)."""
+        if self._log_f.closed:
+            return
+        self.checkpoint()
+        self._log_f.close()
+        self._text_f.close()
+
+    def iter_segments(self) -> Iterator[dict]:
+        """Replay the segment log from disk, skipping a torn trailing line."""
+        with open(self.segments_log, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError:
+                    logger.warning(f"Skipping incomplete segment record in {self.segments_log}")
+
+    def finalize(
+        self,
+        transcript_file: str | Path,
+        segments_file: str | Path,
+        segments_json_file: str | Path | None = None,
+        header: str = "",
+        meta: dict | None = None,
+        annotate: Callable[[dict], dict] | None = None,
+    ) -> SegmentStore:
+        """Assemble the final outputs from the part files and remove them.
+
+        Args:
+            transcript_file: Destination for the plain-text transcript.
+            segments_file: Destination for the binary segment store.
+            segments_json_file: Optional destination for the JSON segments view.
+            header: Text written before the transcript body.
+            meta: Metadata stored with the segment store (language, duration).
+            annotate: Applied to every logged segment dict before it is stored
+                (e.g. attaching diarization speaker labels).
+
+        Returns:
+            The compact segment store built from the log.
+        """
+        self.close()
+
+        builder = SegmentStoreBuilder()
+        for segment in self.iter_segments():
+            builder.append_dict(annotate(segment) if annotate else segment)
+        store = builder.build(meta)
+        store.save(segments_file)
+
+        with open(transcript_file, "w", encoding="utf-8") as out:
+            out.write(header)
+            if store.has_speakers:
+                # Speaker turns instead of one run-on paragraph
+                for speaker, channel, _, _, text in store.turns():
+                    out.write(f"{_turn_label(speaker, channel)}: {text}\n\n")
+            else:
+                with open(self.text_part, "r", encoding="utf-8") as part:
+                    shutil.copyfileobj(part, out)
+        if segments_json_file:
+            store.write_json(segments_json_file)
+
+        self.segments_log.unlink()
+        self.text_part.unlink()
+        self.checkpoint_file.unlink(missing_ok=True)
+        return store
+
+
+def transcript_text(store: SegmentStore) -> str:
+    """The transcript body of ``store`` as ``finalize`` writes it: speaker turns, or one paragraph."""
+    if store.has_speakers:
+        return "".join(f"{_turn_label(speaker, channel)}: {text}\n\n" for speaker, channel, _, _, text in store.turns())
+    return store.full_text()
+
+
+def _turn_label(speaker: int, channel: int) -> str:
+    """Label for a transcript turn, e.g. ``Speaker 2 (remote)`` or ``Local``."""
+    where = CHANNEL_NAMES.get(channel)
+    if speaker >= 0:
+        return f"Speaker {speaker + 1} ({where})" if where else f"Speaker {speaker + 1}"
+    return where.capitalize() if where else "Unknown"